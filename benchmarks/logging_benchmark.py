@@ -0,0 +1,133 @@
+"""
+logging_benchmark.py
+
+This file measures the command rate of RobotController with each setup_logger() mode
+on a warning-heavy workload, and writes the results as JSON. Modes:
+
+- sync: a plain FileHandler on the caller's thread, every warning written
+- queued: the default, a background writer thread with tagged warnings rate limited
+- queued_unlimited: the background writer with every warning queued, dropping records
+  while the queue is full
+- aggregated: tagged warnings only counted, and written as summaries every second
+
+Each mode is run `repeat` times and the best run is reported, so a scheduler hiccup
+in one run does not decide the comparison.
+
+Usage:
+    python -m benchmarks.logging_benchmark --length 100000 --repeat 3 --output logging.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.workloads import WORKLOADS, iter_workload
+from config.logging_config import setup_logger
+from toy_robot import log_events
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import BufferedTextSink
+from toy_robot.robot import Robot
+
+MODES: Dict[str, Dict] = {
+    "sync": {"use_queue": False, "rate_limit": None},
+    "queued": {},
+    "queued_unlimited": {"rate_limit": None},
+    "aggregated": {"aggregate_interval": 1.0},
+}
+
+
+def bench_mode(commands: List[str], options: Dict, log_file: str, sink_stream) -> float:
+    """
+    Run the commands once with setup_logger(log_file, **options) active.
+
+    Returns:
+    - commands per second, including draining the queue and flushing the log file
+    """
+    root = logging.getLogger()
+    root.handlers = []
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=BufferedTextSink(sink_stream))
+    process = controller.process_command
+    start = time.perf_counter()
+    listener = setup_logger(log_file, **options)
+    for command in commands:
+        process(command)
+    if listener is not None:
+        listener.stop()
+    for handler in root.handlers:
+        handler.close()
+    if listener is not None:
+        for handler in listener.handlers:
+            handler.close()
+    elapsed = time.perf_counter() - start
+    log_events.install_limiter(None)
+    root.handlers = []
+    return len(commands) / elapsed if elapsed else float("inf")
+
+
+def run_logging_benchmark(workload: str, length: int, repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Run the workload under every logging mode.
+
+    Returns:
+    - dict with a "meta" section describing the run and a "results" list
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+
+    commands = list(iter_workload(workload, length, seed=seed))
+    results = []
+    try:
+        with open(os.devnull, "w") as sink_stream, tempfile.TemporaryDirectory() as tmp:
+            for mode, options in MODES.items():
+                rates = []
+                for run in range(repeat):
+                    log_file = os.path.join(tmp, "logs", f"{mode}-{run}.log")
+                    rates.append(bench_mode(commands, options, log_file, sink_stream))
+                    log_bytes = os.path.getsize(log_file)
+                results.append({
+                    "mode": mode,
+                    "commands_per_second": max(rates),
+                    "log_bytes": log_bytes,
+                })
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "workload": workload,
+            "length": length,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the logging modes on a warning-heavy stream.")
+    parser.add_argument("--length", type=int, default=100_000, help="commands run per mode")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="invalid_heavy")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode, the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_logging_benchmark(args.workload, args.length, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
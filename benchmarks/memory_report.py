@@ -0,0 +1,309 @@
+"""
+memory_report.py
+
+This file checks that the streaming entry points run in constant memory, and when they
+do not, shows where the growth comes from. Each entry point runs generated command
+files of increasing size under tracemalloc, and for each size the report records:
+
+- peak traced memory in bytes while the file was processed
+- retained traced memory in bytes afterwards, with the entry point's objects (the
+  controller, its sink, parse cache and so on) still alive
+
+It then compares what the largest and the smallest run retained, grouped by
+allocation site, and lists the sites whose retained memory grew with the input. In
+constant memory there are no such sites; any accumulation shows up with the file and
+line that allocated it.
+
+Entry points:
+- simulator: Simulator.run_from_file with a RobotController
+- table_simulator: the same through the lookup-table core (toy_robot.lut)
+- stream: Simulator.run_from_stream on a buffered binary stream
+- controller: RobotController.process_command on each line
+- cached_controller: the same with a bounded ParseCache
+- instrumented_controller: the same with CommandMetrics
+- queued_logging: Simulator.run_from_file with setup_logger()'s queued file logging
+- aggregated_logging: the same with tagged warnings aggregated into summaries
+
+Usage:
+    python -m benchmarks.memory_report --size 10000 --size 100000 --output memory.json
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from benchmarks.workloads import WORKLOADS, iter_workload
+from config.logging_config import setup_logger
+from toy_robot.cache import ParseCache
+from toy_robot.controller import RobotController
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.metrics import CommandMetrics
+from toy_robot.navigation import Navigation
+from toy_robot.output import BufferedTextSink
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+DEFAULT_SIZES = (10_000, 40_000, 160_000)
+
+# Allocations made by the measurement itself, or by imports it triggers
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# An entry point processes a command file, using a scratch directory for anything it
+# writes, and returns the objects that stay alive while it would keep running
+EntryPoint = Callable[[str, str], object]
+
+
+class MemoryUsage(NamedTuple):
+    commands: int
+    peak_bytes: int
+    retained_bytes: int
+
+
+def mixed_lines(length: int, seed: int = 0) -> Iterator[str]:
+    """
+    Interleave every workload shape, so one stream exercises valid, invalid, REPORT
+    and PLACE-heavy paths alike.
+    """
+    streams = [iter_workload(name, length, seed=seed) for name in sorted(WORKLOADS)]
+    return itertools.islice(itertools.chain.from_iterable(zip(*streams)), length)
+
+
+def write_stream(path: str, length: int, seed: int = 0) -> None:
+    with open(path, "w") as file:
+        for line in mixed_lines(length, seed):
+            file.write(line)
+            file.write("\n")
+
+
+# Shared by every run, so opening it is not counted against any of them
+_DEVNULL = open(os.devnull, "w")
+
+
+def _sink() -> BufferedTextSink:
+    # A short flush window means even small streams reach the sink's steady state
+    return BufferedTextSink(_DEVNULL, flush_every=128)
+
+
+def _simulator(path: str, scratch: str) -> object:
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=_sink())
+    Simulator(controller).run_from_file(path)
+    return controller
+
+
+def _table_simulator(path: str, scratch: str) -> object:
+    controller = TableController(robot=TableRobot(), navigation=Navigation(), sink=_sink())
+    Simulator(controller).run_from_file(path)
+    return controller
+
+
+def _stream(path: str, scratch: str) -> object:
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=_sink())
+    with open(path, "rb") as stream:
+        Simulator(controller).run_from_stream(stream)
+    return controller
+
+
+def _controller_loop(controller: RobotController, path: str) -> RobotController:
+    process = controller.process_command
+    with open(path, "r") as file:
+        for line in file:
+            process(line.rstrip("\n"))
+    controller.sink.flush()
+    return controller
+
+
+def _controller(path: str, scratch: str) -> object:
+    return _controller_loop(RobotController(robot=Robot(), navigation=Navigation(), sink=_sink()), path)
+
+
+def _cached_controller(path: str, scratch: str) -> object:
+    return _controller_loop(RobotController(robot=Robot(), navigation=Navigation(), sink=_sink(),
+                                            parse_cache=ParseCache()), path)
+
+
+def _instrumented_controller(path: str, scratch: str) -> object:
+    return _controller_loop(RobotController(robot=Robot(), navigation=Navigation(), sink=_sink(),
+                                            metrics=CommandMetrics()), path)
+
+
+def _logging(aggregate_interval: Optional[float]) -> EntryPoint:
+    def run(path: str, scratch: str) -> object:
+        root = logging.getLogger()
+        root.handlers = []
+        listener = setup_logger(os.path.join(scratch, "logs", "robot.log"), aggregate_interval=aggregate_interval)
+        controller = _simulator(path, scratch)
+        # Drain the queue, so records still waiting for the writer thread count as retained
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        return controller
+    return run
+
+
+ENTRY_POINTS: Dict[str, EntryPoint] = {
+    "simulator": _simulator,
+    "table_simulator": _table_simulator,
+    "stream": _stream,
+    "controller": _controller,
+    "cached_controller": _cached_controller,
+    "instrumented_controller": _instrumented_controller,
+    "queued_logging": _logging(None),
+    "aggregated_logging": _logging(1.0),
+}
+
+
+@contextmanager
+def _isolated_logging() -> Iterator[None]:
+    # Drop records instead of writing them, and keep handlers installed by the caller
+    # (e.g. pytest's, which keep every record) out of the measurement
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    root.handlers = [logging.NullHandler()]
+    try:
+        yield
+    finally:
+        root.handlers, root.level = handlers, level
+
+
+def measure(entry_point: EntryPoint, path: str, scratch: str, frames: int = 1):
+    """
+    Run an entry point once under tracemalloc.
+
+    Returns:
+    - tuple (peak bytes, retained bytes, filtered snapshot of the retained allocations)
+    """
+    with _isolated_logging():
+        tracemalloc.start(frames)
+        try:
+            # Keep the entry point's objects alive until the snapshot has been taken
+            alive = entry_point(path, scratch)
+            retained, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+            del alive
+        finally:
+            tracemalloc.stop()
+    return peak, retained, snapshot
+
+
+def memory_profile(entry_point: EntryPoint, sizes: Sequence[int], directory: str, seed: int = 0) -> List[MemoryUsage]:
+    """
+    Measure an entry point on generated streams of each size, after an untraced
+    warm-up run that fills import-time and first-use caches.
+    """
+    usage = []
+    scratch = os.path.join(directory, "scratch")
+    os.makedirs(scratch, exist_ok=True)
+    for index, size in enumerate(sizes):
+        path = os.path.join(directory, f"stream-{size}.txt")
+        if not os.path.exists(path):
+            write_stream(path, size, seed)
+        if index == 0:
+            with _isolated_logging():
+                entry_point(path, scratch)
+        peak, retained, _ = measure(entry_point, path, scratch)
+        usage.append(MemoryUsage(size, peak, retained))
+    return usage
+
+
+def growth_sites(
+    entry_point: EntryPoint,
+    small: int,
+    large: int,
+    directory: str,
+    limit: int = 10,
+    seed: int = 0,
+) -> List[Dict]:
+    """
+    Compare what the entry point retains after a small and a large stream, by
+    allocation site.
+
+    Returns:
+    - list of {"site", "size_diff", "count_diff"} for the sites whose retained memory
+      grew, largest growth first
+    """
+    snapshots = []
+    scratch = os.path.join(directory, "scratch")
+    os.makedirs(scratch, exist_ok=True)
+    for size in (small, large):
+        path = os.path.join(directory, f"stream-{size}.txt")
+        if not os.path.exists(path):
+            write_stream(path, size, seed)
+        snapshots.append(measure(entry_point, path, scratch)[2])
+    sites = []
+    for stat in snapshots[1].compare_to(snapshots[0], "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append({"site": f"{frame.filename}:{frame.lineno}", "size_diff": stat.size_diff,
+                      "count_diff": stat.count_diff})
+        if len(sites) == limit:
+            break
+    return sites
+
+
+def run_memory_report(entry_points: Sequence[str], sizes: Sequence[int], seed: int = 0, limit: int = 10) -> Dict:
+    """
+    Profile every named entry point and attribute its growth.
+
+    Returns:
+    - dict with a "meta" section describing the run and a "results" list
+    """
+    sizes = sorted(sizes)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in entry_points:
+            entry_point = ENTRY_POINTS[name]
+            usage = memory_profile(entry_point, sizes, tmp, seed)
+            results.append({
+                "entry_point": name,
+                "usage": [row._asdict() for row in usage],
+                "peak_growth_bytes": usage[-1].peak_bytes - usage[0].peak_bytes,
+                "retained_growth_bytes": usage[-1].retained_bytes - usage[0].retained_bytes,
+                "growth_sites": growth_sites(entry_point, sizes[0], sizes[-1], tmp, limit, seed),
+            })
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "sizes": sizes,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Attribute memory growth of the streaming entry points.")
+    parser.add_argument("--size", type=int, action="append", help="commands per stream (repeatable)")
+    parser.add_argument("--entry-point", action="append", choices=sorted(ENTRY_POINTS),
+                        help="entry point to profile (repeatable, default: all)")
+    parser.add_argument("--limit", type=int, default=10, help="growth sites listed per entry point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_memory_report(args.entry_point or list(ENTRY_POINTS), args.size or DEFAULT_SIZES,
+                               args.seed, args.limit)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
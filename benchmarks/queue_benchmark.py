@@ -0,0 +1,142 @@
+"""
+queue_benchmark.py
+
+This file measures the micro-batched MessageConsumer against the local SQLiteBroker
+and writes the results as JSON. For each batch size it records:
+
+- publish rate, for the whole workload published in one transaction
+- consume rate, from the first receive to the last acknowledgement
+- per-message ack latency in nanoseconds, from the receive that leased a message
+  to the acknowledgement of its batch
+
+Larger batches amortise the broker's transactions over more commands, at the cost of
+holding each command unacknowledged for longer, which is the trade-off this shows.
+
+Usage:
+    python -m benchmarks.queue_benchmark --length 100000 --robots 64 --batch-size 1 --batch-size 256
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.run_benchmarks import percentiles
+from benchmarks.workloads import WORKLOADS, iter_workload
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import Message
+from toy_robot.messaging import MessageConsumer, SQLiteBroker
+from toy_robot.navigation import Navigation
+from toy_robot.output import BufferedTextSink
+from toy_robot.robot import Robot
+
+DEFAULT_BATCH_SIZES = (1, 16, 256, 1024)
+
+
+class _TimedBroker(SQLiteBroker):
+    """
+    Records how long each message stays leased before it is acknowledged.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.leased_at: Dict[int, int] = {}
+        self.latencies = array("q")
+
+    def receive(self, max_messages: int) -> List[Message]:
+        messages = super().receive(max_messages)
+        now = time.perf_counter_ns()
+        for message in messages:
+            self.leased_at[message.id] = now
+        return messages
+
+    def ack(self, ids: Sequence[int]) -> None:
+        super().ack(ids)
+        now = time.perf_counter_ns()
+        leased_at = self.leased_at
+        self.latencies.extend(now - leased_at.pop(i) for i in ids)
+
+
+def bench_batch_size(commands: List[str], robots: int, batch_size: int, directory: str, sink_stream) -> Dict:
+    path = os.path.join(directory, f"queue-{batch_size}.db")
+    navigation = Navigation()
+    with _TimedBroker(path) as broker:
+        start = time.perf_counter()
+        broker.publish((str(i % robots), command) for i, command in enumerate(commands))
+        published = time.perf_counter() - start
+
+        consumer = MessageConsumer(
+            broker,
+            lambda robot: RobotController(robot=Robot(), navigation=navigation, sink=BufferedTextSink(sink_stream)),
+            batch_size=batch_size,
+        )
+        start = time.perf_counter()
+        consumer.drain()
+        consumed = time.perf_counter() - start
+
+        return {
+            "batch_size": batch_size,
+            "publish_per_second": len(commands) / published if published else None,
+            "consume_per_second": len(commands) / consumed if consumed else None,
+            "ack_latency_ns": percentiles(broker.latencies),
+        }
+
+
+def run_queue_benchmark(workload: str, length: int, robots: int, batch_sizes: Sequence[int], seed: int = 0) -> Dict:
+    """
+    Publish the workload across `robots` robots and consume it once per batch size.
+
+    Returns:
+    - dict with a "meta" section describing the run and a "results" list
+    """
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    root.handlers = [logging.NullHandler()]
+
+    commands = list(iter_workload(workload, length, seed=seed))
+    try:
+        with open(os.devnull, "w") as sink_stream, tempfile.TemporaryDirectory() as tmp:
+            results = [bench_batch_size(commands, robots, size, tmp, sink_stream) for size in batch_sizes]
+    finally:
+        root.handlers = saved_handlers
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "workload": workload,
+            "length": length,
+            "robots": robots,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the micro-batched message consumer.")
+    parser.add_argument("--length", type=int, default=100_000, help="commands published")
+    parser.add_argument("--robots", type=int, default=64, help="robots the commands are spread over")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="move_heavy")
+    parser.add_argument("--batch-size", type=int, action="append", help="batch size to run (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_queue_benchmark(args.workload, args.length, args.robots,
+                                 args.batch_size or DEFAULT_BATCH_SIZES, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
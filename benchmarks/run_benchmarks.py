@@ -0,0 +1,185 @@
+"""
+run_benchmarks.py
+
+This file measures the speed and memory use of the simulator on synthetic workloads
+and writes the results as JSON, so runs can be compared across versions.
+
+For each workload shape (see workloads.py) and target it records:
+- commands per second, from an untimed-per-command run
+- per-command latency percentiles in nanoseconds (controller targets only, not the
+  simulator)
+- peak traced memory in bytes, from a separate run under tracemalloc
+
+Targets:
+- controller: RobotController.process_command on each command string
+- cached_controller: the controller target with a bounded ParseCache
+- table_controller: the controller target through the lookup-table core (toy_robot.lut)
+- simulator: Simulator.run_from_file on a generated command file
+
+Usage:
+    python -m benchmarks.run_benchmarks --length 100000 --output results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.workloads import WORKLOADS, iter_workload, write_workload
+from toy_robot.cache import ParseCache
+from toy_robot.controller import RobotController
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.navigation import Navigation
+from toy_robot.output import BufferedTextSink
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def make_controller(sink_stream) -> RobotController:
+    # REPORT output goes to a buffered sink on os.devnull, so terminal I/O is not measured
+    return RobotController(robot=Robot(), navigation=Navigation(), sink=BufferedTextSink(sink_stream))
+
+
+def make_table_controller(sink_stream) -> RobotController:
+    return TableController(robot=TableRobot(), navigation=Navigation(), sink=BufferedTextSink(sink_stream))
+
+
+def make_cached_controller(sink_stream) -> RobotController:
+    return RobotController(robot=Robot(), navigation=Navigation(), sink=BufferedTextSink(sink_stream),
+                           parse_cache=ParseCache())
+
+
+CONTROLLER_TARGETS = {
+    "controller": make_controller,
+    "cached_controller": make_cached_controller,
+    "table_controller": make_table_controller,
+}
+
+
+def percentiles(samples: array) -> Dict[str, int]:
+    ordered = sorted(samples)
+    result = {f"p{p:g}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in PERCENTILES}
+    result["max"] = ordered[-1]
+    return result
+
+
+def peak_memory(run: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_controller(commands: List[str], sink_stream, factory=make_controller) -> Dict:
+    def run() -> None:
+        process = factory(sink_stream).process_command
+        for command in commands:
+            process(command)
+
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+
+    process = factory(sink_stream).process_command
+    clock = time.perf_counter_ns
+    latencies = array("q")
+    for command in commands:
+        t0 = clock()
+        process(command)
+        latencies.append(clock() - t0)
+
+    return {
+        "seconds": seconds,
+        "commands_per_second": len(commands) / seconds if seconds else None,
+        "latency_ns": percentiles(latencies),
+        "peak_memory_bytes": peak_memory(run),
+    }
+
+
+def bench_simulator(path: str, length: int, sink_stream) -> Dict:
+    def run() -> None:
+        Simulator(make_controller(sink_stream)).run_from_file(path)
+
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "commands_per_second": length / seconds if seconds else None,
+        "latency_ns": None,
+        "peak_memory_bytes": peak_memory(run),
+    }
+
+
+def run_benchmarks(workloads: List[str], length: int, seed: int = 0) -> Dict:
+    """
+    Run every target on every named workload.
+
+    Returns:
+    - dict with a "meta" section describing the run and a "results" list
+    """
+    # Ignored commands still create log records, but they are dropped instead of
+    # being written, so log I/O does not dominate the measurements
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    root.handlers = [logging.NullHandler()]
+
+    results = []
+    try:
+        with open(os.devnull, "w") as sink_stream, tempfile.TemporaryDirectory() as tmp:
+            for name in workloads:
+                commands = list(iter_workload(name, length, seed=seed))
+                for target, factory in CONTROLLER_TARGETS.items():
+                    results.append({"target": target, "workload": name, "commands": length,
+                                    **bench_controller(commands, sink_stream, factory)})
+
+                path = os.path.join(tmp, f"{name}.txt")
+                write_workload(path, name, length, seed=seed)
+                results.append({"target": "simulator", "workload": name, "commands": length,
+                                **bench_simulator(path, length, sink_stream)})
+    finally:
+        root.handlers = saved_handlers
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "length": length,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the toy robot simulator.")
+    parser.add_argument("--length", type=int, default=100_000, help="commands per workload")
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS), help="workload to run (repeatable, default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.workload or list(WORKLOADS), args.length, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
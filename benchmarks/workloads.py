@@ -0,0 +1,99 @@
+"""
+workloads.py
+
+This file generates synthetic command streams with the shapes seen in real workloads.
+Streams are produced lazily, so arbitrarily long workloads can be generated in
+constant memory.
+
+Workload shapes:
+- move_heavy: a PLACE followed mostly by MOVEs, with turns so the robot hits the edges
+- turn_heavy: mostly LEFT and RIGHT
+- invalid_heavy: mostly unrecognised, malformed or out-of-bounds commands
+- place_churn: mostly PLACE commands, some of them out of bounds
+- report_heavy: mostly REPORTs
+"""
+
+import random
+from typing import Callable, Dict, Iterator
+
+from toy_robot.interfaces import RobotInterface
+
+DIRECTIONS = RobotInterface.GET_CARDINAL_DIRECTIONS
+INVALID_COMMANDS = ["JUMP", "move", "PLACE 1,A,EAST", "PLACE 0,0,north", "MOVE 2", "PLACE2,3,EAST", "REPORT NOW"]
+
+
+def _place(rng: random.Random, grid_size: int, out_of_bounds: float = 0.0) -> str:
+    limit = grid_size * 2 if rng.random() < out_of_bounds else grid_size
+    return f"PLACE {rng.randrange(limit)},{rng.randrange(limit)},{rng.choice(DIRECTIONS)}"
+
+
+def _move_heavy(rng: random.Random, grid_size: int) -> Iterator[str]:
+    while True:
+        r = rng.random()
+        yield "MOVE" if r < 0.8 else "LEFT" if r < 0.9 else "RIGHT"
+
+
+def _turn_heavy(rng: random.Random, grid_size: int) -> Iterator[str]:
+    while True:
+        r = rng.random()
+        yield "LEFT" if r < 0.45 else "RIGHT" if r < 0.9 else "MOVE"
+
+
+def _invalid_heavy(rng: random.Random, grid_size: int) -> Iterator[str]:
+    while True:
+        r = rng.random()
+        if r < 0.7:
+            yield rng.choice(INVALID_COMMANDS)
+        elif r < 0.9:
+            yield _place(rng, grid_size, out_of_bounds=1.0)
+        else:
+            yield "MOVE"
+
+
+def _place_churn(rng: random.Random, grid_size: int) -> Iterator[str]:
+    while True:
+        r = rng.random()
+        yield _place(rng, grid_size, out_of_bounds=0.2) if r < 0.7 else "MOVE" if r < 0.9 else "REPORT"
+
+
+def _report_heavy(rng: random.Random, grid_size: int) -> Iterator[str]:
+    while True:
+        r = rng.random()
+        yield "REPORT" if r < 0.8 else "MOVE" if r < 0.9 else "LEFT"
+
+
+WORKLOADS: Dict[str, Callable[[random.Random, int], Iterator[str]]] = {
+    "move_heavy": _move_heavy,
+    "turn_heavy": _turn_heavy,
+    "invalid_heavy": _invalid_heavy,
+    "place_churn": _place_churn,
+    "report_heavy": _report_heavy,
+}
+
+
+def iter_workload(name: str, length: int, grid_size: int = 5, seed: int = 0) -> Iterator[str]:
+    """
+    Yield `length` commands of the named workload shape.
+
+    Every workload except invalid_heavy starts with a valid PLACE, so the robot is
+    on the table for the rest of the stream. The same seed always gives the same stream.
+    """
+    rng = random.Random(seed)
+    body = WORKLOADS[name](rng, grid_size)
+    if length <= 0:
+        return
+    if name != "invalid_heavy":
+        yield _place(rng, grid_size)
+        length -= 1
+    for _ in range(length):
+        yield next(body)
+
+
+def write_workload(path: str, name: str, length: int, grid_size: int = 5, seed: int = 0) -> None:
+    """
+    Write a workload to a command file, one command per line.
+    """
+    with open(path, "w") as file:
+        for command in iter_workload(name, length, grid_size, seed):
+            file.write(command)
+            file.write("\n")
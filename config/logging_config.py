@@ -1,8 +1,174 @@
 # logging_config.py
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
 
-def setup_logger(log_file="logs/robot_simulator.log", level=logging.DEBUG):
+from toy_robot import log_events
+
+
+class EventRateLimiter:
+    """
+    Decides in the logging caller, before a record is created, whether a tagged
+    hot-path warning (see toy_robot/log_events.py) is logged. Each event type may log
+    `burst` records per `interval` seconds; further events of that type are only
+    counted, and the counts are logged as one summary line once the interval is over.
+    With burst=0 every tagged event is counted, which aggregates them into summaries.
+    Untagged records are never limited.
+    """
+
+    def __init__(self, burst: int, interval: float, logger: Optional[logging.Logger] = None) -> None:
+        self.burst = burst
+        self.interval = interval
+        self.logger = logger if logger is not None else logging.getLogger(self.__class__.__name__)
+        self.counts: Dict[str, int] = {}
+        self.window_start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self, event: str) -> bool:
+        """
+        Count one event and return whether it should be logged.
+        """
+        summary = None
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= self.interval:
+                summary = self._end_window(now)
+            seen = self.counts.get(event, 0) + 1
+            self.counts[event] = seen
+        if summary is not None:
+            self.logger.warning(*summary)
+        return seen <= self.burst
+
+    def _end_window(self, now: float):
+        # The summary of the window that just ended, or None if nothing was held back
+        burst = self.burst
+        held_back = sorted((event, count - burst) for event, count in self.counts.items() if count > burst)
+        elapsed = now - self.window_start
+        self.counts = {}
+        self.window_start = now
+        if not held_back:
+            return None
+        counts = ", ".join(f"{event}={count}" for event, count in held_back)
+        return "Warnings not logged individually in the last %.1fs: %s", elapsed, counts
+
+    def flush(self) -> None:
+        """
+        Log the counts of the current interval now.
+        """
+        with self.lock:
+            summary = self._end_window(time.monotonic())
+        if summary is not None:
+            self.logger.warning(*summary)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler that leaves message formatting to the listener thread. The stock
+    handler formats every record before queueing it, which would put that cost back
+    on the caller.
+
+    Records never wait for room in the queue: when it is full they are dropped and
+    counted in `dropped`, which is written to the log file when the handler closes.
+
+    Only the process that started the listener has a thread draining the queue. In a
+    forked worker (e.g. a multiprocessing.Pool process), or once the listener has
+    stopped, records are written straight to the log file instead, so logging never
+    fills a queue that nothing reads.
+    """
+
+    def __init__(self, log_queue: queue.Queue, listener: "_QueueListener", direct: logging.Handler) -> None:
+        super().__init__(log_queue)
+        self.listener = listener
+        self.direct = direct
+        self.pid = os.getpid()
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.listener.running and os.getpid() == self.pid:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.direct.handle(record)
+
+    def close(self) -> None:
+        if self.dropped and os.getpid() == self.pid:
+            self.direct.handle(logging.LogRecord(
+                self.__class__.__name__, logging.WARNING, __file__, 0,
+                "Dropped %s log records while the log queue was full", (self.dropped,), None,
+            ))
+            self.dropped = 0
+        super().close()
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """
+    A QueueListener that tracks whether it is running, and can be stopped more than
+    once, so callers may stop it early without breaking the stop registered at exit.
+    Stopping it first logs the pending counts of the event limiter it was started with
+    and removes that limiter.
+    """
+
+    def __init__(self, log_queue: queue.Queue, handler: logging.Handler,
+                 limiter: Optional[EventRateLimiter] = None) -> None:
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.limiter = limiter
+        self.running = False
+
+    def start(self) -> None:
+        super().start()
+        self.running = True
+
+    def enqueue_sentinel(self) -> None:
+        # The thread is still draining the queue, so waiting for room cannot hang
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        if self.limiter is not None:
+            self.limiter.flush()
+            log_events.remove_limiter(self.limiter)
+        self.running = False
+        super().stop()
+
+
+def setup_logger(
+    log_file="logs/robot_simulator.log",
+    level=logging.DEBUG,
+    use_queue: bool = True,
+    aggregate_interval: Optional[float] = None,
+    queue_size: int = 1024,
+    rate_limit: Optional[int] = 100,
+) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure the root logger to write to `log_file`.
+
+    Parameters:
+    - use_queue: hand records to a background thread through a queue, so callers on
+      the command hot path never block on file I/O
+    - aggregate_interval: if set, tagged warnings are counted and written as one
+      summary line of counts per event type every `aggregate_interval` seconds
+      instead of one line per event
+    - queue_size: most records waiting for the background thread. When the queue is
+      full further records are dropped and counted, so a stream that logs faster than
+      the file is written neither waits for it nor grows memory without bound
+    - rate_limit: without aggregation, the most tagged warnings of each event type
+      logged per second; the rest are counted into a summary line. None logs every
+      warning.
+
+    Returns:
+    - the running QueueListener when use_queue is set (it is also stopped at exit), else None
+    """
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
     formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -11,8 +177,36 @@ def setup_logger(log_file="logs/robot_simulator.log", level=logging.DEBUG):
     file_handler = logging.FileHandler(log_file)
     file_handler.setFormatter(formatter)
 
+    # Tagged warnings are limited in the caller, before a record is created
+    limiter = None
+    if aggregate_interval is not None:
+        limiter = EventRateLimiter(0, aggregate_interval)
+    elif rate_limit is not None:
+        limiter = EventRateLimiter(rate_limit, 1.0)
+
+    handler: logging.Handler = file_handler
+    listener = None
+    if use_queue:
+        log_queue: queue.Queue = queue.Queue(queue_size)
+        listener = _QueueListener(log_queue, file_handler, limiter)
+        listener.start()
+        handler = _DeferredQueueHandler(log_queue, listener, file_handler)
+        atexit.register(_stop_listener, listener, handler)
+    elif limiter is not None:
+        atexit.register(limiter.flush)
+
     # Root logger setup
     logging.basicConfig(
         level=level,
-        handlers=[file_handler]
+        handlers=[handler]
     )
+    if limiter is not None:
+        log_events.install_limiter(limiter)
+    return listener
+
+
+def _stop_listener(listener: _QueueListener, handler: logging.Handler) -> None:
+    # Log the pending event counts and drain the queue, then report dropped records
+    listener.stop()
+    handler.close()
+    listener.handlers[0].close()
@@ -1,19 +1,84 @@
 """
 main.py
 
-This is the entry point of the Toy Robot Simulator. It passes a list of commands to the controller.
+This is the entry point of the Toy Robot Simulator. It reads commands from a file, or
+from stdin, and passes them to the controller.
+
+Usage:
+    python main.py [INPUT] [--engine {standard,table,compiled,parallel}] [--no-log]
+
+INPUT defaults to data/commands.txt; "-" reads from stdin.
+
+Only argparse is imported at start-up. The simulator, the chosen engine and logging
+are imported and initialised once the arguments have been parsed, and logging not at
+all with --no-log, so scripted runs start quickly and create no logs/ directory.
 """
 
-from toy_robot.controller import RobotController
-from toy_robot.robot import Robot
-from toy_robot.navigation import Navigation
-from toy_robot.simulator import Simulator
-from config.logging_config import setup_logger
+import argparse
+import os
+import sys
+from typing import List, Optional
 
-setup_logger()
+DEFAULT_INPUT = "data/commands.txt"
+DEFAULT_LOG_FILE = "logs/robot_simulator.log"
+ENGINES = ("standard", "table", "compiled", "parallel")
 
-if __name__ == "__main__":
-    controller = RobotController(robot=Robot(), navigation=Navigation())
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run toy robot commands from a file or stdin.")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT,
+                        help=f"command file, or - for stdin (default: {DEFAULT_INPUT})")
+    parser.add_argument("--engine", choices=ENGINES, default="standard",
+                        help="standard: line-by-line controller; table: lookup-table controller; "
+                             "compiled: cached bytecode replay; parallel: process pool for huge files")
+    parser.add_argument("--grid-size", type=int, default=5, help="dimension of the square table (default: 5)")
+    parser.add_argument("--no-log", action="store_true", help="disable logging entirely")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE, help=f"log file (default: {DEFAULT_LOG_FILE})")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from_stdin = args.input == "-"
+    if from_stdin and args.engine in ("compiled", "parallel"):
+        parser.error(f"the {args.engine} engine needs an input file, not stdin")
+    if not from_stdin and not os.path.isfile(args.input):
+        parser.error(f"input file not found: {args.input}")
+
+    import logging
+
+    if args.no_log:
+        # Also silences Python's last-resort stderr handler
+        logging.disable(logging.CRITICAL)
+    else:
+        from config.logging_config import setup_logger
+        setup_logger(args.log_file)
+
+    from toy_robot.navigation import Navigation
+    from toy_robot.output import BufferedTextSink
+    from toy_robot.simulator import Simulator
+
+    navigation = Navigation(args.grid_size)
+    if args.engine == "table":
+        from toy_robot.lut import TableController, TableRobot
+        controller = TableController(robot=TableRobot(args.grid_size), navigation=navigation, sink=BufferedTextSink())
+    else:
+        from toy_robot.controller import RobotController
+        from toy_robot.robot import Robot
+        controller = RobotController(robot=Robot(), navigation=navigation, sink=BufferedTextSink())
     simulator = Simulator(controller)
-    simulator.run_from_default_file()
 
+    if from_stdin:
+        simulator.run_from_stream(sys.stdin.buffer)
+    elif args.engine == "compiled":
+        simulator.run_compiled(args.input)
+    elif args.engine == "parallel":
+        simulator.run_parallel(args.input)
+    else:
+        simulator.run_from_file(args.input)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+test_batch.py
+
+Tests for the process-pool batch runner, which runs independent command files with a
+fresh robot each and returns their results in input order.
+"""
+
+import pytest
+from toy_robot.batch import BatchResult, collect_paths, run_batch, run_file
+
+FILES = {
+    "a.txt": "PLACE 0,0,NORTH\nMOVE\nREPORT\n",
+    "b.txt": "MOVE\nPLACE 1,2,EAST\nMOVE\nMOVE\nLEFT\nMOVE\nREPORT\n",
+    "c.txt": "REPORT\nPLACE 0,0,SOUTH\nMOVE\nREPORT\nJUMP\n",
+}
+
+@pytest.fixture
+def command_dir(tmp_path):
+    directory = tmp_path / "commands"
+    directory.mkdir()
+    for name, content in FILES.items():
+        (directory / name).write_text(content)
+    return directory
+
+class TestCollectPaths:
+    def test_directory_is_sorted_by_name(self, command_dir):
+        """
+        Files in a directory are run in name order.
+        """
+        assert [p.rsplit("/", 1)[1] for p in collect_paths(str(command_dir))] == ["a.txt", "b.txt", "c.txt"]
+
+    def test_manifest_entries_are_relative_to_manifest(self, command_dir):
+        """
+        Manifest entries keep their listed order and resolve against the manifest's directory.
+        """
+        manifest = command_dir.parent / "manifest.txt"
+        manifest.write_text("commands/c.txt\n\ncommands/a.txt\n")
+        assert collect_paths(str(manifest)) == [str(command_dir / "c.txt"), str(command_dir / "a.txt")]
+
+class TestRunBatch:
+    def test_single_file_results(self, command_dir):
+        """
+        A file's REPORT output and warnings are collected without printing anything.
+        """
+        result = run_file(str(command_dir / "c.txt"))
+        assert result.reports == ["Output: 0,0,SOUTH"]
+        # REPORT before PLACE, the unsafe MOVE (Navigation and controller) and JUMP
+        assert result.warnings == 4
+
+    def test_results_are_ordered_and_isolated(self, command_dir, capsys):
+        """
+        Every file runs with its own robot, and results come back in input order.
+        """
+        results = run_batch(str(command_dir), processes=2)
+        assert [r.path for r in results] == collect_paths(str(command_dir))
+        assert [r.reports for r in results] == [["Output: 0,1,NORTH"], ["Output: 3,3,NORTH"], ["Output: 0,0,SOUTH"]]
+        assert results[0].warnings == 0
+        assert capsys.readouterr().out == ""
+
+    def test_missing_file_counts_as_warning(self, tmp_path):
+        """
+        A manifest entry that does not exist produces an empty result with a logged error.
+        """
+        manifest = tmp_path / "manifest.txt"
+        manifest.write_text("missing.txt\n")
+        assert run_batch(str(manifest), processes=1) == [BatchResult(str(tmp_path / "missing.txt"), [], 1)]
@@ -0,0 +1,79 @@
+"""
+test_benchmarks.py
+
+Tests for the synthetic workload generators and the benchmark runner's
+machine-readable output.
+"""
+
+import json
+from collections import Counter
+
+import pytest
+from benchmarks.logging_benchmark import MODES, run_logging_benchmark
+from benchmarks.queue_benchmark import run_queue_benchmark
+from benchmarks.run_benchmarks import run_benchmarks
+from benchmarks.workloads import WORKLOADS, iter_workload
+
+class TestWorkloads:
+    @pytest.mark.parametrize("name", sorted(WORKLOADS))
+    def test_length_and_determinism(self, name):
+        """
+        Each workload yields exactly the requested number of commands, reproducibly.
+        """
+        commands = list(iter_workload(name, 500, seed=1))
+        assert len(commands) == 500
+        assert commands == list(iter_workload(name, 500, seed=1))
+
+    @pytest.mark.parametrize("name, dominant", [
+        ("move_heavy", "MOVE"),
+        ("report_heavy", "REPORT"),
+        ("place_churn", "PLACE"),
+    ])
+    def test_workload_shape(self, name, dominant):
+        """
+        The named command dominates its workload.
+        """
+        counts = Counter(command.split()[0] for command in iter_workload(name, 2000))
+        assert counts.most_common(1)[0][0] == dominant
+
+class TestRunner:
+    def test_results_are_json_serialisable(self):
+        """
+        Every target and workload combination produces a complete JSON record.
+        """
+        report = json.loads(json.dumps(run_benchmarks(["move_heavy", "report_heavy"], length=200)))
+        assert report["meta"]["length"] == 200
+        assert [(r["target"], r["workload"]) for r in report["results"]] == [
+            ("controller", "move_heavy"), ("cached_controller", "move_heavy"), ("table_controller", "move_heavy"), ("simulator", "move_heavy"),
+            ("controller", "report_heavy"), ("cached_controller", "report_heavy"), ("table_controller", "report_heavy"), ("simulator", "report_heavy"),
+        ]
+        for result in report["results"]:
+            assert result["commands_per_second"] > 0
+            assert result["peak_memory_bytes"] > 0
+        assert set(report["results"][0]["latency_ns"]) == {"p50", "p90", "p99", "p99.9", "max"}
+
+class TestQueueBenchmark:
+    def test_results_are_json_serialisable(self):
+        """
+        Every batch size produces a complete JSON record.
+        """
+        report = json.loads(json.dumps(run_queue_benchmark("move_heavy", 300, robots=4, batch_sizes=[1, 64])))
+        assert report["meta"]["robots"] == 4
+        assert [r["batch_size"] for r in report["results"]] == [1, 64]
+        for result in report["results"]:
+            assert result["consume_per_second"] > 0
+            assert set(result["ack_latency_ns"]) == {"p50", "p90", "p99", "p99.9", "max"}
+
+class TestLoggingBenchmark:
+    def test_queued_is_not_slower_than_sync(self):
+        """
+        Every mode produces a complete JSON record, and the default queued mode runs a
+        warning-heavy stream at least as fast as synchronous logging.
+        """
+        report = json.loads(json.dumps(run_logging_benchmark("invalid_heavy", 5000, repeat=3)))
+        results = {r["mode"]: r for r in report["results"]}
+        assert list(results) == list(MODES)
+        for result in results.values():
+            assert result["commands_per_second"] > 0
+        assert results["queued"]["commands_per_second"] >= results["sync"]["commands_per_second"]
+        assert results["queued"]["log_bytes"] < results["sync"]["log_bytes"]
@@ -0,0 +1,116 @@
+"""
+test_bytecode.py
+
+Tests for compiling command files to bytecode, caching the compiled form on disk and
+executing it through the RobotController.
+"""
+
+import pytest
+from toy_robot.bytecode import Bytecode, compile_lines, load_or_compile
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import OP_MOVE, OP_PLACE, OP_REPORT
+from toy_robot.pathfinding import GotoPlanner
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+SAMPLE = "MOVE\nPLACE 5,5,EAST\nJUMP\n\nPLACE 1,2,EAST\r\nMOVE\nMOVE\nLEFT\nMOVE\nREPORT\n"
+
+def make_controller():
+    return RobotController(robot=Robot(), navigation=Navigation())
+
+class TestCompile:
+    def test_rejected_and_blank_lines_are_dropped(self):
+        """
+        Only accepted commands are compiled, with PLACE operands in the side table.
+        """
+        program = compile_lines(["MOVE", "", "JUMP", "PLACE 1,2,EAST", "REPORT"], make_controller().parse_command)
+        assert list(program.ops) == [OP_MOVE, OP_PLACE, OP_REPORT]
+        assert list(program.operands) == [1, 2, 1]
+
+    def test_place_outside_int32_is_dropped(self, caplog):
+        """
+        A PLACE too large for the operand table compiles to nothing and is logged.
+        """
+        program = compile_lines(["PLACE 3000000000,0,NORTH", "PLACE 0,-3000000000,NORTH", "REPORT"],
+                                make_controller().parse_command)
+        assert list(program.ops) == [OP_REPORT]
+        assert list(program.operands) == []
+        assert "PLACE ignored: invalid position (3000000000,0,NORTH)" in caplog.text
+
+    def test_serialisation_round_trip(self):
+        """
+        A program survives conversion to and from its on-disk format.
+        """
+        program = compile_lines(SAMPLE.splitlines(), make_controller().parse_command)
+        restored = Bytecode.from_bytes(program.to_bytes())
+        assert restored.ops == program.ops
+        assert restored.operands == program.operands
+
+    def test_truncated_data_is_rejected(self):
+        """
+        Corrupt data raises a ValueError rather than producing a partial program.
+        """
+        program = compile_lines(SAMPLE.splitlines(), make_controller().parse_command)
+        with pytest.raises(ValueError):
+            Bytecode.from_bytes(program.to_bytes()[:-1])
+
+class TestCache:
+    def test_second_load_skips_parsing(self, tmp_path):
+        """
+        A cached program is reused without calling the parser again.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_text(SAMPLE)
+        cache_dir = tmp_path / "cache"
+        first = load_or_compile(str(commands), make_controller().parse_command, str(cache_dir))
+
+        def fail(command):
+            raise AssertionError("parser should not be called on a cache hit")
+
+        second = load_or_compile(str(commands), fail, str(cache_dir))
+        assert second.ops == first.ops and second.operands == first.operands
+        assert len(list(cache_dir.iterdir())) == 1
+
+class TestExecution:
+    def test_compiled_run_matches_text_run(self, tmp_path, monkeypatch, capsys):
+        """
+        Running the compiled program prints the same REPORT output as the text run,
+        both on a cache miss and on a cache hit.
+        """
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "commands.txt").write_text(SAMPLE)
+        monkeypatch.chdir(tmp_path)
+
+        Simulator(make_controller()).run_from_default_file()
+        expected = capsys.readouterr().out
+        for _ in range(2):
+            Simulator(make_controller()).run_compiled()
+            assert capsys.readouterr().out == expected == "Output: 3,3,NORTH\n"
+
+    def test_compiled_goto_with_planner(self, tmp_path, capsys):
+        """
+        GOTO compiles to its own opcode and is planned at execution time, from wherever
+        the robot is by then. A file compiled without a planner is cached separately.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_text("PLACE 0,0,NORTH\nGOTO 3,2\nREPORT\nPLACE 4,4,SOUTH\nGOTO 3,2\nREPORT\n")
+        cache_dir = str(tmp_path / "cache")
+
+        def planned():
+            navigation = Navigation()
+            return RobotController(robot=Robot(), navigation=navigation, planner=GotoPlanner(navigation))
+
+        Simulator(make_controller()).run_compiled(str(commands), cache_dir)
+        assert capsys.readouterr().out == "Output: 0,0,NORTH\nOutput: 4,4,SOUTH\n"
+        for _ in range(2):
+            Simulator(planned()).run_compiled(str(commands), cache_dir)
+            lines = capsys.readouterr().out.splitlines()
+            assert [line[:len("Output: 3,2")] for line in lines] == ["Output: 3,2", "Output: 3,2"]
+
+    def test_missing_file_is_logged(self, tmp_path, caplog):
+        """
+        A missing command file is logged as an error.
+        """
+        Simulator(make_controller()).run_compiled(str(tmp_path / "missing.txt"), str(tmp_path / "cache"))
+        assert "File not found" in caplog.text
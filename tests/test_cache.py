@@ -0,0 +1,129 @@
+"""
+test_cache.py
+
+Tests for the LRU cache and the controller's parse cache, covering eviction, hit and
+miss accounting, equivalence with uncached parsing and the logging of cached rejections.
+"""
+
+import logging
+
+import pytest
+from toy_robot.cache import LRUCache, ParseCache
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+
+COMMANDS = [
+    "PLACE 0,0,NORTH", "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "JUMP", "PLACE 1,A,NORTH",
+    "PLACE 9,9,EAST", "MOVE NOW", "", "PLACE 1,2", "  REPORT  ", "PLACE 0,0,NORTH", "REPORT",
+]
+
+
+def make_controller(**kwargs):
+    return RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(), **kwargs)
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        """
+        When full, the entry used longest ago is evicted.
+        """
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.evictions == 1
+
+    def test_stats(self):
+        """
+        Every lookup is counted as a hit or a miss.
+        """
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        assert cache.stats() == {"size": 1, "maxsize": 4, "hits": 2, "misses": 1, "evictions": 0, "hit_rate": 2 / 3}
+        cache.clear()
+        assert cache.stats()["hits"] == 0 and len(cache) == 0
+
+    def test_invalid_size(self):
+        """
+        A cache must hold at least one entry.
+        """
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+
+class TestParseCache:
+    def test_same_results_as_uncached(self):
+        """
+        A cached controller parses and executes every command exactly as an uncached one.
+        """
+        plain = make_controller()
+        cached = make_controller(parse_cache=ParseCache(maxsize=4))
+        for command in COMMANDS * 3:
+            assert cached.parse_command(command) == plain.parse_command(command)
+            plain.process_command(command)
+            cached.process_command(command)
+        assert cached.sink.lines() == plain.sink.lines()
+        assert cached.robot.state() == plain.robot.state()
+
+    def test_hits_and_misses(self):
+        """
+        Repeated commands, including rejected ones, are served from the cache.
+        """
+        cache = ParseCache()
+        controller = make_controller(parse_cache=cache)
+        for command in ["MOVE", "MOVE", "JUMP", "JUMP", "PLACE 0,0,NORTH", "PLACE 0,0,NORTH"]:
+            controller.process_command(command)
+        assert (cache.hits, cache.misses) == (3, 3)
+
+    def test_process_bytes_uses_cache(self):
+        """
+        Bytes input that needs parsing goes through the cache too.
+        """
+        cache = ParseCache()
+        controller = make_controller(parse_cache=cache)
+        controller.process_bytes(b"PLACE 1,1,EAST")
+        controller.process_bytes(b"PLACE 1,1,EAST")
+        assert cache.hits == 1
+
+    def test_rejections_logged_every_time_by_default(self, caplog):
+        """
+        By default a cached rejection is logged on every occurrence, as without the cache.
+        """
+        controller = make_controller(parse_cache=ParseCache())
+        with caplog.at_level(logging.WARNING):
+            for _ in range(3):
+                controller.process_command("JUMP")
+                controller.process_command("PLACE 1,A,NORTH")
+        assert caplog.text.count("Unrecognised command: 'JUMP'") == 3
+        assert caplog.text.count("Invalid PLACE command format: PLACE 1,A,NORTH") == 3
+        assert {record.levelno for record in caplog.records} == {logging.WARNING, logging.ERROR}
+
+    def test_rejections_logged_once(self, caplog):
+        """
+        With log_repeats=False a cached rejection is only logged when first parsed.
+        """
+        controller = make_controller(parse_cache=ParseCache(log_repeats=False))
+        with caplog.at_level(logging.WARNING):
+            for _ in range(3):
+                controller.process_command("JUMP")
+        assert caplog.text.count("Unrecognised command: 'JUMP'") == 1
+
+    def test_uncached_logging_unchanged(self, caplog):
+        """
+        Without a cache, rejections are logged with the same messages and event tags.
+        """
+        controller = make_controller()
+        with caplog.at_level(logging.WARNING):
+            controller.process_command("PLACE 1,2,UP")
+        record = caplog.records[0]
+        assert record.getMessage() == "Invalid PLACE command format: PLACE 1,2,UP - Invalid direction."
+        assert record.levelno == logging.ERROR
+        assert record.event == "bad_place"
@@ -0,0 +1,226 @@
+"""
+test_checkpoint.py
+
+Tests for checkpointed file runs, covering the checkpoint format, atomic writes,
+offset-aware reading and resuming an interrupted run.
+"""
+
+import json
+import os
+
+import pytest
+from toy_robot.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.reader import iter_lines_from
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+COMMANDS = b"PLACE 0,0,NORTH\nMOVE\nREPORT\n\nRIGHT\nMOVE\nREPORT\nMOVE\nLEFT\nREPORT\nMOVE\nREPORT\n"
+
+
+class Crash(Exception):
+    pass
+
+
+def make_simulator():
+    sink = ListSink()
+    return Simulator(RobotController(robot=Robot(), navigation=Navigation(), sink=sink)), sink
+
+
+def crash_after(controller, count):
+    """
+    Make the controller raise Crash on the given (1-based) command.
+    """
+    process_bytes = controller.process_bytes
+    calls = [0]
+
+    def crashing(line):
+        calls[0] += 1
+        if calls[0] == count:
+            raise Crash()
+        process_bytes(line)
+
+    controller.process_bytes = crashing
+
+
+@pytest.fixture
+def commands(tmp_path):
+    path = tmp_path / "commands.txt"
+    path.write_bytes(COMMANDS)
+    return str(path)
+
+
+class TestIterLinesFrom:
+    def test_offsets_point_past_each_line(self, commands):
+        """
+        Each line is paired with the offset at which the next line starts.
+        """
+        with open(commands, "rb") as file:
+            pairs = list(iter_lines_from(file))
+        assert [line for line, _ in pairs] == COMMANDS.split(b"\n")[:-1]
+        for line, offset in pairs:
+            assert COMMANDS[:offset].endswith(line + b"\n")
+        assert pairs[-1][1] == len(COMMANDS)
+
+    def test_start_offset(self, commands):
+        """
+        Reading can start at any line boundary.
+        """
+        start = COMMANDS.index(b"RIGHT")
+        with open(commands, "rb") as file:
+            lines = [line for line, _ in iter_lines_from(file, start)]
+        assert lines == COMMANDS[start:].split(b"\n")[:-1]
+
+    def test_no_trailing_newline(self, tmp_path):
+        """
+        The offset after an unterminated last line is the file size.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_bytes(b"MOVE\nREPORT")
+        with open(path, "rb") as file:
+            assert list(iter_lines_from(file)) == [(b"MOVE", 5), (b"REPORT", 11)]
+
+
+class TestCheckpointFile:
+    def test_round_trip(self, tmp_path, commands):
+        """
+        A saved checkpoint loads back unchanged and leaves no temporary files.
+        """
+        robot = Robot()
+        robot.place(1, 2, "EAST")
+        path = str(tmp_path / "run.ckpt")
+        checkpoint = Checkpoint.capture(commands, 7, robot)
+        save_checkpoint(path, checkpoint)
+        assert load_checkpoint(path) == checkpoint
+        assert sorted(os.listdir(tmp_path)) == ["commands.txt", "run.ckpt"]
+
+    def test_restore(self, commands):
+        """
+        Restoring places a fresh robot in the checkpointed state.
+        """
+        robot = Robot()
+        Checkpoint(commands, 0, 3, 4, "WEST", None).restore(robot)
+        assert robot.state() == (3, 4, "WEST")
+
+        unplaced = Robot()
+        Checkpoint(commands, 0, None, None, None, None).restore(unplaced)
+        assert not unplaced.is_placed
+
+    def test_missing_or_invalid(self, tmp_path):
+        """
+        Missing, corrupt and wrong-version checkpoints load as None.
+        """
+        path = tmp_path / "run.ckpt"
+        assert load_checkpoint(str(path)) is None
+        path.write_text("{not json")
+        assert load_checkpoint(str(path)) is None
+        path.write_text(json.dumps({"version": 999, "source": "x", "offset": 0, "x": None, "y": None, "direction": None}))
+        assert load_checkpoint(str(path)) is None
+
+    def test_matches(self, tmp_path, commands):
+        """
+        A checkpoint only matches the file it was taken from, and only while the
+        file is at least as long as the checkpointed offset.
+        """
+        checkpoint = Checkpoint.capture(commands, len(COMMANDS), Robot())
+        assert checkpoint.matches(commands)
+        assert not checkpoint.matches(str(tmp_path / "other.txt"))
+        with open(commands, "wb") as file:
+            file.write(COMMANDS[:10])
+        assert not checkpoint.matches(commands)
+
+    def test_matches_file_contents(self, tmp_path, commands):
+        """
+        A file rewritten in place to the same length no longer matches, while one that
+        was only appended to still does.
+        """
+        checkpoint = Checkpoint.capture(commands, len(COMMANDS), Robot())
+        with open(commands, "ab") as file:
+            file.write(b"MOVE\n")
+        assert checkpoint.matches(commands)
+
+        with open(commands, "wb") as file:
+            file.write(COMMANDS.replace(b"MOVE", b"LEFT"))
+        assert not checkpoint.matches(commands)
+
+
+class TestRunWithCheckpoints:
+    def test_uninterrupted_run(self, tmp_path, commands):
+        """
+        A checkpointed run produces the same output as a plain run and leaves a final
+        checkpoint at the end of the file.
+        """
+        plain, plain_sink = make_simulator()
+        plain.run_from_file(commands)
+
+        simulator, sink = make_simulator()
+        path = str(tmp_path / "run.ckpt")
+        simulator.run_with_checkpoints(commands, path, every_lines=3)
+        assert sink.lines() == plain_sink.lines()
+        checkpoint = load_checkpoint(path)
+        assert checkpoint.offset == len(COMMANDS)
+        assert (checkpoint.x, checkpoint.y, checkpoint.direction) == simulator.controller.robot.state()
+
+    @pytest.mark.parametrize("crash_at", [1, 2, 5, 8, 11])
+    def test_resume_after_crash(self, tmp_path, commands, crash_at):
+        """
+        After a crash, resuming from the checkpoint with a fresh robot ends in the same
+        state as an uninterrupted run, and reports are not lost.
+        """
+        plain, plain_sink = make_simulator()
+        plain.run_from_file(commands)
+
+        path = str(tmp_path / "run.ckpt")
+        crashed, crashed_sink = make_simulator()
+        crash_after(crashed.controller, crash_at)
+        with pytest.raises(Crash):
+            crashed.run_with_checkpoints(commands, path, every_lines=2)
+
+        resumed, resumed_sink = make_simulator()
+        resumed.run_with_checkpoints(commands, path, every_lines=2)
+
+        assert resumed.controller.robot.state() == plain.controller.robot.state()
+        # Reports after the last checkpoint may be repeated, but none are missing
+        expected = plain_sink.lines()
+        before, after = crashed_sink.lines(), resumed_sink.lines()
+        assert before == expected[:len(before)]
+        assert after == expected[len(expected) - len(after):]
+        assert len(before) + len(after) >= len(expected)
+
+    def test_resume_skips_finished_file(self, tmp_path, commands):
+        """
+        Resuming a completed run executes nothing.
+        """
+        path = str(tmp_path / "run.ckpt")
+        first, _ = make_simulator()
+        first.run_with_checkpoints(commands, path)
+
+        second, sink = make_simulator()
+        second.run_with_checkpoints(commands, path)
+        assert sink.lines() == []
+        assert second.controller.robot.state() == first.controller.robot.state()
+
+    def test_mismatched_checkpoint_is_ignored(self, tmp_path, commands):
+        """
+        A checkpoint from another file is ignored and the run starts from the beginning.
+        """
+        path = str(tmp_path / "run.ckpt")
+        save_checkpoint(path, Checkpoint(str(tmp_path / "other.txt"), 5, 4, 4, "SOUTH", None))
+
+        plain, plain_sink = make_simulator()
+        plain.run_from_file(commands)
+        simulator, sink = make_simulator()
+        simulator.run_with_checkpoints(commands, path)
+        assert sink.lines() == plain_sink.lines()
+
+    def test_missing_file(self, tmp_path, caplog):
+        """
+        A missing command file is logged and no checkpoint is written.
+        """
+        simulator, _ = make_simulator()
+        path = tmp_path / "run.ckpt"
+        simulator.run_with_checkpoints(str(tmp_path / "missing.txt"), str(path))
+        assert "File not found" in caplog.text
+        assert not path.exists()
@@ -7,6 +7,7 @@ coordinates robot actions, and ensures safety logic is enforced (e.g., ignoring
 
 import pytest
 from toy_robot.controller import RobotController
+from toy_robot.metrics import CommandMetrics
 from toy_robot.robot import Robot
 from toy_robot.navigation import Navigation
 
@@ -53,6 +54,19 @@ class TestCommandValidation:
         controller.process_command("PLACE 5,6,EAST")
         assert "PLACE ignored: invalid position (5,6,EAST)" in caplog.text
 
+    @pytest.mark.parametrize("metrics", [None, CommandMetrics()])
+    def test_bytes_with_crlf_are_logged_stripped(self, caplog, metrics):
+        """
+        Rejected bytes commands read from files with CRLF line endings are logged
+        without the trailing carriage return.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation(), metrics=metrics)
+        controller.process_bytes(b"PLACE 1,A,EAST\r\n")
+        controller.process_bytes(b"JUMP \r\n")
+        assert "Invalid PLACE command format: PLACE 1,A,EAST - " in caplog.text
+        assert "Unrecognised command: 'JUMP'" in caplog.text
+        assert not any("\r" in record.getMessage() for record in caplog.records)
+
 class TestCommandExecution:
     def test_place_and_report_outputs_position(self, capsys):
         """
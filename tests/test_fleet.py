@@ -0,0 +1,85 @@
+"""
+test_fleet.py
+
+Tests for the FleetEngine class, which simulates many robots in lockstep using NumPy
+arrays. Each robot in the fleet must behave exactly like its own RobotController.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.fleet import FleetEngine
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import OP_MOVE, OP_NOP, OP_PLACE, OP_REPORT
+from toy_robot.robot import Robot
+
+COMMAND_POOL = [
+    "MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 4,4,SOUTH",
+    "PLACE 2,3,WEST", "PLACE 5,5,EAST", "PLACE -1,0,NORTH", "place 1,1,NORTH",
+    "PLACE 1,A,EAST", "JUMP", "MOVE 2",
+]
+
+class TestFleetStep:
+    def test_unplaced_robots_ignore_commands(self):
+        """
+        Commands other than PLACE are ignored until a robot has been placed.
+        """
+        fleet = FleetEngine(size=2)
+        reporters = fleet.step(np.array([OP_MOVE, OP_REPORT]))
+        assert reporters.size == 0
+        assert not fleet.placed.any()
+
+    def test_out_of_bounds_place_and_move_are_ignored(self):
+        """
+        Invalid PLACE coordinates and unsafe MOVEs leave the robot state unchanged.
+        """
+        fleet = FleetEngine(size=2)
+        fleet.step(np.array([OP_PLACE, OP_PLACE]), np.array([0, 5]), np.array([0, 5]), np.array([2, 0]))
+        assert fleet.placed.tolist() == [True, False]
+        fleet.step(np.array([OP_MOVE, OP_NOP]))
+        assert fleet.report_lines([0]) == ["Output: 0,0,SOUTH"]
+
+    def test_place_beyond_int64_is_ignored(self):
+        """
+        A PLACE too large for the operand arrays is ignored instead of overflowing.
+        """
+        fleet = FleetEngine(size=2)
+        ops, x, y, direction = fleet.encode_commands(["PLACE 99999999999999999999,0,NORTH", "PLACE 1,1,EAST"])
+        assert ops.tolist() == [OP_NOP, OP_PLACE]
+        fleet.step(ops, x, y, direction)
+        assert fleet.placed.tolist() == [False, True]
+
+    def test_step_rejects_wrong_number_of_opcodes(self):
+        """
+        Each tick must provide exactly one opcode per robot.
+        """
+        fleet = FleetEngine(size=3)
+        with pytest.raises(ValueError):
+            fleet.step(np.array([OP_MOVE]))
+
+class TestFleetEquivalence:
+    def test_matches_individual_controllers(self, capsys):
+        """
+        A fleet driven by random command streams produces the same REPORT output and
+        final state as one RobotController per robot.
+        """
+        rng = random.Random(7)
+        size, ticks = 25, 200
+        streams = [[rng.choice(COMMAND_POOL) for _ in range(ticks)] for _ in range(size)]
+
+        controllers = [RobotController(robot=Robot(), navigation=Navigation()) for _ in range(size)]
+        fleet = FleetEngine(size=size)
+        for tick in range(ticks):
+            expected = []
+            for controller, stream in zip(controllers, streams):
+                controller.process_command(stream[tick])
+                expected.extend(capsys.readouterr().out.splitlines())
+            assert fleet.step_commands([stream[tick] for stream in streams]) == expected
+
+        for i, controller in enumerate(controllers):
+            robot = controller.robot
+            assert bool(fleet.placed[i]) == robot.is_placed
+            if robot.is_placed:
+                assert fleet.report_lines([i]) == [f"Output: {robot.current_x},{robot.current_y},{robot.current_direction}"]
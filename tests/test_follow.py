@@ -0,0 +1,152 @@
+"""
+test_follow.py
+
+Tests for following an appending command file, covering partial lines, truncation,
+rotation and Simulator's follow mode.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.follow import FileFollower
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+
+def append(path, data):
+    with open(path, "ab") as file:
+        file.write(data)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "commands.txt")
+
+
+class TestFileFollower:
+    def test_returns_only_new_lines(self, path):
+        """
+        Each poll returns the lines appended since the previous one.
+        """
+        append(path, b"PLACE 0,0,NORTH\nMOVE\n")
+        with FileFollower(path) as follower:
+            assert list(follower.poll()) == [b"PLACE 0,0,NORTH", b"MOVE"]
+            assert list(follower.poll()) == []
+            append(path, b"REPORT\n")
+            assert list(follower.poll()) == [b"REPORT"]
+
+    def test_partial_line_is_held_back(self, path):
+        """
+        A line is only returned once its newline has been written.
+        """
+        append(path, b"MOVE\nREP")
+        with FileFollower(path) as follower:
+            assert list(follower.poll()) == [b"MOVE"]
+            append(path, b"OR")
+            assert list(follower.poll()) == []
+            append(path, b"T\nLEFT")
+            assert list(follower.poll()) == [b"REPORT"]
+            assert follower.pending == b"LEFT"
+
+    def test_from_end(self, path):
+        """
+        With from_end, existing content is skipped.
+        """
+        append(path, b"MOVE\n")
+        with FileFollower(path, from_end=True) as follower:
+            assert list(follower.poll()) == []
+            append(path, b"LEFT\n")
+            assert list(follower.poll()) == [b"LEFT"]
+
+    def test_file_created_later(self, path):
+        """
+        A file that does not exist yet is picked up once it is created.
+        """
+        with FileFollower(path) as follower:
+            assert list(follower.poll()) == []
+            append(path, b"MOVE\n")
+            assert list(follower.poll()) == [b"MOVE"]
+
+    def test_truncation(self, path):
+        """
+        A truncated file is read again from the start.
+        """
+        append(path, b"PLACE 0,0,NORTH\nMOVE\nMOVE\n")
+        with FileFollower(path) as follower:
+            list(follower.poll())
+            with open(path, "wb") as file:
+                file.write(b"LEFT\n")
+            assert list(follower.poll()) == [b"LEFT"]
+
+    def test_rotation(self, path):
+        """
+        After rotation, the rest of the old file is read, then the new file from the start.
+        """
+        append(path, b"MOVE\n")
+        with FileFollower(path) as follower:
+            assert list(follower.poll()) == [b"MOVE"]
+            append(path, b"LEFT\n")
+            os.rename(path, path + ".1")
+            assert list(follower.poll()) == [b"LEFT"]
+            append(path, b"RIGHT\n")
+            assert list(follower.poll()) == [b"RIGHT"]
+
+
+    def test_replacement_removed_before_reopen(self, path, monkeypatch):
+        """
+        If the file that replaced a rotated one is gone again before it is opened,
+        the poll ends there and the file is read from the start once it is recreated.
+        """
+        append(path, b"MOVE\n")
+        with FileFollower(path) as follower:
+            assert list(follower.poll()) == [b"MOVE"]
+            append(path, b"LEFT\n")
+            os.rename(path, path + ".1")
+            append(path, b"RIGHT\n")
+            rotated = follower._rotated
+
+            def rotated_then_removed():
+                result = rotated()
+                os.remove(path)
+                return result
+
+            monkeypatch.setattr(follower, "_rotated", rotated_then_removed)
+            assert list(follower.poll()) == [b"LEFT"]
+            monkeypatch.undo()
+            assert list(follower.poll()) == []
+            append(path, b"REPORT\n")
+            assert list(follower.poll()) == [b"REPORT"]
+
+
+class TestSimulatorFollow:
+    def test_follow_keeps_state_across_polls(self, path):
+        """
+        Commands appended while following are executed against the same robot, and
+        their REPORT output is flushed promptly.
+        """
+        append(path, b"PLACE 0,0,NORTH\n")
+        sink = ListSink()
+        simulator = Simulator(RobotController(robot=Robot(), navigation=Navigation(), sink=sink))
+        stop = threading.Event()
+        thread = threading.Thread(target=simulator.follow, args=(path, 0.01, stop))
+        thread.start()
+        try:
+            append(path, b"MOVE\nREP")
+            time.sleep(0.05)
+            append(path, b"ORT\n")
+            deadline = time.monotonic() + 5
+            while not sink.lines() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            append(path, b"RIGHT\nMOVE\nREPORT\n")
+            while len(sink.lines()) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            stop.set()
+            thread.join(5)
+        assert sink.lines() == ["Output: 0,1,NORTH", "Output: 1,1,EAST"]
+        assert not thread.is_alive()
@@ -0,0 +1,144 @@
+"""
+test_heatmap.py
+
+Tests for the NumPy heatmap analytics, checking visit, dwell and rejected-MOVE counts
+against a per-event reference replay through Robot and Navigation, and the .npy export.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from toy_robot.heatmap import HeatmapAnalytics
+from toy_robot.navigation import Navigation
+from toy_robot.obstacles import ObstacleNavigation
+from toy_robot.robot import Robot
+
+COMMANDS = ["MOVE"] * 6 + ["LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 2,2,WEST", "PLACE 9,9,EAST",
+                           "PLACE 1,1,SOUTH", "JUMP", "", "  MOVE  "]
+DIRECTIONS = ["NORTH", "EAST", "SOUTH", "WEST"]
+
+
+def reference_counts(lines, navigation, grid_size):
+    """
+    Count events one at a time with a plain Robot, as a dict-based hook would.
+    """
+    visits = np.zeros((grid_size, grid_size), dtype=np.int64)
+    dwell = np.zeros((grid_size, grid_size, 4), dtype=np.int64)
+    rejected = np.zeros((grid_size, grid_size, 4), dtype=np.int64)
+    robot = Robot()
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "PLACE" and len(parts) == 2:
+            x, y, direction = parts[1].split(",")
+            if navigation.is_valid_position(int(x), int(y)):
+                robot.place(int(x), int(y), direction)
+                visits[int(y), int(x)] += 1
+        elif robot.is_placed and parts == ["MOVE"]:
+            new_x, new_y, _ = robot.propose_move()
+            if navigation.is_valid_position(new_x, new_y):
+                robot.update_position(new_x, new_y)
+                visits[new_y, new_x] += 1
+            else:
+                rejected[robot.current_y, robot.current_x, DIRECTIONS.index(robot.current_direction)] += 1
+        elif robot.is_placed and parts == ["LEFT"]:
+            robot.turn_left()
+        elif robot.is_placed and parts == ["RIGHT"]:
+            robot.turn_right()
+        if robot.is_placed:
+            dwell[robot.current_y, robot.current_x, DIRECTIONS.index(robot.current_direction)] += 1
+    return visits, dwell, rejected
+
+
+def random_lines(count, seed=3):
+    generator = random.Random(seed)
+    return [generator.choice(COMMANDS) for _ in range(count)]
+
+
+class TestHeatmapAnalytics:
+    @pytest.mark.parametrize("batch_size", [1, 7, 1024])
+    def test_matches_reference(self, batch_size):
+        """
+        Batched accumulation gives the same counts as per-event counting, whatever
+        the batch size.
+        """
+        lines = random_lines(5000)
+        navigation = Navigation()
+        analytics = HeatmapAnalytics(navigation, batch_size=batch_size)
+        analytics.feed(line.encode() for line in lines)
+        visits, dwell, rejected = reference_counts(lines, navigation, 5)
+        np.testing.assert_array_equal(analytics.visits, visits)
+        np.testing.assert_array_equal(analytics.dwell, dwell)
+        np.testing.assert_array_equal(analytics.rejected_moves, rejected)
+        assert analytics.commands == sum(1 for line in lines if line.strip())
+
+    def test_obstacles(self):
+        """
+        MOVEs into blocked cells are counted as rejected at the facing edge.
+        """
+        floor = ObstacleNavigation(5, 5)
+        floor.block(2, 0, 2, 3)
+        lines = random_lines(3000, seed=11)
+        analytics = HeatmapAnalytics(floor, grid_size=5, batch_size=64)
+        analytics.feed(line.encode() for line in lines)
+        visits, dwell, rejected = reference_counts(lines, floor, 5)
+        np.testing.assert_array_equal(analytics.visits, visits)
+        np.testing.assert_array_equal(analytics.dwell, dwell)
+        np.testing.assert_array_equal(analytics.rejected_moves, rejected)
+        assert analytics.visits[0:4, 2].sum() == 0
+
+    def test_rectangular_navigation_is_rejected(self):
+        """
+        Counts are kept per square-grid state, so a rectangular floor is refused.
+        """
+        with pytest.raises(ValueError):
+            HeatmapAnalytics(ObstacleNavigation(8, 5))
+
+    def test_state_carries_across_streams(self):
+        """
+        Feeding a stream in pieces gives the same result as feeding it whole.
+        """
+        lines = [line.encode() for line in random_lines(1000)]
+        whole = HeatmapAnalytics()
+        whole.feed(lines)
+        pieces = HeatmapAnalytics()
+        pieces.feed(lines[:333])
+        pieces.feed(lines[333:])
+        np.testing.assert_array_equal(whole.dwell, pieces.dwell)
+        np.testing.assert_array_equal(whole.visits, pieces.visits)
+
+    def test_edge_rejections(self):
+        """
+        A MOVE off the north edge is counted on that cell's north side.
+        """
+        analytics = HeatmapAnalytics()
+        analytics.feed([b"PLACE 1,4,NORTH", b"MOVE", b"MOVE", b"RIGHT", b"MOVE"])
+        assert analytics.rejected_moves[4, 1].tolist() == [2, 0, 0, 0]
+        assert analytics.visits[4, 2] == 1
+        assert analytics.dwell[4, 1, 0] == 3
+
+    def test_coverage(self):
+        """
+        Coverage is the fraction of walkable cells visited.
+        """
+        analytics = HeatmapAnalytics()
+        analytics.feed([b"PLACE 0,0,EAST", b"MOVE", b"MOVE", b"MOVE", b"MOVE"])
+        assert analytics.coverage() == pytest.approx(5 / 25)
+
+    def test_run_file_and_save(self, tmp_path):
+        """
+        Files are replayed from disk and the arrays round-trip through .npy files.
+        """
+        lines = random_lines(500)
+        path = tmp_path / "commands.txt"
+        path.write_text("\n".join(lines) + "\n")
+        analytics = HeatmapAnalytics()
+        analytics.run_file(str(path))
+        paths = analytics.save(str(tmp_path / "heatmap"))
+        assert sorted(paths) == ["dwell", "rejected_moves", "visits"]
+        np.testing.assert_array_equal(np.load(paths["visits"]), analytics.visits)
+        np.testing.assert_array_equal(np.load(paths["dwell"]), analytics.dwell)
+        np.testing.assert_array_equal(np.load(paths["rejected_moves"]), analytics.rejected_moves)
+        assert np.load(paths["dwell"]).dtype == np.int64
@@ -0,0 +1,201 @@
+"""
+test_logging_config.py
+
+Tests for the logging setup: the queue-based background writer and the aggregation
+mode that replaces per-event hot-path warnings with periodic counts.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+from config.logging_config import EventRateLimiter, setup_logger
+from toy_robot import log_events
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.robot import Robot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs a pool-based engine in a fresh interpreter with setup_logger() active
+POOL_SCRIPT = """
+import sys
+from config.logging_config import setup_logger
+from toy_robot.batch import run_batch
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+engine, log_file, source = sys.argv[1:]
+setup_logger(log_file)
+if engine == "batch":
+    run_batch(source, processes=2)
+else:
+    controller = RobotController(robot=Robot(), navigation=Navigation())
+    Simulator(controller).run_parallel(source + "/commands.txt", processes=2, chunk_size=4096)
+"""
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+@pytest.fixture
+def isolated_root():
+    # pytest attaches its capture handlers to the root logger, which would make
+    # basicConfig() a no-op, so they are detached for the duration of the test
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    log_events.install_limiter(None)
+    for handler in root.handlers:
+        handler.close()
+    root.handlers, root.level = handlers, level
+
+def make_controller_logger(handler):
+    controller = RobotController(robot=Robot(), navigation=Navigation())
+    for logger in (controller.logger, controller.navigation.logger):
+        logger.addHandler(handler)
+        logger.propagate = False
+    return controller
+
+def restore(controller):
+    for logger in (controller.logger, controller.navigation.logger):
+        logger.handlers = []
+        logger.propagate = True
+
+class TestEventRateLimiter:
+    def test_tagged_warnings_are_counted_per_event(self):
+        """
+        With burst=0, hot-path warnings become one summary line per interval with
+        counts per event, and no record is created for the events themselves.
+        """
+        target = ListHandler()
+        summaries = ListHandler()
+        limiter = EventRateLimiter(0, interval=3600, logger=logging.getLogger("test_summaries"))
+        limiter.logger.addHandler(summaries)
+        controller = make_controller_logger(target)
+        log_events.install_limiter(limiter)
+        try:
+            for cmd in ["MOVE", "LEFT", "PLACE 0,0,SOUTH", "MOVE", "MOVE", "JUMP"]:
+                controller.process_command(cmd)
+            assert summaries.messages == []
+            limiter.flush()
+        finally:
+            log_events.remove_limiter(limiter)
+            limiter.logger.handlers = []
+            restore(controller)
+        assert target.messages == []
+        assert len(summaries.messages) == 1
+        assert "out_of_bounds=2, unplaced_command=2, unrecognised_command=1, unsafe_move=2" in summaries.messages[0]
+
+    def test_burst_per_event_and_interval(self):
+        """
+        Each event type logs up to `burst` records per interval; the rest are counted,
+        and a new interval logs again.
+        """
+        limiter = EventRateLimiter(2, interval=3600, logger=logging.getLogger("test_burst"))
+        summaries = ListHandler()
+        limiter.logger.addHandler(summaries)
+        try:
+            assert [limiter.allow("unsafe_move") for _ in range(4)] == [True, True, False, False]
+            assert limiter.allow("bad_place")
+            limiter.interval = 0
+            assert limiter.allow("unsafe_move")
+        finally:
+            limiter.logger.handlers = []
+        assert len(summaries.messages) == 1
+        assert summaries.messages[0].endswith(": unsafe_move=2")
+
+    def test_untagged_records_pass_through(self):
+        """
+        Records logged without log_event() are never limited.
+        """
+        target = ListHandler()
+        logger = logging.getLogger("test_untagged")
+        logger.addHandler(target)
+        limiter = EventRateLimiter(0, interval=3600)
+        log_events.install_limiter(limiter)
+        try:
+            logger.warning("plain %s", "warning")
+        finally:
+            log_events.remove_limiter(limiter)
+            logger.handlers = []
+        assert target.messages == ["plain warning"]
+
+class TestSetupLogger:
+    def test_queue_writer_flushes_to_file(self, tmp_path, isolated_root):
+        """
+        Records logged through the queue reach the log file once the listener stops.
+        """
+        log_file = tmp_path / "logs" / "robot.log"
+        isolated_root.handlers = []
+        listener = setup_logger(str(log_file))
+        RobotController(robot=Robot(), navigation=Navigation()).process_command("MOVE")
+        listener.stop()
+        assert "Ignoring 'MOVE' as no PLACE command has been issued yet." in log_file.read_text()
+
+    def test_tagged_warnings_are_rate_limited(self, tmp_path, isolated_root):
+        """
+        By default each event type logs rate_limit warnings per second, and the rest
+        are written as a count when the listener stops.
+        """
+        log_file = tmp_path / "logs" / "robot.log"
+        isolated_root.handlers = []
+        listener = setup_logger(str(log_file), rate_limit=10)
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        for _ in range(50):
+            controller.process_command("MOVE")
+        listener.stop()
+        text = log_file.read_text()
+        assert text.count("Ignoring 'MOVE' as no PLACE command has been issued yet.") == 10
+        assert "unplaced_command=40" in text
+
+    def test_full_queue_drops_and_counts(self, tmp_path, isolated_root):
+        """
+        Records that find the queue full are dropped without waiting, and their count
+        is written when the handler closes.
+        """
+        log_file = tmp_path / "logs" / "robot.log"
+        isolated_root.handlers = []
+        listener = setup_logger(str(log_file), queue_size=1)
+        # Hold the file handler, so the writer thread stalls on the first record
+        listener.handlers[0].acquire()
+        try:
+            logger = logging.getLogger("test_dropped")
+            for i in range(20):
+                logger.warning("record %s", i)
+            handler = isolated_root.handlers[0]
+            assert handler.dropped > 0
+            dropped = handler.dropped
+        finally:
+            listener.handlers[0].release()
+        listener.stop()
+        handler.close()
+        text = log_file.read_text()
+        assert f"Dropped {dropped} log records while the log queue was full" in text
+        assert text.count("record ") == 20 - dropped
+
+    @pytest.mark.parametrize("engine", ["batch", "parallel"])
+    def test_pool_workers_do_not_block(self, tmp_path, engine):
+        """
+        Forked pool workers inherit the queue handler but no listener thread; logging
+        more warnings than the queue holds must neither hang them nor lose records.
+        """
+        source = tmp_path / "commands"
+        source.mkdir()
+        (source / "commands.txt").write_text("JUMP\n" * 5000 + "PLACE 0,0,NORTH\nREPORT\n")
+        log_file = tmp_path / "logs" / "robot.log"
+        result = subprocess.run(
+            [sys.executable, "-c", POOL_SCRIPT, engine, str(log_file), str(source)],
+            capture_output=True, timeout=60, env={**os.environ, "PYTHONPATH": ROOT},
+        )
+        assert result.returncode == 0, result.stderr
+        if engine == "batch":
+            assert log_file.read_text().count("Unrecognised command: 'JUMP'") == 5000
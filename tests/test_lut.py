@@ -0,0 +1,101 @@
+"""
+test_lut.py
+
+Tests for the lookup-table execution core. TableRobot and TableController must behave
+exactly like Robot and RobotController, including their logging.
+"""
+
+import random
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import NavigationInterface
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.navigation import Navigation
+from toy_robot.obstacles import ObstacleNavigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+
+COMMAND_POOL = [
+    "MOVE", "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 4,4,SOUTH",
+    "PLACE 2,3,WEST", "PLACE 5,5,EAST", "place 1,1,NORTH", "PLACE 1,A,EAST", "JUMP",
+]
+
+class BlockedCentre(NavigationInterface):
+    """A navigation that also blocks the centre cell, to show tables honour it."""
+    grid_size = 5
+
+    def is_valid_position(self, x, y):
+        return 0 <= x < 5 and 0 <= y < 5 and (x, y) != (2, 2)
+
+class TestTableRobot:
+    @pytest.mark.parametrize("turn_method, expected", [
+        ("turn_left", ["WEST", "SOUTH", "EAST", "NORTH"]),
+        ("turn_right", ["EAST", "SOUTH", "WEST", "NORTH"]),
+    ])
+    def test_turning_matches_robot(self, turn_method, expected):
+        """
+        Turning updates only the direction bits of the packed state.
+        """
+        robot = TableRobot()
+        robot.place(3, 1, "NORTH")
+        directions = []
+        for _ in range(4):
+            getattr(robot, turn_method)()
+            directions.append(robot.current_direction)
+        assert directions == expected
+        assert (robot.current_x, robot.current_y) == (3, 1)
+
+    def test_unplaced_state(self):
+        """
+        A new robot is unplaced and reports no position.
+        """
+        robot = TableRobot()
+        assert not robot.is_placed
+        assert robot.state() == (None, None, None)
+
+class TestTableController:
+    @pytest.mark.parametrize("navigation", [Navigation(), BlockedCentre()])
+    def test_matches_robot_controller(self, navigation, caplog):
+        """
+        Random command streams give the same output, final state and log messages.
+        """
+        rng = random.Random(11)
+        commands = [rng.choice(COMMAND_POOL) for _ in range(3000)]
+
+        def run(controller):
+            caplog.clear()
+            for cmd in commands:
+                controller.process_command(cmd)
+            return controller.sink.records, controller.robot.state(), caplog.messages[:]
+
+        expected = run(RobotController(robot=Robot(), navigation=navigation, sink=ListSink()))
+        actual = run(TableController(robot=TableRobot(), navigation=navigation, sink=ListSink()))
+        assert actual == expected
+
+    @pytest.mark.parametrize("navigation", [Navigation(10), ObstacleNavigation(10, 10), ObstacleNavigation(5, 4)])
+    def test_navigation_grid_must_match(self, navigation):
+        """
+        A navigation on a different grid would accept PLACEs outside the tables.
+        """
+        with pytest.raises(ValueError):
+            TableController(robot=TableRobot(5), navigation=navigation)
+
+    def test_obstacle_navigation(self):
+        """
+        On a square obstacle floor of the robot's size, the table core matches the
+        regular controller, obstacles included.
+        """
+        floor = ObstacleNavigation(5, 5)
+        floor.block(2, 1, 2, 3)
+        commands = ["PLACE 2,2,NORTH", "PLACE 1,2,EAST", "MOVE", "REPORT", "PLACE 4,0,EAST", "MOVE", "LEFT",
+                    "MOVE", "REPORT"]
+
+        def run(controller):
+            for cmd in commands:
+                controller.process_command(cmd)
+            return controller.sink.records
+
+        expected = run(RobotController(robot=Robot(), navigation=floor, sink=ListSink()))
+        assert run(TableController(robot=TableRobot(5), navigation=floor, sink=ListSink())) == expected
+        assert expected == [(1, 2, "EAST"), (4, 1, "NORTH")]
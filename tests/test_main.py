@@ -0,0 +1,124 @@
+"""
+test_main.py
+
+Tests for the command-line entry point, run in a subprocess as scripts would run it:
+input selection, engines, --no-log, lazy imports and the cold-start budget.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Start-up time allowed on top of a bare `python -c pass`, in seconds (see README)
+COLD_START_BUDGET = 0.2
+
+# Modules only the optional engines and features need
+HEAVY_MODULES = ("multiprocessing", "hashlib", "tempfile", "json", "asyncio", "numpy", "config.logging_config")
+
+COMMANDS = b"PLACE 0,0,NORTH\nMOVE\nREPORT\nRIGHT\nMOVE\nJUMP\nREPORT\n"
+EXPECTED = "Output: 0,1,NORTH\nOutput: 1,1,EAST\n"
+
+
+def run_main(*args, cwd, stdin=None, python_args=()):
+    return subprocess.run(
+        [sys.executable, *python_args, MAIN, *args],
+        cwd=cwd, input=stdin, capture_output=True, env={**os.environ, "PYTHONPATH": ROOT},
+    )
+
+
+@pytest.fixture
+def commands(tmp_path):
+    path = tmp_path / "commands.txt"
+    path.write_bytes(COMMANDS)
+    return str(path)
+
+
+class TestCommandLine:
+    @pytest.mark.parametrize("engine", ["standard", "table", "compiled", "parallel"])
+    def test_engines_produce_same_output(self, tmp_path, commands, engine):
+        """
+        Every engine prints the same REPORT output for a file.
+        """
+        result = run_main(commands, "--engine", engine, "--no-log", cwd=tmp_path)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.decode() == EXPECTED
+
+    @pytest.mark.parametrize("engine", ["standard", "table", "compiled", "parallel"])
+    def test_engines_with_logging(self, tmp_path, engine):
+        """
+        Every engine finishes with logging on (the default) when the input logs far
+        more warnings than the log queue holds.
+        """
+        path = tmp_path / "warnings.txt"
+        path.write_bytes(b"JUMP\n" * 5000 + COMMANDS)
+        log_file = tmp_path / "run.log"
+        result = subprocess.run(
+            [sys.executable, MAIN, str(path), "--engine", engine, "--log-file", str(log_file)],
+            cwd=tmp_path, capture_output=True, timeout=60, env={**os.environ, "PYTHONPATH": ROOT},
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.decode() == EXPECTED
+        assert log_file.exists()
+
+    def test_stdin(self, tmp_path):
+        """
+        "-" reads commands from stdin.
+        """
+        result = run_main("-", "--no-log", cwd=tmp_path, stdin=COMMANDS)
+        assert result.stdout.decode() == EXPECTED
+
+    def test_no_log_creates_no_log_directory(self, tmp_path, commands):
+        """
+        With --no-log nothing is logged, not even to stderr, and no logs/ directory is created.
+        """
+        result = run_main(commands, "--no-log", cwd=tmp_path)
+        assert result.stderr == b""
+        assert not (tmp_path / "logs").exists()
+
+    def test_logging_to_file(self, tmp_path, commands):
+        """
+        Without --no-log, warnings are written to the log file.
+        """
+        log_file = tmp_path / "run.log"
+        result = run_main(commands, "--log-file", str(log_file), cwd=tmp_path)
+        assert result.returncode == 0, result.stderr
+        assert "Unrecognised command: 'JUMP'" in log_file.read_text()
+
+    def test_invalid_arguments(self, tmp_path):
+        """
+        A missing input file, or stdin with a file-only engine, is a usage error.
+        """
+        assert run_main(str(tmp_path / "missing.txt"), "--no-log", cwd=tmp_path).returncode == 2
+        assert run_main("-", "--engine", "parallel", cwd=tmp_path, stdin=b"").returncode == 2
+
+
+class TestColdStart:
+    def test_heavy_modules_are_not_imported(self, tmp_path, commands):
+        """
+        A plain run does not import the modules of the optional engines and features.
+        """
+        result = run_main(commands, "--no-log", cwd=tmp_path, python_args=("-X", "importtime"))
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.decode().splitlines()}
+        assert not imported & set(HEAVY_MODULES)
+
+    def test_cold_start_within_budget(self, tmp_path, commands):
+        """
+        The best of several runs starts within COLD_START_BUDGET of a bare interpreter.
+        """
+        def best_of(command, runs=5):
+            times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(command, cwd=tmp_path, capture_output=True, env={**os.environ, "PYTHONPATH": ROOT})
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        baseline = best_of([sys.executable, "-c", "pass"])
+        elapsed = best_of([sys.executable, MAIN, commands, "--no-log"])
+        assert elapsed - baseline < COLD_START_BUDGET
@@ -0,0 +1,122 @@
+"""
+test_memory.py
+
+Memory budget tests for the streaming entry points. Each entry point runs generated
+command streams of increasing size under tracemalloc, and must stay within a fixed
+peak budget whatever the stream length, without retaining more memory as the stream
+grows. On failure, the growth is attributed to allocation sites (see
+benchmarks/memory_report.py).
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+from benchmarks.memory_report import ENTRY_POINTS, growth_sites, memory_profile
+from config.logging_config import setup_logger
+
+SIZES = (2_000, 4_000, 8_000)
+
+# Peak traced bytes allowed at any stream size
+PEAK_BUDGET = 512 * 1024
+PEAK_BUDGETS = {
+    # Up to queue_size records may wait for the log writer thread
+    "queued_logging": 2 * 1024 * 1024,
+}
+# Growth allowed between the smallest and the largest stream. What remains is noise
+# such as interpreter free lists and output buffers filling up, never per-command state.
+PEAK_GROWTH_BUDGET = 64 * 1024
+RETAINED_GROWTH_BUDGET = 32 * 1024
+
+
+@pytest.fixture(scope="module")
+def stream_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("streams"))
+
+
+def leaky(path, scratch):
+    """
+    An entry point that keeps every line it reads.
+    """
+    kept = []
+    with open(path, "rb") as file:
+        for line in file:
+            kept.append(line)
+    return kept
+
+
+class TestMemoryBudgets:
+    @pytest.mark.parametrize("name", sorted(ENTRY_POINTS))
+    def test_constant_memory(self, name, stream_dir):
+        """
+        Peak memory stays within budget at every size, and neither peak nor retained
+        memory grows with the length of the stream.
+        """
+        usage = memory_profile(ENTRY_POINTS[name], SIZES, stream_dir)
+        budget = PEAK_BUDGETS.get(name, PEAK_BUDGET)
+        peak_growth = usage[-1].peak_bytes - usage[0].peak_bytes
+        retained_growth = usage[-1].retained_bytes - usage[0].retained_bytes
+
+        def explain():
+            sites = growth_sites(ENTRY_POINTS[name], SIZES[0], SIZES[-1], stream_dir, limit=5)
+            return f"{usage}; growth by site: {sites}"
+
+        assert max(row.peak_bytes for row in usage) <= budget, explain()
+        assert retained_growth <= RETAINED_GROWTH_BUDGET, explain()
+        if name not in PEAK_BUDGETS:
+            assert peak_growth <= PEAK_GROWTH_BUDGET, explain()
+
+    def test_growth_is_attributed(self, stream_dir):
+        """
+        The report points at the line that accumulates memory.
+        """
+        usage = memory_profile(leaky, SIZES[:2], stream_dir)
+        assert usage[1].retained_bytes - usage[0].retained_bytes > RETAINED_GROWTH_BUDGET
+        sites = growth_sites(leaky, SIZES[0], SIZES[1], stream_dir, limit=1)
+        filename, line = sites[0]["site"].rsplit(":", 1)
+        assert filename.endswith("test_memory.py")
+        assert leaky.__code__.co_firstlineno < int(line) <= leaky.__code__.co_firstlineno + 7
+        assert sites[0]["count_diff"] >= SIZES[1] - SIZES[0]
+
+
+class TestLogQueueBound:
+    def test_stalled_writer_drops_records(self, tmp_path):
+        """
+        When the log writer falls behind, the queue stops growing at queue_size and
+        further records are counted as dropped instead of making the caller wait.
+        """
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        root.handlers = []
+        release = threading.Event()
+        try:
+            listener = setup_logger(str(tmp_path / "logs" / "robot.log"), queue_size=16)
+            # Stall the writer thread on the first record it takes off the queue
+            written = []
+
+            class StalledHandler(logging.Handler):
+                def emit(self, record):
+                    release.wait()
+                    written.append(record)
+
+            listener.handlers = (StalledHandler(),)
+            logger = logging.getLogger("test_memory")
+            logger.warning("record 0")
+            while listener.queue.qsize():
+                time.sleep(0.001)
+            producer = threading.Thread(target=lambda: [logger.warning("record %s", i) for i in range(1, 40)])
+            producer.start()
+            producer.join(5)
+            assert not producer.is_alive()
+            assert listener.queue.qsize() == 16
+            assert root.handlers[0].dropped == 39 - 16
+
+            release.set()
+            listener.stop()
+            assert len(written) == 17
+        finally:
+            release.set()
+            for handler in root.handlers:
+                handler.close()
+            root.handlers, root.level = handlers, level
@@ -0,0 +1,188 @@
+"""
+test_messaging.py
+
+Tests for the SQLite broker stand-in and the micro-batched message consumer, covering
+leases, per-robot ordering, retries, dead-lettering and acknowledgement after processing.
+"""
+
+import threading
+import time
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.messaging import MessageConsumer, SQLiteBroker
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+
+
+class FlakySink(ListSink):
+    """
+    A ListSink whose first `failures` writes raise.
+    """
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def write(self, x, y, direction):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("sink unavailable")
+        super().write(x, y, direction)
+
+
+def list_controller(robot):
+    return RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink())
+
+
+class TestSQLiteBroker:
+    def test_publish_receive_ack(self):
+        """
+        Messages are delivered oldest first and removed once acknowledged.
+        """
+        with SQLiteBroker() as broker:
+            broker.publish([("a", "PLACE 0,0,NORTH"), ("b", "MOVE"), ("a", "REPORT")])
+            messages = broker.receive(10)
+            assert [(m.robot, m.command, m.attempts) for m in messages] == [
+                ("a", "PLACE 0,0,NORTH", 1), ("b", "MOVE", 1), ("a", "REPORT", 1)]
+            assert broker.receive(10) == []
+            broker.ack([m.id for m in messages])
+            assert broker.pending() == 0
+
+    def test_expired_lease_is_redelivered(self):
+        """
+        A message not acknowledged within the visibility timeout is delivered again.
+        """
+        with SQLiteBroker(visibility_timeout=0.01) as broker:
+            broker.publish([("a", "MOVE")])
+            first = broker.receive(1)
+            time.sleep(0.02)
+            again = broker.receive(1)
+            assert [m.id for m in again] == [first[0].id]
+            assert again[0].attempts == 2
+
+    def test_robot_messages_are_delivered_in_order(self):
+        """
+        A robot's later messages are held back while an earlier one is leased.
+        """
+        with SQLiteBroker() as broker:
+            broker.publish([("a", "PLACE 0,0,NORTH"), ("b", "MOVE"), ("a", "MOVE")])
+            first = broker.receive(1)
+            assert [m.command for m in broker.receive(10)] == ["MOVE"]
+            assert [m.robot for m in broker.receive(10)] == []
+            broker.ack([first[0].id])
+            assert [(m.robot, m.command) for m in broker.receive(10)] == [("a", "MOVE")]
+
+    def test_nack_retries_then_dead_letters(self):
+        """
+        Nacked messages are redelivered until they reach max_attempts, and are then
+        dead-lettered, which releases the robot's later messages.
+        """
+        with SQLiteBroker(max_attempts=2) as broker:
+            broker.publish([("a", "JUMP"), ("a", "MOVE")])
+            first = broker.receive(1)
+            broker.nack([first[0].id])
+            second = broker.receive(1)
+            assert second[0].id == first[0].id and second[0].attempts == 2
+            broker.nack([second[0].id])
+            assert [(m.command, m.attempts) for m in broker.dead_letters()] == [("JUMP", 2)]
+            assert [m.command for m in broker.receive(10)] == ["MOVE"]
+
+    def test_retry_delay(self):
+        """
+        A nacked message waits out the retry delay, and so do the robot's later messages.
+        """
+        with SQLiteBroker(retry_delay=60.0) as broker:
+            broker.publish([("a", "MOVE"), ("a", "LEFT"), ("b", "RIGHT")])
+            broker.nack([m.id for m in broker.receive(1)])
+            assert [m.robot for m in broker.receive(10)] == ["b"]
+
+    def test_shared_file_leases_each_message_once(self, tmp_path):
+        """
+        Consumers sharing a database file never lease the same message.
+        """
+        path = str(tmp_path / "queue.db")
+        with SQLiteBroker(path) as first, SQLiteBroker(path) as second:
+            first.publish((str(i), "MOVE") for i in range(100))
+            ids = [m.id for m in first.receive(60)] + [m.id for m in second.receive(60)]
+            assert sorted(ids) == sorted(set(ids)) and len(ids) == 100
+
+
+class TestMessageConsumer:
+    def test_commands_reach_their_robot(self):
+        """
+        Each robot's commands run on its own controller, in publish order.
+        """
+        with SQLiteBroker() as broker:
+            broker.publish([("a", "PLACE 0,0,NORTH"), ("b", "PLACE 4,4,SOUTH"), ("a", "MOVE"),
+                            ("b", "MOVE"), ("a", "REPORT"), ("b", "REPORT"), ("c", "MOVE")])
+            consumer = MessageConsumer(broker, list_controller, batch_size=3)
+            assert consumer.drain() == 7
+            assert consumer.controllers["a"].sink.lines() == ["Output: 0,1,NORTH"]
+            assert consumer.controllers["b"].sink.lines() == ["Output: 4,3,SOUTH"]
+            assert consumer.processed == 7 and broker.pending() == 0
+
+    def test_failed_delivery_is_retried_in_order(self, caplog):
+        """
+        A failing command is retried, and the robot's later commands in the batch wait
+        for it, while other robots' commands are acknowledged.
+        """
+        sinks = {"a": FlakySink(1), "b": ListSink()}
+
+        def factory(robot):
+            return RobotController(robot=Robot(), navigation=Navigation(), sink=sinks[robot])
+
+        with SQLiteBroker() as broker:
+            broker.publish([("a", "PLACE 0,0,EAST"), ("a", "REPORT"), ("b", "PLACE 1,1,WEST"),
+                            ("a", "MOVE"), ("a", "REPORT"), ("b", "REPORT")])
+            consumer = MessageConsumer(broker, factory)
+            assert consumer.poll() == 6
+            assert consumer.failed == 3 and broker.pending() == 3
+            assert "sink unavailable" in caplog.text
+            consumer.drain()
+            assert sinks["a"].lines() == ["Output: 0,0,EAST", "Output: 1,0,EAST"]
+            assert sinks["b"].lines() == ["Output: 1,1,WEST"]
+            assert broker.pending() == 0
+
+    def test_nothing_is_acked_if_flush_fails(self):
+        """
+        Acknowledgement happens only after the batch's output has been flushed.
+        """
+        class BrokenFlush(ListSink):
+            def flush(self):
+                raise OSError("disk full")
+
+        with SQLiteBroker() as broker:
+            broker.publish([("a", "PLACE 0,0,EAST"), ("a", "REPORT")])
+            consumer = MessageConsumer(
+                broker, lambda robot: RobotController(robot=Robot(), navigation=Navigation(), sink=BrokenFlush()))
+            with pytest.raises(OSError):
+                consumer.poll()
+            assert broker.pending() == 2
+
+    def test_run_until_stopped(self, tmp_path):
+        """
+        run() keeps consuming newly published messages until stopped.
+        """
+        path = str(tmp_path / "queue.db")
+        stop = threading.Event()
+        sink = ListSink()
+
+        def consume():
+            # A SQLite connection belongs to the thread that opened it
+            with SQLiteBroker(path) as broker:
+                consumer = MessageConsumer(broker, lambda robot: RobotController(
+                    robot=Robot(), navigation=Navigation(), sink=sink))
+                consumer.run(poll_interval=0.01, stop=stop)
+
+        with SQLiteBroker(path) as producer:
+            thread = threading.Thread(target=consume)
+            thread.start()
+            producer.publish([("a", "PLACE 2,2,NORTH"), ("a", "REPORT")])
+            deadline = time.monotonic() + 5
+            while producer.pending() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop.set()
+            thread.join()
+        assert sink.lines() == ["Output: 2,2,NORTH"]
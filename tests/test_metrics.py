@@ -0,0 +1,85 @@
+"""
+test_metrics.py
+
+Tests for the opt-in command instrumentation: counters by command type and outcome,
+parse/execute latency histograms, and the snapshot and Prometheus outputs.
+"""
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.metrics import CommandMetrics
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+
+COMMANDS = [
+    "MOVE", "JUMP", "PLACE 5,5,EAST", "PLACE 1,A,EAST", "PLACE 0,0,SOUTH",
+    "MOVE", "LEFT", "MOVE", "MOVE 2", "REPORT",
+]
+
+def run(commands, metrics):
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(), metrics=metrics)
+    for cmd in commands:
+        controller.process_command(cmd)
+    return controller
+
+class TestCommandMetrics:
+    def test_counts_by_command_and_outcome(self):
+        """
+        Every command is counted once under its type and outcome.
+        """
+        metrics = CommandMetrics()
+        run(COMMANDS, metrics)
+        counts = {(c["command"], c["outcome"]): c["count"] for c in metrics.snapshot()["commands"]}
+        assert counts == {
+            ("MOVE", "unplaced_ignored"): 1,
+            ("UNKNOWN", "unrecognised"): 1,
+            ("PLACE", "invalid_place"): 1,
+            ("PLACE", "malformed"): 1,
+            ("PLACE", "executed"): 1,
+            ("MOVE", "unsafe_move"): 1,
+            ("LEFT", "executed"): 1,
+            ("MOVE", "executed"): 1,
+            ("MOVE", "malformed"): 1,
+            ("REPORT", "executed"): 1,
+        }
+
+    def test_latency_histograms_count_every_command(self):
+        """
+        Parse and execute latencies are recorded separately for every command.
+        """
+        metrics = CommandMetrics()
+        run(COMMANDS, metrics)
+        snapshot = metrics.snapshot()
+        for phase in ("parse_latency", "execute_latency"):
+            assert snapshot[phase]["count"] == len(COMMANDS)
+            assert sum(snapshot[phase]["counts"]) == len(COMMANDS)
+
+    def test_bytes_input_is_instrumented(self):
+        """
+        Commands arriving as bytes are counted like string commands.
+        """
+        metrics = CommandMetrics()
+        controller = run([], metrics)
+        controller.process_bytes(b"PLACE 0,0,NORTH")
+        controller.process_bytes(b"MOVE")
+        assert metrics.snapshot()["execute_latency"]["count"] == 2
+
+    def test_prometheus_text(self):
+        """
+        The Prometheus dump contains the counters and cumulative histogram buckets.
+        """
+        metrics = CommandMetrics()
+        run(COMMANDS, metrics)
+        text = metrics.to_prometheus()
+        assert 'toy_robot_commands_total{command="MOVE",outcome="unsafe_move"} 1' in text
+        assert 'toy_robot_parse_latency_seconds_bucket{le="+Inf"} 10' in text
+        assert "toy_robot_execute_latency_seconds_count 10" in text
+
+    def test_disabled_by_default(self):
+        """
+        Without metrics the controller keeps its uninstrumented entry points.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        assert controller.metrics is None
+        assert "process_command" not in vars(controller)
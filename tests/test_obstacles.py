@@ -0,0 +1,110 @@
+"""
+test_obstacles.py
+
+Tests for ObstacleNavigation, which validates positions on rectangular grids against a
+bit-packed map of blocked cells.
+"""
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.obstacles import ObstacleNavigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+
+class TestObstacleNavigation:
+    def test_rectangular_bounds(self):
+        """
+        Width and height are checked independently.
+        """
+        nav = ObstacleNavigation(width=7, height=3)
+        assert nav.is_valid_position(6, 2)
+        assert not nav.is_valid_position(2, 6)
+        assert not nav.is_valid_position(-1, 0)
+
+    def test_bounds(self):
+        """
+        bounds() reports the rectangle, where Navigation reports its square.
+        """
+        assert ObstacleNavigation(width=7, height=3).bounds() == (7, 3)
+        assert Navigation(4).bounds() == (4, 4)
+
+    def test_blocked_cells_are_invalid(self, caplog):
+        """
+        Blocked cells are rejected and logged, their neighbours are not affected.
+        """
+        nav = ObstacleNavigation(width=5, height=5)
+        nav.block(2, 2)
+        assert not nav.is_valid_position(2, 2)
+        assert nav.is_valid_position(1, 2) and nav.is_valid_position(3, 2)
+        assert "(2,2) is blocked" in caplog.text
+
+    def test_rectangle_fill_across_byte_boundaries(self):
+        """
+        Filling a rectangle sets exactly its cells, including partial bytes at each end.
+        """
+        nav = ObstacleNavigation(width=37, height=4)
+        nav.block(3, 1, 30, 2)
+        blocked = {(x, y) for y in range(4) for x in range(37) if nav.is_blocked(x, y)}
+        assert blocked == {(x, y) for y in (1, 2) for x in range(3, 31)}
+
+    def test_one_bit_per_cell(self):
+        """
+        A 10k x 10k floor takes one bit per cell.
+        """
+        nav = ObstacleNavigation(width=10_000, height=10_000)
+        assert len(nav.bits) == 12_500_000
+        nav.block(0, 9_999, 9_999, 9_999)
+        assert nav.is_blocked(5_000, 9_999) and not nav.is_blocked(5_000, 9_998)
+
+    def test_rejects_off_grid_obstacles(self):
+        """
+        Obstacles must lie on the grid.
+        """
+        with pytest.raises(ValueError):
+            ObstacleNavigation(width=5, height=5).block(0, 0, 5, 0)
+
+class TestObstacleFiles:
+    def test_text_format(self, tmp_path):
+        """
+        Text files list single cells and inclusive rectangles, with comments allowed.
+        """
+        path = tmp_path / "floor.txt"
+        path.write_text("# shelving\n1,1\n\n3,0-3,2\n")
+        nav = ObstacleNavigation.from_file(str(path), width=5, height=5)
+        assert [nav.is_blocked(x, y) for x, y in [(1, 1), (3, 0), (3, 2), (3, 3), (0, 0)]] == [True, True, True, False, False]
+
+    def test_malformed_text_line(self, tmp_path):
+        """
+        A malformed line reports its line number.
+        """
+        path = tmp_path / "floor.txt"
+        path.write_text("1,1\n1;2\n")
+        with pytest.raises(ValueError, match="line 2"):
+            ObstacleNavigation.from_file(str(path), width=5, height=5)
+
+    def test_binary_round_trip(self, tmp_path):
+        """
+        Saved maps load back with their dimensions and blocked cells.
+        """
+        nav = ObstacleNavigation(width=13, height=9)
+        nav.block(4, 4, 8, 6)
+        path = tmp_path / "floor.bin"
+        nav.save(str(path))
+        loaded = ObstacleNavigation.from_file(str(path))
+        assert (loaded.width, loaded.height, loaded.bits) == (13, 9, nav.bits)
+
+class TestControllerWithObstacles:
+    def test_place_and_move_respect_obstacles(self, caplog):
+        """
+        The controller cannot place the robot on, or move it into, a blocked cell.
+        """
+        nav = ObstacleNavigation(width=6, height=3)
+        nav.block(2, 0)
+        sink = ListSink()
+        controller = RobotController(robot=Robot(), navigation=nav, sink=sink)
+        for cmd in ["PLACE 2,0,EAST", "PLACE 1,0,EAST", "MOVE", "LEFT", "MOVE", "RIGHT", "MOVE", "MOVE", "MOVE", "MOVE", "REPORT"]:
+            controller.process_command(cmd)
+        assert sink.records == [(5, 1, "EAST")]
+        assert "PLACE ignored: invalid position (2,0,EAST)" in caplog.text
+        assert "Unsafe MOVE ignored: (2,0EAST)" in caplog.text
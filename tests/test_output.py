@@ -0,0 +1,82 @@
+"""
+test_output.py
+
+Tests for the REPORT output sinks and their flush policies, and for the controller
+writing its REPORT results to a configured sink.
+"""
+
+import io
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import _BufferedSink, BinaryRecordSink, BufferedTextSink, ListSink, read_binary_records
+from toy_robot.robot import Robot
+
+COMMANDS = ["PLACE 1,2,EAST", "REPORT", "MOVE", "REPORT", "LEFT", "REPORT"]
+EXPECTED = [(1, 2, "EAST"), (2, 2, "EAST"), (2, 2, "NORTH")]
+
+def run(sink):
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=sink)
+    for cmd in COMMANDS:
+        controller.process_command(cmd)
+    return controller
+
+class TestSinks:
+    def test_list_sink_collects_results_without_printing(self, capsys):
+        """
+        Embedding callers can read results from a ListSink instead of stdout.
+        """
+        sink = ListSink()
+        run(sink)
+        assert sink.records == EXPECTED
+        assert sink.lines()[0] == "Output: 1,2,EAST"
+        assert capsys.readouterr().out == ""
+
+    def test_buffered_text_sink_flushes_by_count(self):
+        """
+        Text is held back until the flush threshold is reached or flush() is called.
+        """
+        stream = io.StringIO()
+        sink = BufferedTextSink(stream, flush_every=2)
+        run(sink)
+        assert stream.getvalue() == "Output: 1,2,EAST\nOutput: 2,2,EAST\n"
+        sink.flush()
+        assert stream.getvalue().splitlines()[-1] == "Output: 2,2,NORTH"
+
+    def test_buffered_text_sink_flushes_by_interval(self):
+        """
+        With a zero interval every write is flushed straight away.
+        """
+        stream = io.StringIO()
+        sink = BufferedTextSink(stream, flush_every=None, flush_interval=0)
+        run(sink)
+        assert len(stream.getvalue().splitlines()) == 3
+
+    def test_binary_records_round_trip(self):
+        """
+        Binary records decode back to the reported positions and directions.
+        """
+        stream = io.BytesIO()
+        sink = BinaryRecordSink(stream)
+        run(sink)
+        sink.flush()
+        stream.seek(0)
+        assert list(read_binary_records(stream)) == EXPECTED
+
+    def test_buffered_sink_requires_write_out(self):
+        """
+        A buffered sink that does not say how to write its buffer cannot be created.
+        """
+        class Incomplete(_BufferedSink):
+            def write(self, x, y, direction): ...
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_default_sink_prints(self, capsys):
+        """
+        Without a sink the controller prints each REPORT as before.
+        """
+        run(None)
+        assert capsys.readouterr().out.splitlines()[-1] == "Output: 2,2,NORTH"
@@ -0,0 +1,163 @@
+"""
+test_parallel.py
+
+Tests for the transition-table state machine and the parallel map-reduce execution
+of command files, which must produce exactly the same output as a sequential run.
+"""
+
+import logging
+import random
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import OP_LEFT, OP_MOVE, OP_NOP, OP_PLACE, OP_REPORT
+from toy_robot.obstacles import ObstacleNavigation
+from toy_robot.parallel import _iter_opcodes, _summarise_chunk, chunk_boundaries, run_parallel
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+from toy_robot.transitions import STATE_UNPLACED, TransitionTable
+
+COMMAND_POOL = [
+    "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "PLACE 0,0,NORTH", "PLACE 4,4,SOUTH",
+    "PLACE 5,5,EAST", "place 1,1,NORTH", "JUMP", "",
+]
+
+def write_commands(path, count, seed=3):
+    rng = random.Random(seed)
+    # Keep the stream unplaced for a while so the first chunks depend on their start state
+    lines = [rng.choice([c for c in COMMAND_POOL if not c.startswith("PLACE")]) for _ in range(count // 10)]
+    lines += [rng.choice(COMMAND_POOL) for _ in range(count)]
+    path.write_text("\n".join(lines) + "\n")
+    return lines
+
+class TestTransitionTable:
+    def test_tables_follow_controller_rules(self):
+        """
+        Unplaced robots ignore commands, turns wrap around and unsafe MOVEs are ignored.
+        """
+        tables = TransitionTable(grid_size=5)
+        assert tables.tables[OP_MOVE][STATE_UNPLACED] == STATE_UNPLACED
+        corner = tables.encode(0, 0, 2)  # facing SOUTH at the origin
+        assert tables.tables[OP_MOVE][corner] == corner
+        assert tables.decode(tables.tables[OP_LEFT][tables.encode(1, 1, 0)]) == (1, 1, 3)
+        assert tables.tables[OP_REPORT][corner] == corner
+        assert tables.place(5, 0, 0) is None
+
+class TestParallelExecution:
+    def test_chunks_cover_file_on_line_boundaries(self, tmp_path):
+        """
+        Chunks are contiguous, cover the whole file and never split a line.
+        """
+        path = tmp_path / "commands.txt"
+        write_commands(path, 500)
+        data = path.read_bytes()
+        chunks = chunk_boundaries(str(path), chunk_size=97)
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            assert end == start and data[end - 1:end] == b"\n"
+
+    def test_matches_sequential_controller(self, tmp_path, capsys):
+        """
+        Parallel execution over many small chunks gives the same REPORT output and
+        final state as feeding every line through a RobotController.
+        """
+        path = tmp_path / "commands.txt"
+        lines = write_commands(path, 2000)
+
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        for line in lines:
+            if line.strip():
+                controller.process_command(line.strip())
+        expected = capsys.readouterr().out.splitlines()
+
+        state, reports = run_parallel(str(path), processes=2, chunk_size=256)
+        tables = TransitionTable()
+        assert [tables.format_report(report) for report in reports] == expected
+        robot = controller.robot
+        assert tables.format_report(state) == f"Output: {robot.current_x},{robot.current_y},{robot.current_direction}"
+
+    def test_summary_matches_every_start_state(self, tmp_path):
+        """
+        A chunk's summary maps every start state to the state a step-by-step run of
+        the chunk ends in, across many rounds of merging duplicate image states.
+        """
+        path = tmp_path / "commands.txt"
+        rng = random.Random(5)
+        lines = [rng.choice(["MOVE", "MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "JUMP"]) for _ in range(1000)]
+        path.write_text("\n".join(lines) + "\n")
+        size = path.stat().st_size
+
+        function = _summarise_chunk((str(path), 0, size, 5))
+        tables = TransitionTable(grid_size=5)
+        opcodes = list(_iter_opcodes(str(path), 0, size))
+        for start in range(tables.num_states):
+            state = start
+            for op, x, y, direction in opcodes:
+                state = tables.apply(state, op, x, y, direction)
+            assert function[start] == state
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_single_process_matches_pool(self, tmp_path, processes):
+        """
+        With one process the chunks are replayed sequentially, with the same result as
+        the map-reduce run on a pool.
+        """
+        path = tmp_path / "commands.txt"
+        write_commands(path, 2000)
+        start_state = TransitionTable().encode(2, 2, 1)
+        expected = run_parallel(str(path), processes=2, chunk_size=256, start_state=start_state)
+        assert run_parallel(str(path), processes=processes, chunk_size=256, start_state=start_state) == expected
+
+    def test_obstacle_navigation_is_rejected(self, tmp_path):
+        """
+        Parallel runs only follow the rules of a plain square grid, so other
+        navigations are rejected instead of failing on a missing grid_size.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_text("PLACE 0,0,NORTH\nMOVE\nREPORT\n")
+        controller = RobotController(robot=Robot(), navigation=ObstacleNavigation(5, 5))
+        with pytest.raises(ValueError, match="ObstacleNavigation"):
+            Simulator(controller).run_parallel(str(path), processes=1)
+
+    def test_simulator_continues_from_final_state(self, tmp_path, capsys):
+        """
+        After a parallel run the controller's robot holds the final state of the file.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_text("PLACE 1,2,EAST\nMOVE\nREPORT\nMOVE\nLEFT\n")
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        Simulator(controller).run_parallel(str(path), processes=1, chunk_size=8)
+        controller.process_command("REPORT")
+        assert capsys.readouterr().out.splitlines() == ["Output: 2,2,EAST", "Output: 3,2,NORTH"]
+
+    def test_simulator_starts_from_robot_state(self, tmp_path, capsys):
+        """
+        A parallel run continues from where earlier commands left the robot.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_text("MOVE\nREPORT\n")
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        controller.process_command("PLACE 3,3,EAST")
+        Simulator(controller).run_parallel(str(path), processes=1)
+        assert capsys.readouterr().out.splitlines() == ["Output: 4,3,EAST"]
+
+    def test_rejected_commands_are_not_logged(self, tmp_path, caplog):
+        """
+        Parallel runs parse without logging, as documented.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_text("JUMP\nPLACE 1,x,NORTH\nPLACE 0,0,NORTH\nREPORT\n")
+        size = path.stat().st_size
+        with caplog.at_level(logging.DEBUG):
+            opcodes = list(_iter_opcodes(str(path), 0, size))
+        assert [op for op, *_ in opcodes] == [OP_NOP, OP_NOP, OP_PLACE, OP_REPORT]
+        assert caplog.records == []
+
+    def test_missing_file_is_logged(self, tmp_path, caplog):
+        """
+        A missing command file is logged as an error.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        Simulator(controller).run_parallel(str(tmp_path / "missing.txt"), processes=1)
+        assert "File not found" in caplog.text
@@ -0,0 +1,207 @@
+"""
+test_pathfinding.py
+
+Tests for the GOTO planner and command, checking plan optimality against an
+independent search, navigation constraints, distance-field caching and controller
+integration.
+"""
+
+import logging
+from collections import deque
+
+import pytest
+from toy_robot.controller import OUTCOME_EXECUTED, OUTCOME_UNPLACED, OUTCOME_UNREACHABLE, OUTCOME_UNSAFE_MOVE, RobotController
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.navigation import Navigation
+from toy_robot.obstacles import ObstacleNavigation
+from toy_robot.output import ListSink
+from toy_robot.pathfinding import GotoPlanner
+from toy_robot.robot import Robot
+
+DIRECTIONS = ["NORTH", "EAST", "SOUTH", "WEST"]
+DELTAS = {"NORTH": (0, 1), "EAST": (1, 0), "SOUTH": (0, -1), "WEST": (-1, 0)}
+
+
+def reference_distance(navigation, start, target):
+    """
+    Forward breadth-first search over (x, y, direction), independent of the planner.
+    """
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y, direction = state = queue.popleft()
+        if (x, y) == target:
+            return seen[state]
+        index = DIRECTIONS.index(direction)
+        dx, dy = DELTAS[direction]
+        following = [(x, y, DIRECTIONS[(index - 1) % 4]), (x, y, DIRECTIONS[(index + 1) % 4])]
+        if navigation.is_blocked_or_off(x + dx, y + dy) is False:
+            following.append((x + dx, y + dy, direction))
+        for state_next in following:
+            if state_next not in seen:
+                seen[state_next] = seen[state] + 1
+                queue.append(state_next)
+    return None
+
+
+class Floor(ObstacleNavigation):
+    def is_blocked_or_off(self, x, y):
+        return not (0 <= x < self.width and 0 <= y < self.height) or self.is_blocked(x, y)
+
+
+def make_floor():
+    floor = Floor(5, 5)
+    floor.block(1, 1, 1, 3)
+    floor.block(3, 0, 3, 2)
+    return floor
+
+
+def make_controller(navigation=None, **kwargs):
+    navigation = navigation if navigation is not None else Navigation()
+    return RobotController(robot=Robot(), navigation=navigation, sink=ListSink(),
+                           planner=GotoPlanner(navigation, grid_size=5), **kwargs)
+
+
+class TestGotoPlanner:
+    def test_plans_are_optimal(self):
+        """
+        From every start state to every target, the plan has the length of the
+        shortest path found by an independent search, and leads to the target.
+        """
+        floor = make_floor()
+        planner = GotoPlanner(floor, grid_size=5)
+        cells = [(x, y) for y in range(5) for x in range(5) if not floor.is_blocked(x, y)]
+        for target in cells:
+            for x, y in cells:
+                for direction in DIRECTIONS:
+                    plan = planner.plan(x, y, direction, *target)
+                    assert len(plan) == reference_distance(floor, (x, y, direction), target)
+
+                    robot = Robot()
+                    robot.place(x, y, direction)
+                    for (command,) in plan:
+                        if command == "MOVE":
+                            new_x, new_y, _ = robot.propose_move()
+                            assert not floor.is_blocked_or_off(new_x, new_y)
+                            robot.update_position(new_x, new_y)
+                        elif command == "LEFT":
+                            robot.turn_left()
+                        else:
+                            robot.turn_right()
+                    assert (robot.current_x, robot.current_y) == target
+
+    def test_unreachable_targets(self):
+        """
+        Blocked, off-grid and walled-off targets have no plan.
+        """
+        floor = ObstacleNavigation(5, 5)
+        floor.block(3, 0, 3, 4)
+        planner = GotoPlanner(floor, grid_size=5)
+        assert planner.plan(0, 0, "NORTH", 3, 2) is None
+        assert planner.plan(0, 0, "NORTH", 7, 2) is None
+        assert planner.plan(0, 0, "NORTH", 4, 4) is None
+        assert planner.plan(0, 0, "NORTH", 2, 4) is not None
+
+    def test_grid_must_match_navigation(self):
+        """
+        Plans are only made on the square grid the navigation covers.
+        """
+        assert GotoPlanner(ObstacleNavigation(6, 6)).transitions.grid_size == 6
+        with pytest.raises(ValueError):
+            GotoPlanner(ObstacleNavigation(10, 4))
+        with pytest.raises(ValueError):
+            GotoPlanner(Navigation(5), grid_size=8)
+
+    def test_distance_fields_are_cached(self):
+        """
+        The distance field of a target is computed once and then served from the cache.
+        """
+        planner = GotoPlanner(Navigation(), cache_size=2)
+        first = planner.distance_field(4, 4)
+        assert planner.distance_field(4, 4) is first
+        planner.distance_field(0, 0)
+        planner.distance_field(1, 1)
+        assert (4, 4) not in planner.fields
+        assert planner.fields.stats()["hits"] == 1
+
+
+class TestGotoCommand:
+    def test_goto_moves_robot(self):
+        """
+        GOTO drives the robot to the target cell.
+        """
+        controller = make_controller()
+        controller.process_command("PLACE 0,0,NORTH")
+        assert controller.execute(controller.parse_command("GOTO 3,2")) == OUTCOME_EXECUTED
+        assert (controller.robot.current_x, controller.robot.current_y) == (3, 2)
+        controller.process_command("GOTO 3,2")
+        assert (controller.robot.current_x, controller.robot.current_y) == (3, 2)
+
+    def test_goto_with_table_controller(self):
+        """
+        The lookup-table controller expands GOTO the same way.
+        """
+        navigation = make_floor()
+        controller = TableController(robot=TableRobot(5), navigation=navigation, sink=ListSink(),
+                                     planner=GotoPlanner(navigation, grid_size=5))
+        reference = make_controller(make_floor())
+        for command in ["PLACE 0,0,NORTH", "GOTO 2,1", "REPORT", "GOTO 4,0", "REPORT"]:
+            controller.process_command(command)
+            reference.process_command(command)
+        assert controller.sink.lines() == reference.sink.lines()
+        assert controller.sink.lines()[-1].startswith("Output: 4,0,")
+
+    def test_unreachable_goto_is_logged(self, caplog):
+        """
+        A GOTO to an unreachable cell is ignored and logged.
+        """
+        controller = make_controller(make_floor())
+        controller.process_command("PLACE 0,0,NORTH")
+        with caplog.at_level(logging.WARNING):
+            assert controller.execute(controller.parse_command("GOTO 1,2")) == OUTCOME_UNREACHABLE
+        assert "GOTO ignored: (1,2) is unreachable" in caplog.text
+        assert controller.robot.state() == (0, 0, "NORTH")
+
+    def test_unplaced_goto_is_ignored(self):
+        """
+        GOTO is ignored until the robot has been placed.
+        """
+        controller = make_controller()
+        assert controller.execute(controller.parse_command("GOTO 1,1")) == OUTCOME_UNPLACED
+
+    def test_plan_step_rejected_by_changed_navigation(self):
+        """
+        If the navigation changes after the planner was built, the plan stops at the
+        first rejected MOVE.
+        """
+        floor = ObstacleNavigation(5, 5)
+        controller = make_controller(floor)
+        controller.process_command("PLACE 0,0,NORTH")
+        floor.block(0, 2)
+        assert controller.execute(controller.parse_command("GOTO 0,4")) == OUTCOME_UNSAFE_MOVE
+        assert controller.robot.state() == (0, 1, "NORTH")
+
+    def test_goto_requires_planner(self, caplog):
+        """
+        Without a planner, GOTO is an unrecognised command, as before.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink())
+        with caplog.at_level(logging.WARNING):
+            assert controller.parse_command("GOTO 1,1") is None
+        assert "Unrecognised command: 'GOTO 1,1'" in caplog.text
+
+    @pytest.mark.parametrize("command, reason", [
+        ("GOTO 1", "expected X,Y, got 1 values"),
+        ("GOTO 1,2,3", "expected X,Y, got 3 values"),
+        ("GOTO A,2", "invalid literal for int() with base 10: 'A'"),
+        ("GOTO 1,B", "invalid literal for int() with base 10: 'B'"),
+    ])
+    def test_malformed_goto(self, caplog, command, reason):
+        """
+        Malformed GOTO commands are rejected and logged with the reason.
+        """
+        controller = make_controller()
+        with caplog.at_level(logging.WARNING):
+            assert controller.parse_command(command) is None
+        assert f"Invalid GOTO command format: {command} - {reason}" in caplog.text
+        assert controller.parse_command("GOTO 1,2 3") is None
@@ -0,0 +1,81 @@
+"""
+test_reader.py
+
+Tests for the bytes-level line reader and the Simulator entry points built on it,
+covering memory-mapped files, unmappable streams and bytes dispatch in the controller.
+"""
+
+import io
+
+import pytest
+from toy_robot import reader
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.reader import iter_lines
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+
+CONTENT = b"PLACE 1,2,EAST\r\nMOVE\n\n  \nMOVE\nLEFT\nJUMP\nMOVE\nREPORT"
+
+def make_simulator():
+    return Simulator(RobotController(robot=Robot(), navigation=Navigation()))
+
+class TestIterLines:
+    def test_mapped_file_lines(self, tmp_path):
+        """
+        Lines of a regular file are returned as bytes, with or without a final newline.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_bytes(CONTENT)
+        with open(path, "rb") as file:
+            assert list(iter_lines(file)) == CONTENT.split(b"\n")
+
+    def test_empty_file(self, tmp_path):
+        """
+        An empty file yields no lines.
+        """
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        with open(path, "rb") as file:
+            assert list(iter_lines(file)) == []
+
+    def test_stream_lines_across_block_boundaries(self, monkeypatch):
+        """
+        Unmappable streams are read in blocks, and lines spanning blocks are rejoined.
+        """
+        monkeypatch.setattr(reader, "BLOCK_SIZE", 4)
+        assert list(iter_lines(io.BytesIO(CONTENT + b"\n"))) == CONTENT.split(b"\n")
+
+class TestSimulatorFromFile:
+    def test_file_and_stream_match_text_processing(self, tmp_path, capsys):
+        """
+        Reading as bytes gives the same output as sending decoded lines to the controller.
+        """
+        path = tmp_path / "commands.txt"
+        path.write_bytes(CONTENT)
+
+        controller = RobotController(robot=Robot(), navigation=Navigation())
+        for line in CONTENT.decode().splitlines():
+            if line.strip():
+                controller.process_command(line.strip())
+        expected = capsys.readouterr().out
+
+        make_simulator().run_from_file(str(path))
+        assert capsys.readouterr().out == expected == "Output: 3,3,NORTH\n"
+        make_simulator().run_from_stream(io.BytesIO(CONTENT))
+        assert capsys.readouterr().out == expected
+
+    def test_invalid_bytes_are_logged(self, caplog):
+        """
+        Lines that are not simple commands fall back to the regular parser and logging.
+        """
+        make_simulator().run_from_stream(io.BytesIO(b"JUMP\nMOVE\n"))
+        assert "Unrecognised command: 'JUMP'" in caplog.text
+        assert "Ignoring 'MOVE' as no PLACE command has been issued yet." in caplog.text
+
+    def test_missing_file_is_logged(self, tmp_path, caplog):
+        """
+        A missing command file is logged as an error.
+        """
+        make_simulator().run_from_file(str(tmp_path / "missing.txt"))
+        assert "File not found" in caplog.text
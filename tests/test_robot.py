@@ -5,6 +5,7 @@ Unit tests for the Robot class, which manages placement, direction, movement, an
 """
 
 import pytest
+from toy_robot.interfaces import RobotInterface
 from toy_robot.robot import Robot
 
 class TestPlacement:
@@ -70,3 +71,27 @@ class TestReporting:
         robot.report()
         out, _ = capfd.readouterr()
         assert out.strip() == "Output: 1,2,EAST"
+
+class TestInterface:
+    def test_state_has_a_default(self):
+        """
+        Robots written before state() was added still instantiate, and state() reads
+        their current position and direction.
+        """
+        class LegacyRobot(RobotInterface):
+            def __init__(self):
+                self.current_x = self.current_y = self.current_direction = None
+
+            def place(self, x, y, direction):
+                self.current_x, self.current_y, self.current_direction = x, y, direction
+
+            def propose_move(self): ...
+            def update_position(self, new_x, new_y): ...
+            def turn_left(self): ...
+            def turn_right(self): ...
+            def report(self): ...
+
+        robot = LegacyRobot()
+        assert robot.state() == (None, None, None)
+        robot.place(1, 2, "WEST")
+        assert robot.state() == (1, 2, "WEST")
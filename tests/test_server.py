@@ -0,0 +1,80 @@
+"""
+test_server.py
+
+Tests for the asyncio CommandServer, which runs an independent robot session for every
+client connection and streams REPORT output back over the socket.
+"""
+
+import asyncio
+
+import pytest
+from toy_robot.server import CommandServer
+
+async def start(server):
+    listener = await server.start_tcp()
+    port = listener.sockets[0].getsockname()[1]
+    return listener, port
+
+async def send(port, payload):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(payload)
+    writer.write_eof()
+    output = await reader.read()
+    writer.close()
+    return output
+
+class TestCommandServer:
+    def test_sessions_are_independent(self):
+        """
+        Each connection drives its own robot and only receives its own REPORT output.
+        """
+        async def scenario():
+            listener, port = await start(CommandServer())
+            async with listener:
+                return await asyncio.gather(
+                    send(port, b"PLACE 1,2,EAST\nMOVE\nMOVE\nLEFT\nMOVE\nREPORT\n"),
+                    send(port, b"MOVE\nREPORT\nPLACE 0,0,NORTH\nMOVE\nREPORT\n"),
+                )
+
+        first, second = asyncio.run(scenario())
+        assert first == b"Output: 3,3,NORTH\n"
+        assert second == b"Output: 0,1,NORTH\n"
+
+    def test_over_long_line_closes_session(self, caplog):
+        """
+        A command longer than the line limit disconnects the client.
+        """
+        async def scenario():
+            listener, port = await start(CommandServer(max_line_length=64))
+            async with listener:
+                return await send(port, b"PLACE 0,0,NORTH\n" + b"X" * 200 + b"\nREPORT\n")
+
+        assert asyncio.run(scenario()) == b""
+        assert "command longer than 64 bytes" in caplog.text
+
+    def test_max_sessions_rejects_extra_connections(self, caplog):
+        """
+        Connections beyond the session limit are closed immediately.
+        """
+        async def scenario():
+            server = CommandServer(max_sessions=1)
+            listener, port = await start(server)
+            async with listener:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"PLACE 0,0,NORTH\n")
+                await writer.drain()
+                while not server.sessions:
+                    await asyncio.sleep(0.01)
+                extra_reader, extra_writer = await asyncio.open_connection("127.0.0.1", port)
+                rejected = await extra_reader.read()
+                extra_writer.close()
+                writer.write(b"REPORT\n")
+                writer.write_eof()
+                accepted = await reader.read()
+                writer.close()
+                return rejected, accepted
+
+        rejected, accepted = asyncio.run(scenario())
+        assert rejected == b""
+        assert accepted == b"Output: 0,0,NORTH\n"
+        assert "Rejecting connection" in caplog.text
@@ -0,0 +1,182 @@
+"""
+test_state_board.py
+
+Tests for the shared-memory state board, covering the record layout, tear-free reads
+under a concurrent writer process, publishing from controllers and the batch runner's
+fleet mode.
+"""
+
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+from toy_robot.batch import run_batch
+from toy_robot.controller import RobotController
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+from toy_robot.state_board import HEADER, RECORD, SEQUENCE, BoardRecord, StateBoard
+from toy_robot.trace import TraceReader, TraceRecorder
+
+DIRECTIONS = ["NORTH", "EAST", "SOUTH", "WEST"]
+
+
+def hammer(name, slot, count):
+    """
+    Publish states whose fields all derive from one counter, so a torn read is visible.
+    """
+    board = StateBoard.attach(name)
+    for i in range(count):
+        board.publish(slot, i, -i, DIRECTIONS[i % 4])
+    board.close()
+
+
+class TestStateBoard:
+    def test_new_board_is_unplaced(self):
+        """
+        Every slot of a new board reads as an unplaced robot.
+        """
+        with StateBoard.create(3) as board:
+            assert board.snapshot() == [BoardRecord(None, None, None, False, 0)] * 3
+
+    def test_publish_and_read(self):
+        """
+        Published states are read back, and each write advances the sequence by two.
+        """
+        with StateBoard.create(2) as board:
+            board.publish(1, 3, 4, "WEST")
+            assert board.read(1) == BoardRecord(3, 4, "WEST", True, 2)
+            board.publish(1, None, None, None)
+            assert board.read(1) == BoardRecord(None, None, None, False, 4)
+            assert board.read(0).sequence == 0
+
+    def test_record_layout(self):
+        """
+        Records are fixed-width and sit after the header in slot order.
+        """
+        with StateBoard.create(2) as board:
+            board.publish(1, 2, 3, "SOUTH")
+            assert RECORD.size == 24
+            assert RECORD.unpack_from(board.shm.buf, HEADER.size + RECORD.size) == (2, 2, 3, 2, 1)
+
+    def test_attach_by_name(self):
+        """
+        A board attached by name sees the owner's writes, and closing it leaves the block.
+        """
+        with StateBoard.create(1) as board:
+            reader = StateBoard.attach(board.name)
+            board.publish(0, 1, 1, "NORTH")
+            assert reader.read(0).x == 1
+            reader.close()
+            assert StateBoard.attach(board.name).read(0).direction == "NORTH"
+        with pytest.raises(FileNotFoundError):
+            StateBoard.attach(board.name)
+
+    def test_not_a_board(self):
+        """
+        Attaching to a block without the board header is rejected.
+        """
+        shm = SharedMemory(create=True, size=64)
+        try:
+            with pytest.raises(ValueError):
+                StateBoard.attach(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_slot_out_of_range(self):
+        """
+        Slots beyond the board raise IndexError.
+        """
+        with StateBoard.create(2) as board:
+            with pytest.raises(IndexError):
+                board.publish(2, 0, 0, "NORTH")
+            with pytest.raises(IndexError):
+                board.read(-1)
+
+    def test_slot_mid_write_is_not_returned(self):
+        """
+        A slot whose sequence is odd is being written, and is never returned.
+        """
+        with StateBoard.create(1) as board:
+            SEQUENCE.pack_into(board.shm.buf, HEADER.size, 7)
+            with pytest.raises(TimeoutError):
+                board.read(0, retries=10)
+
+    def test_reads_never_tear(self):
+        """
+        Reads during a concurrent writer process always return a state that was
+        written as a whole.
+        """
+        with StateBoard.create(1) as board:
+            writer = Process(target=hammer, args=(board.name, 0, 200_000))
+            writer.start()
+            reads = 0
+            while writer.is_alive() or reads == 0:
+                record = board.read(0)
+                if record.placed:
+                    assert record.y == -record.x
+                    assert record.direction == DIRECTIONS[record.x % 4]
+                reads += 1
+            writer.join()
+            assert writer.exitcode == 0
+            assert board.read(0) == BoardRecord(199_999, -199_999, "WEST", True, 400_000)
+
+
+class TestControllerPublishing:
+    @pytest.mark.parametrize("factory", [
+        lambda: RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink()),
+        lambda: TableController(robot=TableRobot(), navigation=Navigation(), sink=ListSink()),
+    ])
+    def test_bind_publishes_every_command(self, factory):
+        """
+        A bound controller publishes its state when bound and after every command.
+        """
+        with StateBoard.create(1) as board:
+            controller = factory()
+            board.bind(controller, 0)
+            assert board.read(0).sequence == 2
+            controller.process_command("PLACE 1,2,EAST")
+            controller.process_bytes(b"MOVE")
+            assert board.read(0) == BoardRecord(2, 2, "EAST", True, 6)
+            controller.process_command("JUMP")
+            assert board.read(0).sequence == 8
+
+    def test_bind_keeps_tracing(self, tmp_path):
+        """
+        Binding wraps an already traced execute(), so both keep working.
+        """
+        with StateBoard.create(1) as board, TraceRecorder(str(tmp_path)) as trace:
+            controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(), trace=trace)
+            board.bind(controller, 0)
+            controller.process_command("PLACE 0,0,NORTH")
+            controller.process_command("MOVE")
+            assert board.read(0).y == 1
+        with TraceReader(str(tmp_path)) as reader:
+            assert len(reader) == 2
+
+
+class TestFleetMode:
+    def test_batch_publishes_to_board(self, tmp_path):
+        """
+        In fleet mode every file's robot publishes its final state to its own slot.
+        """
+        files = ["PLACE 0,0,NORTH\nMOVE\n", "MOVE\n", "PLACE 4,4,WEST\nMOVE\nLEFT\n"]
+        for index, content in enumerate(files):
+            (tmp_path / f"{index}.txt").write_text(content)
+        with StateBoard.create(4) as board:
+            run_batch(str(tmp_path), processes=2, board=board)
+            states = [record[:4] for record in board.snapshot()]
+        assert states == [(0, 1, "NORTH", True), (None, None, None, False), (3, 4, "SOUTH", True),
+                          (None, None, None, False)]
+
+    def test_board_too_small(self, tmp_path):
+        """
+        A board with fewer slots than files is rejected before anything runs.
+        """
+        (tmp_path / "a.txt").write_text("MOVE\n")
+        (tmp_path / "b.txt").write_text("MOVE\n")
+        with StateBoard.create(1) as board:
+            with pytest.raises(ValueError):
+                run_batch(str(tmp_path), processes=1, board=board)
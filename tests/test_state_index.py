@@ -0,0 +1,165 @@
+"""
+test_state_index.py
+
+Tests for the sparse state index, checking point and range queries against a full
+replay through RobotController, and validation of the index file.
+"""
+
+import random
+
+import pytest
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+from toy_robot.state_index import StateIndex, build_index
+
+COMMANDS = [
+    "PLACE 1,1,NORTH", "PLACE 9,9,EAST", "PLACE 0,4,WEST", "MOVE", "MOVE", "MOVE", "LEFT",
+    "RIGHT", "REPORT", "", "   ", "JUMP", "PLACE 1,A,NORTH", " move ",
+]
+
+
+def write_commands(path, count, seed=7):
+    generator = random.Random(seed)
+    lines = [generator.choice(COMMANDS) for _ in range(count)]
+    path.write_text("\r\n".join(lines[:count // 2]) + "\n" + "\n".join(lines[count // 2:]))
+    return lines
+
+
+def replay_states(lines):
+    """
+    Return the robot state after every line, replayed through RobotController.
+    """
+    controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink())
+    states = [controller.robot.state()]
+    for line in lines:
+        if line.strip():
+            controller.process_command(line.strip())
+        states.append(controller.robot.state())
+    return states
+
+
+@pytest.fixture
+def indexed(tmp_path):
+    commands = tmp_path / "commands.txt"
+    lines = write_commands(commands, 1000)
+    index_path = str(tmp_path / "commands.idx")
+    assert build_index(str(commands), index_path, interval=64) == len(lines)
+    with StateIndex(index_path, str(commands)) as index:
+        yield index, replay_states(lines)
+
+
+class TestStateIndex:
+    def test_point_queries_match_replay(self, indexed):
+        """
+        The state after every line, including line 0, matches a full replay.
+        """
+        index, expected = indexed
+        for line in range(len(expected)):
+            assert index.state_at(line) == expected[line], line
+
+    def test_range_query_matches_replay(self, indexed):
+        """
+        Range queries yield every line in the range, in order.
+        """
+        index, expected = indexed
+        for first, last in [(0, 0), (0, 200), (63, 65), (64, 64), (500, 999), (999, 1000)]:
+            assert list(index.states(first, last)) == list(enumerate(expected))[first:last + 1]
+
+    def test_snapshot_bounds_replay(self, indexed):
+        """
+        A query starts from a snapshot at most one interval before the requested line.
+        """
+        index, _ = indexed
+        for line in (0, 1, 63, 64, 65, 1000):
+            snapshot_line, _, _ = index.snapshot(line)
+            assert snapshot_line <= line < snapshot_line + index.interval
+
+    def test_out_of_range(self, indexed):
+        """
+        Lines outside 0..lines and reversed ranges are rejected.
+        """
+        index, _ = indexed
+        with pytest.raises(ValueError):
+            index.state_at(1001)
+        with pytest.raises(ValueError):
+            index.state_at(-1)
+        with pytest.raises(ValueError):
+            list(index.states(10, 5))
+
+    def test_blank_lines_are_counted(self, tmp_path):
+        """
+        Blank lines count towards line numbers.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_text("PLACE 0,0,NORTH\n\n\nMOVE\n")
+        index_path = str(tmp_path / "commands.idx")
+        assert build_index(str(commands), index_path, interval=2) == 4
+        with StateIndex(index_path, str(commands)) as index:
+            assert index.state_at(3) == (0, 0, "NORTH")
+            assert index.state_at(4) == (0, 1, "NORTH")
+
+    def test_empty_file(self, tmp_path):
+        """
+        An empty file has only the initial state.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_bytes(b"")
+        index_path = str(tmp_path / "commands.idx")
+        assert build_index(str(commands), index_path) == 0
+        with StateIndex(index_path, str(commands)) as index:
+            assert index.state_at(0) == (None, None, None)
+
+
+class TestIndexValidation:
+    def test_changed_source_is_rejected(self, tmp_path):
+        """
+        An index cannot be opened against a file that grew since.
+        """
+        commands = tmp_path / "commands.txt"
+        write_commands(commands, 100)
+        index_path = str(tmp_path / "commands.idx")
+        build_index(str(commands), index_path)
+        with open(commands, "a") as file:
+            file.write("MOVE\n")
+        with pytest.raises(ValueError):
+            StateIndex(index_path, str(commands))
+
+    def test_rewritten_source_is_rejected(self, tmp_path):
+        """
+        An index cannot be opened against a file rewritten since with the same size.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_text("PLACE 0,0,NORTH\nMOVE\nREPORT\n")
+        index_path = str(tmp_path / "commands.idx")
+        build_index(str(commands), index_path)
+        commands.write_text("PLACE 0,0,NORTH\nLEFT\nREPORT\n")
+        with pytest.raises(ValueError, match="was not built from"):
+            StateIndex(index_path, str(commands))
+
+    def test_malformed_index_is_rejected(self, tmp_path):
+        """
+        Files that are not state indexes, or are truncated, are rejected.
+        """
+        commands = tmp_path / "commands.txt"
+        write_commands(commands, 100)
+        index_path = tmp_path / "commands.idx"
+        build_index(str(commands), str(index_path), interval=10)
+
+        data = index_path.read_bytes()
+        index_path.write_bytes(data[:-1])
+        with pytest.raises(ValueError):
+            StateIndex(str(index_path), str(commands))
+        index_path.write_bytes(b"XXXX" + data[4:])
+        with pytest.raises(ValueError):
+            StateIndex(str(index_path), str(commands))
+
+    def test_invalid_interval(self, tmp_path):
+        """
+        The snapshot interval must be positive.
+        """
+        commands = tmp_path / "commands.txt"
+        commands.write_text("MOVE\n")
+        with pytest.raises(ValueError):
+            build_index(str(commands), str(tmp_path / "commands.idx"), interval=0)
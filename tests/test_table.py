@@ -0,0 +1,81 @@
+"""
+test_table.py
+
+Tests for the SharedTable class, which routes ID-addressed commands to several robots
+on one tabletop and rejects moves into occupied cells.
+"""
+
+import pytest
+from toy_robot.output import ListSink
+from toy_robot.table import SharedTable
+
+def make_table():
+    sinks = {}
+
+    def sink_factory(robot_id):
+        sinks[robot_id] = ListSink()
+        return sinks[robot_id]
+
+    return SharedTable(sink_factory=sink_factory), sinks
+
+class TestSharedTable:
+    def test_commands_are_routed_by_robot_id(self):
+        """
+        Each robot keeps its own state and REPORT output.
+        """
+        table, sinks = make_table()
+        for line in ["R1 PLACE 0,0,NORTH", "R2 PLACE 4,4,SOUTH", "R1 MOVE", "R2 MOVE", "R1 REPORT", "R2 REPORT"]:
+            table.process_command(line)
+        assert sinks["R1"].records == [(0, 1, "NORTH")]
+        assert sinks["R2"].records == [(4, 3, "SOUTH")]
+        assert table.occupancy == {(0, 1): "R1", (4, 3): "R2"}
+
+    def test_move_into_occupied_cell_is_rejected(self, caplog):
+        """
+        A MOVE into another robot's cell is ignored and logged.
+        """
+        table, sinks = make_table()
+        for line in ["R1 PLACE 0,0,NORTH", "R2 PLACE 0,1,SOUTH", "R1 MOVE", "R1 REPORT"]:
+            table.process_command(line)
+        assert sinks["R1"].records == [(0, 0, "NORTH")]
+        assert "(0,1) is occupied by robot R2" in caplog.text
+
+    def test_place_on_occupied_cell_is_rejected(self):
+        """
+        A robot cannot be placed on another robot's cell, but may be re-placed on its own.
+        """
+        table, _ = make_table()
+        for line in ["R1 PLACE 2,2,EAST", "R2 PLACE 2,2,WEST", "R1 PLACE 2,2,WEST"]:
+            table.process_command(line)
+        assert not table.robots["R2"].robot.is_placed
+        assert table.robots["R1"].robot.current_direction == "WEST"
+        assert table.occupant(2, 2) == "R1"
+
+    def test_cells_are_freed_when_robots_leave(self):
+        """
+        Moving, re-placing or removing a robot frees its previous cell.
+        """
+        table, _ = make_table()
+        for line in ["R1 PLACE 0,0,EAST", "R1 MOVE", "R2 PLACE 0,0,NORTH", "R1 PLACE 3,3,EAST"]:
+            table.process_command(line)
+        assert table.occupancy == {(0, 0): "R2", (3, 3): "R1"}
+        table.remove("R2")
+        assert table.occupancy == {(3, 3): "R1"}
+
+    def test_unaddressed_line_is_ignored(self, caplog):
+        """
+        Lines without a robot ID and command are logged and ignored.
+        """
+        table, _ = make_table()
+        table.process_command("MOVE")
+        assert table.robots == {}
+        assert "expected '<ROBOT_ID> <COMMAND>'" in caplog.text
+
+    def test_default_sink_labels_output(self, capsys):
+        """
+        By default REPORT output is printed with the robot's ID.
+        """
+        table = SharedTable()
+        table.process_command("R7 PLACE 1,2,EAST")
+        table.process_command("R7 REPORT")
+        assert capsys.readouterr().out == "Output: R7 1,2,EAST\n"
@@ -0,0 +1,134 @@
+"""
+test_tokenizer.py
+
+Corpus-based equivalence tests for the exception-free tokenizer. Every input is parsed
+by tokenize() and by a copy of the original exception-based parser, and both the
+parse result and the log record of any rejection must be identical.
+"""
+
+import logging
+import random
+import sys
+
+import pytest
+from toy_robot.interfaces import RobotInterface
+from toy_robot.log_events import EVENT_BAD_PLACE, EVENT_UNRECOGNISED
+from toy_robot.tokenizer import tokenize
+
+VALID_COMMANDS = {"PLACE", "MOVE", "LEFT", "RIGHT", "REPORT"}
+
+
+def reference_tokenize(command):
+    """
+    The original RobotController.parse_command(), returning its log record instead
+    of logging it.
+    """
+    parts = command.strip().split()
+
+    if not parts:
+        return None, None
+
+    cmd = parts[0]
+
+    if cmd not in VALID_COMMANDS:
+        return None, (logging.WARNING, "Unrecognised command: '%s'", command, EVENT_UNRECOGNISED)
+
+    if cmd == "PLACE":
+        if len(parts) != 2:
+            return None, None
+        try:
+            x_str, y_str, direction = parts[1].split(",")
+            x, y = int(x_str), int(y_str)
+            direction = direction.strip()
+
+            if direction not in RobotInterface.GET_CARDINAL_DIRECTIONS:
+                raise ValueError("Invalid direction.")
+
+            return ("PLACE", x, y, direction), None
+        except (ValueError, IndexError) as e:
+            return None, (logging.ERROR, "Invalid PLACE command format: %s - %s", command, str(e), EVENT_BAD_PLACE)
+
+    if len(parts) == 1:
+        return (cmd,), None
+
+    return None, None
+
+
+EDGE_CASES = [
+    "", " ", "\t\n", "MOVE", " MOVE ", "MOVE\r", "move", "Move", "MOVE MOVE", "MOVEX", "REPORT",
+    "LEFT", "RIGHT", "JUMP", "JUMP 1,2,NORTH", "PLACE", "PLACE ", "PLACE 1,2,NORTH",
+    "PLACE 1,2,NORTH EXTRA", "PLACE 1, 2,NORTH", "PLACE 1,2", "PLACE 1,2,3,NORTH", "PLACE ,,",
+    "PLACE 1,2,", "PLACE ,2,NORTH", "PLACE 1,,NORTH", "PLACE A,2,NORTH", "PLACE 1,B,NORTH",
+    "PLACE 1,2,north", "PLACE 1,2,NORTHEAST", "PLACE 1,2,NORTHNORTH", "PLACE +1,-2,EAST",
+    "PLACE -0,+0,WEST", "PLACE 007,08,SOUTH", "PLACE 1_0,2,EAST", "PLACE 1__0,2,EAST",
+    "PLACE _1,2,EAST", "PLACE 1_,2,EAST", "PLACE +_1,2,EAST", "PLACE +-1,2,EAST", "PLACE --1,2,EAST",
+    "PLACE 1.0,2,EAST", "PLACE 0x1,2,EAST", "PLACE 1e3,2,EAST", "PLACE ١,٢,NORTH",
+    "PLACE １,２,NORTH", "PLACE ²,1,NORTH", "PLACE Ⅰ,1,NORTH", "PLACE 1,2,NORTH",
+    "PLACE 1,2,NORTH", "　MOVE", "PLACE 1,2,NORTH\x1c", "PLACE 1\x1f2,NORTH",
+    "PLACE " + "9" * 300 + ",1,NORTH", "PLACE " + "A" * 300 + ",1,NORTH",
+    "PLACE 1,2,NORTH,", "PLACE 1,2,NORTH,EAST", "PLACE\t3,4,WEST", "PLACE 1,2,م",
+]
+
+ALPHABET = [
+    "PLACE", "PLACE ", "MOVE", "LEFT", "RIGHT", "REPORT", "NORTH", "EAST", "SOUTH", "WEST", "north",
+    "0", "1", "4", "9", "12", "-", "+", "_", ",", ",", ",", " ", "  ", "\t", " ", "A", ".",
+    "٣", "５", "¹", "",
+]
+
+
+def random_corpus(count, seed=0):
+    generator = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        pieces = [generator.choice(["PLACE ", "PLACE ", "MOVE", "JUMP ", ""])]
+        pieces.extend(generator.choice(ALPHABET) for _ in range(generator.randint(0, 8)))
+        corpus.append("".join(pieces))
+        # Well-formed PLACE commands with one field perturbed
+        fields = [str(generator.randint(-20, 20)), str(generator.randint(-20, 20)), generator.choice(ALPHABET[6:11])]
+        fields[generator.randrange(3)] = generator.choice(ALPHABET)
+        corpus.append("PLACE " + ",".join(fields))
+    return corpus
+
+
+class TestTokenizerEquivalence:
+    @pytest.mark.parametrize("command", EDGE_CASES)
+    def test_edge_cases(self, command):
+        """
+        Hand-picked edge cases are accepted and rejected exactly as before.
+        """
+        assert tokenize(command) == reference_tokenize(command)
+
+    def test_random_corpus(self):
+        """
+        A large generated corpus of near-valid commands is parsed exactly as before.
+        """
+        for command in random_corpus(20000):
+            assert tokenize(command) == reference_tokenize(command), repr(command)
+
+    def test_literals_beyond_int_digit_limit(self):
+        """
+        Literals too long for int() are rejected with int()'s own message.
+        """
+        limit = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+        if not limit:
+            pytest.skip("int() has no digit limit on this interpreter")
+        command = "PLACE " + "1" * (limit + 1) + ",1,NORTH"
+        assert tokenize(command) == reference_tokenize(command)
+        assert tokenize(command)[0] is None
+
+
+class TestTokenizerResults:
+    def test_place(self):
+        """
+        A valid PLACE yields its converted operands and no rejection.
+        """
+        assert tokenize("PLACE 1,2,EAST") == (("PLACE", 1, 2, "EAST"), None)
+
+    def test_bad_direction_message(self):
+        """
+        A bad direction is rejected with the original message and event tag.
+        """
+        parsed, rejection = tokenize("PLACE 1,2,UP")
+        assert parsed is None
+        assert rejection == (logging.ERROR, "Invalid PLACE command format: %s - %s", "PLACE 1,2,UP",
+                             "Invalid direction.", EVENT_BAD_PLACE)
@@ -0,0 +1,164 @@
+"""
+test_trace.py
+
+Tests for columnar execution traces, covering recording through RobotController,
+memory-mapped replay without re-execution and the on-disk column format.
+"""
+
+import os
+from array import array
+
+import pytest
+from toy_robot.bytecode import compile_lines
+from toy_robot.controller import RobotController
+from toy_robot.lut import TableController, TableRobot
+from toy_robot.metrics import CommandMetrics
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import OP_MOVE, OP_NOP, OP_PLACE
+from toy_robot.output import ListSink
+from toy_robot.pathfinding import GotoPlanner
+from toy_robot.robot import Robot
+from toy_robot.trace import TRACE_OP_GOTO, TraceReader, TraceRecorder
+
+COMMANDS = ["MOVE", "PLACE 0,0,NORTH", "MOVE", "LEFT", "MOVE", "JUMP", "PLACE 9,9,EAST", "PLACE 1,x,EAST",
+            "RIGHT", "REPORT", "MOVE"]
+
+EXPECTED = [
+    ("MOVE", "unplaced_ignored", None, None, None),
+    ("PLACE", "executed", 0, 0, "NORTH"),
+    ("MOVE", "executed", 0, 1, "NORTH"),
+    ("LEFT", "executed", 0, 1, "WEST"),
+    ("MOVE", "unsafe_move", 0, 1, "WEST"),
+    ("NOP", "unrecognised", 0, 1, "WEST"),
+    ("PLACE", "invalid_place", 0, 1, "WEST"),
+    ("PLACE", "malformed", 0, 1, "WEST"),
+    ("RIGHT", "executed", 0, 1, "NORTH"),
+    ("REPORT", "executed", 0, 1, "NORTH"),
+    ("MOVE", "executed", 0, 2, "NORTH"),
+]
+
+
+def record(directory, controller_factory=None, flush_every=3):
+    with TraceRecorder(str(directory), flush_every=flush_every) as trace:
+        if controller_factory is None:
+            controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(), trace=trace)
+        else:
+            controller = controller_factory(trace)
+        for command in COMMANDS:
+            controller.process_command(command)
+    return controller
+
+
+class TestTraceRecording:
+    def test_rows_match_execution(self, tmp_path):
+        """
+        Every command is recorded with its outcome and the state after it.
+        """
+        record(tmp_path)
+        with TraceReader(str(tmp_path)) as reader:
+            assert len(reader) == len(COMMANDS)
+            assert [row.decode() for row in reader] == EXPECTED
+
+    def test_table_controller(self, tmp_path):
+        """
+        The lookup-table fast path is traced like the regular path.
+        """
+        record(tmp_path, lambda trace: TableController(robot=TableRobot(), navigation=Navigation(),
+                                                       sink=ListSink(), trace=trace))
+        with TraceReader(str(tmp_path)) as reader:
+            assert [row.decode() for row in reader] == EXPECTED
+
+    def test_outcomes_match_metrics(self, tmp_path):
+        """
+        With metrics enabled as well, rejected commands are traced with the outcome
+        CommandMetrics counts them under.
+        """
+        metrics = CommandMetrics()
+        record(tmp_path, lambda trace: RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(),
+                                                       metrics=metrics, trace=trace))
+        with TraceReader(str(tmp_path)) as reader:
+            assert [row.decode() for row in reader] == EXPECTED
+        assert metrics.commands[("UNKNOWN", "unrecognised")] == 1
+        assert metrics.commands[("PLACE", "malformed")] == 1
+
+    def test_bytecode_is_traced(self, tmp_path):
+        """
+        Commands executed from bytecode are recorded too.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink())
+        bytecode = compile_lines(["PLACE 1,1,EAST", "MOVE", "REPORT"], controller.parse_command)
+        with TraceRecorder(str(tmp_path)) as trace:
+            RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink(), trace=trace).execute_bytecode(bytecode)
+        with TraceReader(str(tmp_path)) as reader:
+            assert [row.decode()[0] for row in reader] == ["PLACE", "MOVE", "REPORT"]
+            assert reader[-1].decode() == ("REPORT", "executed", 2, 1, "EAST")
+
+    def test_goto_steps_are_traced(self, tmp_path):
+        """
+        The steps a GOTO expands into are recorded, followed by the GOTO itself.
+        """
+        navigation = Navigation()
+        with TraceRecorder(str(tmp_path)) as trace:
+            controller = RobotController(robot=Robot(), navigation=navigation, sink=ListSink(),
+                                         planner=GotoPlanner(navigation), trace=trace)
+            controller.process_command("PLACE 0,0,NORTH")
+            controller.process_command("GOTO 0,2")
+        with TraceReader(str(tmp_path)) as reader:
+            assert [row.opcode for row in reader] == [OP_PLACE, OP_MOVE, OP_MOVE, TRACE_OP_GOTO]
+            assert reader[-1].decode() == ("GOTO", "executed", 0, 2, "NORTH")
+
+    def test_no_trace_by_default(self):
+        """
+        Without a recorder, execute() is the plain class method.
+        """
+        controller = RobotController(robot=Robot(), navigation=Navigation(), sink=ListSink())
+        assert "execute" not in vars(controller)
+
+
+class TestTraceReader:
+    def test_columns_are_zero_copy_views(self, tmp_path):
+        """
+        Columns are typed memoryviews over the mapped files, and match the raw file contents.
+        """
+        record(tmp_path)
+        with TraceReader(str(tmp_path)) as reader:
+            x = reader.columns["x"]
+            assert x.format == "i" and x.readonly
+            expected = array("i")
+            with open(os.path.join(tmp_path, "x.col"), "rb") as file:
+                expected.frombytes(file.read())
+            assert x.tolist() == expected.tolist()
+            assert reader.columns["opcode"][0] == OP_MOVE
+            assert reader.columns["direction"][0] == -1
+            del x
+
+    def test_partial_rows_are_ignored(self, tmp_path):
+        """
+        Trailing partial values and rows missing from some columns are not read.
+        """
+        record(tmp_path)
+        with open(os.path.join(tmp_path, "x.col"), "ab") as file:
+            file.write(b"\x01\x02")
+        with open(os.path.join(tmp_path, "opcode.col"), "ab") as file:
+            file.write(bytes([OP_NOP]))
+        with TraceReader(str(tmp_path)) as reader:
+            assert len(reader) == len(COMMANDS)
+            assert [row.decode() for row in reader] == EXPECTED
+
+    def test_empty_trace(self, tmp_path):
+        """
+        A trace with no rows can be opened and is empty.
+        """
+        TraceRecorder(str(tmp_path)).close()
+        with TraceReader(str(tmp_path)) as reader:
+            assert len(reader) == 0
+            assert list(reader) == []
+
+    def test_index_out_of_range(self, tmp_path):
+        """
+        Indexing past the last row raises IndexError.
+        """
+        record(tmp_path)
+        with TraceReader(str(tmp_path)) as reader:
+            with pytest.raises(IndexError):
+                reader[len(COMMANDS)]
@@ -0,0 +1,147 @@
+"""
+batch.py
+
+This file runs many independent command files across a process pool. Every file gets
+a fresh RobotController, Robot and Navigation, so files never share state, and the
+results are returned in the same order as the input files.
+
+Responsibilities:
+- Resolve a directory or manifest file into an ordered list of command files
+- Run each file in a worker process with its own robot
+- Collect each file's REPORT output and warning count into an ordered result set
+- Optionally publish every robot's live state to a shared-memory StateBoard
+"""
+
+import logging
+import os
+from functools import partial
+from multiprocessing import Pool
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.output import ListSink
+from toy_robot.robot import Robot
+from toy_robot.simulator import Simulator
+from toy_robot.state_board import StateBoard
+
+# Boards attached by this worker process, by name, kept open for the process's lifetime
+_worker_boards: Dict[str, StateBoard] = {}
+
+
+class BatchResult(NamedTuple):
+    """
+    The outcome of running one command file.
+    """
+    path: str
+    reports: List[str]
+    warnings: int
+
+
+class _WarningCounter(logging.Handler):
+    """
+    Counts the warnings and errors logged while a file is running.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def collect_paths(source: str) -> List[str]:
+    """
+    Resolve the command files to run.
+
+    Parameters:
+    - source: either a directory, whose files are run in name order, or a manifest
+      file listing one command file per line. Relative manifest entries are resolved
+      against the manifest's directory, and blank lines are skipped.
+
+    Returns:
+    - list of command file paths in run order
+    """
+    if os.path.isdir(source):
+        return [
+            os.path.join(source, name)
+            for name in sorted(os.listdir(source))
+            if os.path.isfile(os.path.join(source, name))
+        ]
+
+    base = os.path.dirname(source)
+    with open(source, "r") as manifest:
+        return [os.path.join(base, line.strip()) for line in manifest if line.strip()]
+
+
+def run_file(path: str, grid_size: int = 5, board_name: Optional[str] = None, slot: int = 0) -> BatchResult:
+    """
+    Run a single command file with a fresh robot and collect its results.
+
+    Parameters:
+    - path: the command file
+    - grid_size: dimension of the square grid
+    - board_name: if given, the robot's state is published to this StateBoard's
+      `slot` after every command
+    """
+    sink = ListSink()
+    controller = RobotController(robot=Robot(), navigation=Navigation(grid_size), sink=sink)
+    if board_name is not None:
+        board = _worker_boards.get(board_name)
+        if board is None:
+            board = _worker_boards[board_name] = StateBoard.attach(board_name)
+        board.bind(controller, slot)
+
+    counter = _WarningCounter()
+    root = logging.getLogger()
+    root.addHandler(counter)
+    try:
+        Simulator(controller).run_from_file(path)
+    finally:
+        root.removeHandler(counter)
+    return BatchResult(path, sink.lines(), counter.count)
+
+
+def _run_slot(job: Tuple[int, str], grid_size: int, board_name: Optional[str]) -> BatchResult:
+    slot, path = job
+    return run_file(path, grid_size, board_name, slot)
+
+
+def run_batch(
+    source: str,
+    processes: Optional[int] = None,
+    grid_size: int = 5,
+    board: Optional[StateBoard] = None,
+) -> List[BatchResult]:
+    """
+    Run every command file from a directory or manifest on a process pool.
+
+    Parameters:
+    - source: a directory or manifest file (see collect_paths)
+    - processes: number of worker processes (default: os.cpu_count())
+    - grid_size: dimension of the square grid used for every file
+    - board: if given, the robot of the i-th file publishes its live state to slot i,
+      so other processes can watch the fleet while it runs
+
+    Raises:
+    - ValueError if the board has fewer slots than there are files
+
+    Returns:
+    - list of BatchResult, in the same order as collect_paths(source)
+    """
+    paths = collect_paths(source)
+    if not paths:
+        return []
+    if board is not None and board.slots < len(paths):
+        raise ValueError(f"State board {board.name} has {board.slots} slots for {len(paths)} files.")
+
+    processes = processes or os.cpu_count() or 1
+    # Hand out several files per task to amortise IPC, while keeping enough tasks
+    # for the load to balance across workers
+    chunksize = max(1, len(paths) // (processes * 4))
+    with Pool(processes) as pool:
+        if board is None:
+            return list(pool.imap(partial(run_file, grid_size=grid_size), paths, chunksize))
+        job = partial(_run_slot, grid_size=grid_size, board_name=board.name)
+        return list(pool.imap(job, enumerate(paths), chunksize))
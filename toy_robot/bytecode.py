@@ -0,0 +1,183 @@
+"""
+bytecode.py
+
+This file compiles command files into a compact bytecode so they can be replayed
+without re-tokenizing every line. Each accepted command becomes a single opcode byte,
+and the operands of PLACE and GOTO commands are kept in a side table in the order they
+appear. GOTO is planned when it is executed, since its plan depends on where the robot
+is by then.
+
+Compiled programs are cached on disk, keyed by a hash of the file contents and by
+whether GOTO was accepted, so a file that is replayed many times is only parsed once.
+
+Responsibilities:
+- Compile command lines into opcodes and a PLACE operand table
+- Serialise and deserialise the compiled form
+- Cache compiled programs on disk, keyed by content hash
+"""
+
+import hashlib
+import io
+import logging
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+from toy_robot.log_events import EVENT_BAD_PLACE, EVENT_UNREACHABLE, log_event
+from toy_robot.opcodes import OP_GOTO, OP_NOP, OP_PLACE, encode
+
+# Bump the version whenever the encoding or the parsing rules change, so stale cache
+# entries are never reused
+BYTECODE_VERSION = 2
+_MAGIC = b"TRBC"
+_HEADER = struct.Struct("<4sBII")
+
+# Range of the int32 PLACE operand table
+_OPERAND_MIN = -2 ** 31
+_OPERAND_MAX = 2 ** 31 - 1
+
+ParseFunction = Callable[[str], Optional[Union[Tuple[str], Tuple[str, int, int, str]]]]
+
+logger = logging.getLogger(__name__)
+
+
+class Bytecode:
+    """
+    A compiled command program.
+
+    Attributes:
+    - ops: one opcode per accepted command (rejected lines are dropped at compile time)
+    - operands: flat (x, y, direction_index) triples, one per OP_PLACE or OP_GOTO in
+      `ops` (a GOTO's direction_index is 0)
+    """
+
+    def __init__(self, ops: Optional[array] = None, operands: Optional[array] = None) -> None:
+        self.ops: array = ops if ops is not None else array("B")
+        self.operands: array = operands if operands is not None else array("i")
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialise the program into its on-disk format.
+        """
+        operands = array("i", self.operands)
+        if sys.byteorder == "big":
+            operands.byteswap()
+        header = _HEADER.pack(_MAGIC, BYTECODE_VERSION, len(self.ops), len(operands) // 3)
+        return header + self.ops.tobytes() + operands.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Bytecode":
+        """
+        Deserialise a program produced by to_bytes().
+
+        Raises:
+        - ValueError if the data is not a valid bytecode program for this version
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Bytecode is truncated.")
+        magic, version, n_ops, n_places = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != BYTECODE_VERSION:
+            raise ValueError("Unsupported bytecode format.")
+        ops_end = _HEADER.size + n_ops
+        if len(data) != ops_end + n_places * 3 * 4:
+            raise ValueError("Bytecode is truncated.")
+
+        ops = array("B", data[_HEADER.size:ops_end])
+        operands = array("i", data[ops_end:])
+        if sys.byteorder == "big":
+            operands.byteswap()
+        return cls(ops, operands)
+
+
+def compile_lines(lines: Iterable[str], parse: ParseFunction) -> Bytecode:
+    """
+    Compile command lines into bytecode.
+
+    Parameters:
+    - lines: raw command lines; blank lines are skipped
+    - parse: the parser deciding which commands are accepted, usually
+      RobotController.parse_command. Rejections are logged by the parser while
+      compiling, not when the bytecode is replayed.
+
+    A PLACE or GOTO whose coordinates do not fit the int32 operand table cannot be
+    on any grid, so it is dropped here and logged as the invalid position or
+    unreachable target it is.
+
+    Returns:
+    - Bytecode: the compiled program
+    """
+    program = Bytecode()
+    for line in lines:
+        command = line.strip()
+        if not command:
+            continue
+        parsed = parse(command)
+        op, x, y, direction = encode(parsed)
+        if op == OP_NOP:
+            continue
+        if op == OP_PLACE or op == OP_GOTO:
+            if not (_OPERAND_MIN <= x <= _OPERAND_MAX and _OPERAND_MIN <= y <= _OPERAND_MAX):
+                if op == OP_PLACE:
+                    log_event(logger, logging.WARNING, "PLACE ignored: invalid position (%s,%s,%s)", *parsed[1:], extra=EVENT_BAD_PLACE)
+                else:
+                    log_event(logger, logging.WARNING, "GOTO ignored: (%s,%s) is unreachable", x, y, extra=EVENT_UNREACHABLE)
+                continue
+            program.operands.extend((x, y, direction))
+        program.ops.append(op)
+    return program
+
+
+def load_or_compile(
+    filename: str,
+    parse: ParseFunction,
+    cache_dir: str = "cache/bytecode",
+    goto: bool = False,
+) -> Bytecode:
+    """
+    Return the compiled form of a command file, compiling it only on a cache miss.
+
+    Parameters:
+    - filename: path of the command file
+    - parse: the parser used on a cache miss (see compile_lines)
+    - cache_dir: directory holding compiled programs, named by content hash
+    - goto: whether `parse` accepts GOTO, which changes what the file compiles to
+
+    Returns:
+    - Bytecode: the compiled program
+    """
+    with open(filename, "rb") as file:
+        content = file.read()
+
+    digest = hashlib.sha256(content).hexdigest()
+    variant = ".goto" if goto else ""
+    cache_path = os.path.join(cache_dir, f"{digest}{variant}.v{BYTECODE_VERSION}.rbc")
+
+    try:
+        with open(cache_path, "rb") as cached:
+            return Bytecode.from_bytes(cached.read())
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        logger.warning("Discarding corrupt bytecode cache entry %s: %s", cache_path, e)
+
+    # newline=None splits lines the same way as reading the file in text mode
+    program = compile_lines(io.StringIO(content.decode("utf-8"), newline=None), parse)
+
+    # Write to a temporary file first so concurrent readers never see a partial entry
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(program.to_bytes())
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write bytecode cache entry %s: %s", cache_path, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return program
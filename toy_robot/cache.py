@@ -0,0 +1,104 @@
+"""
+cache.py
+
+This file defines small bounded caches used to memoise repeated work on the command
+path. Command streams are highly repetitive, so a few hundred distinct lines usually
+account for nearly all of the input.
+
+Responsibilities:
+- Provide a bounded least-recently-used cache with hit, miss and eviction counters
+- Provide the parse cache used by RobotController
+"""
+
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A dictionary bounded to `maxsize` entries that evicts the least recently used
+    entry when full. get() counts every lookup as a hit or a miss.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Return the cached value and mark it as recently used, or None on a miss.
+        """
+        entries = self._entries
+        value = entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+        Values must not be None, which get() uses to signal a miss.
+        """
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """
+        Return the cache counters as plain Python data.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ParseCache(LRUCache):
+    """
+    An LRUCache of parse results keyed by the raw command string, for use with
+    RobotController(parse_cache=...). Rejected commands are cached too, together with
+    the warning they produced.
+    """
+
+    def __init__(self, maxsize: int = 1024, log_repeats: bool = True) -> None:
+        """
+        Parameters:
+        - maxsize: maximum number of distinct commands kept
+        - log_repeats: if True, a cached rejection is logged every time it is seen,
+          exactly as without the cache; if False, only when it is first parsed (or
+          parsed again after being evicted)
+        """
+        super().__init__(maxsize)
+        self.log_repeats: bool = log_repeats
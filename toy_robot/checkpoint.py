@@ -0,0 +1,125 @@
+"""
+checkpoint.py
+
+This file defines the checkpoint format used to make long file runs crash-safe. A
+checkpoint records the robot's state together with the byte offset in the command
+file up to which every command has been executed, so an interrupted run can resume
+at that offset instead of replaying the file from the start.
+
+Checkpoints are small JSON documents. They are written to a temporary file in the
+same directory, flushed to disk and then renamed over the previous checkpoint with
+os.replace(), so a crash at any point leaves either the old or the new checkpoint
+on disk, never a partial one.
+
+A checkpoint also records a digest of the bytes just before its offset. A file that
+was rewritten or replaced since, even at the same path and with the same length, no
+longer has those bytes there, so its checkpoint is not resumed. Appending to the file
+keeps them, so a growing file can still be resumed.
+
+Responsibilities:
+- Capture and restore the robot state and input offset
+- Write checkpoints atomically
+- Detect checkpoints that do not belong to the current input file
+"""
+
+import hashlib
+import json
+import os
+from typing import NamedTuple, Optional
+
+from toy_robot.interfaces import RobotInterface
+
+CHECKPOINT_VERSION = 2
+
+# Bytes before the offset covered by the digest
+DIGEST_WINDOW = 64 * 1024
+
+
+def _digest_before(path: str, offset: int) -> Optional[str]:
+    """
+    Return the SHA-256 of the DIGEST_WINDOW bytes before `offset`, or None if the
+    file cannot be read or is shorter than `offset`.
+    """
+    start = max(0, offset - DIGEST_WINDOW)
+    try:
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = file.read(offset - start)
+    except OSError:
+        return None
+    if len(data) != offset - start:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+class Checkpoint(NamedTuple):
+    """
+    The state of a run after every command before `offset` has been executed.
+
+    - source: absolute path of the command file
+    - offset: byte offset of the next unprocessed line
+    - x, y, direction: the robot's state, or None for an unplaced robot
+    - digest: SHA-256 of the file's last DIGEST_WINDOW bytes before `offset`
+    """
+    source: str
+    offset: int
+    x: Optional[int]
+    y: Optional[int]
+    direction: Optional[str]
+    digest: Optional[str]
+
+    @classmethod
+    def capture(cls, source: str, offset: int, robot: RobotInterface) -> "Checkpoint":
+        x, y, direction = robot.state()
+        path = os.path.abspath(source)
+        return cls(path, offset, x, y, direction, _digest_before(path, offset))
+
+    def restore(self, robot: RobotInterface) -> None:
+        """
+        Place the robot in the checkpointed state. A robot that was unplaced at the
+        checkpoint is left as it is, so restore() expects a freshly created robot.
+        """
+        if self.direction is not None:
+            robot.place(self.x, self.y, self.direction)
+
+    def matches(self, source: str) -> bool:
+        """
+        Return whether this checkpoint can be resumed against the given file: it was
+        taken from the same path, and the bytes before `offset` are still the ones it
+        was taken after.
+        """
+        path = os.path.abspath(source)
+        return path == self.source and self.digest is not None and _digest_before(path, self.offset) == self.digest
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """
+    Atomically replace the checkpoint file at `path`.
+    """
+    document = {"version": CHECKPOINT_VERSION, **checkpoint._asdict()}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(document, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """
+    Read a checkpoint file. Returns None if there is no checkpoint, or if it is
+    unreadable or was written by a different checkpoint version.
+    """
+    try:
+        with open(path, "r") as file:
+            document = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(document, dict) or document.pop("version", None) != CHECKPOINT_VERSION:
+        return None
+    try:
+        return Checkpoint(**document)
+    except TypeError:
+        return None
@@ -12,14 +12,52 @@ Responsibilities:
 - Enforce safety (e.g., prevent moving off the table)
 """
 
-from toy_robot.interfaces import RobotInterface, NavigationInterface
+from toy_robot.interfaces import RobotInterface, NavigationInterface, OutputSinkInterface
+from toy_robot.cache import ParseCache
+from toy_robot.metrics import CommandMetrics
+from toy_robot.log_events import EVENT_BAD_PLACE, EVENT_UNPLACED, EVENT_UNREACHABLE, EVENT_UNSAFE_MOVE, log_event
+from toy_robot.opcodes import DIRECTIONS, OP_GOTO, OP_LEFT, OP_MOVE, OP_PLACE, OP_REPORT, OP_RIGHT
+from toy_robot.output import StdoutSink
+from toy_robot.tokenizer import Parsed, Rejection, tokenize
 import logging
+import time
 
-from typing import Optional, Tuple, Union
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from toy_robot.bytecode import Bytecode
+    from toy_robot.pathfinding import GotoPlanner
+    from toy_robot.trace import TraceRecorder
 
 # Set of all supported commands
 VALID_COMMANDS = {"PLACE", "MOVE", "LEFT", "RIGHT", "REPORT"}
 
+# Outcomes of processing a command, as returned by execute() and counted by CommandMetrics
+OUTCOME_EXECUTED = "executed"
+OUTCOME_UNPLACED = "unplaced_ignored"
+OUTCOME_UNSAFE_MOVE = "unsafe_move"
+OUTCOME_INVALID_PLACE = "invalid_place"
+OUTCOME_MALFORMED = "malformed"
+OUTCOME_UNRECOGNISED = "unrecognised"
+OUTCOME_UNREACHABLE = "unreachable"
+
+# Operand-free commands as they appear in raw input, so the common case of a bytes
+# line needs neither decoding nor parsing
+_BYTES_COMMANDS = {
+    b"MOVE": ("MOVE",),
+    b"LEFT": ("LEFT",),
+    b"RIGHT": ("RIGHT",),
+    b"REPORT": ("REPORT",),
+}
+
+# Pre-built parsed tuples for the operand-free opcodes, so replaying bytecode allocates nothing
+_BYTECODE_COMMANDS = {
+    OP_MOVE: ("MOVE",),
+    OP_LEFT: ("LEFT",),
+    OP_RIGHT: ("RIGHT",),
+    OP_REPORT: ("REPORT",),
+}
+
 class RobotController:
     """
     The RobotController orchestrates command parsing and execution. It ensures that:
@@ -28,11 +66,54 @@ class RobotController:
     - LEFT/RIGHT/REPORT are ignored until robot is placed
     """
 
-    def __init__(self, robot: RobotInterface, navigation: NavigationInterface) -> None:
+    def __init__(
+        self,
+        robot: RobotInterface,
+        navigation: NavigationInterface,
+        sink: Optional[OutputSinkInterface] = None,
+        metrics: Optional[CommandMetrics] = None,
+        parse_cache: Optional[ParseCache] = None,
+        planner: Optional["GotoPlanner"] = None,
+        trace: Optional["TraceRecorder"] = None,
+    ) -> None:
+        """
+        Parameters:
+        - robot: the robot being controlled
+        - navigation: validates positions before the robot is placed or moved
+        - sink: receives REPORT results (default: StdoutSink, which prints them)
+        - metrics: if given, every command is counted and timed into it
+        - parse_cache: if given, parse results (including rejections) are memoised in it
+        - planner: if given, GOTO X,Y commands are accepted and expanded by it into
+          LEFT, RIGHT and MOVE commands (see toy_robot.pathfinding)
+        - trace: if given, every command, with its outcome and the resulting state, is
+          recorded in it (see toy_robot.trace)
+        """
         self.robot = robot
         self.navigation = navigation
+        self.sink = sink if sink is not None else StdoutSink()
+        self.metrics = metrics
+        self.parse_cache = parse_cache
+        self.planner = planner
+        self.trace = trace
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        if parse_cache is not None:
+            self.parse_command = self._parse_command_cached
+
+        if metrics is not None:
+            # Swap in the instrumented entry points, so uninstrumented controllers
+            # pay nothing for the feature
+            self.process_command = self._process_command_instrumented
+            self.process_bytes = self._process_bytes_instrumented
+
+        if trace is not None:
+            # Every accepted command, including those of execute_bytecode() and the
+            # steps of a GOTO, goes through execute(). Rejected commands are recorded
+            # by process_command(), where the raw command can still be classified.
+            self.execute = self._execute_traced
+            if metrics is None:
+                self.process_command = self._process_command_traced
+
     def process_command(self, command: str) -> None:
         """
         Processes a sequence of string commands in order.
@@ -50,10 +131,81 @@ class RobotController:
         a PLACE tuple or a one-word command like MOVE, LEFT, RIGHT, or REPORT.
         """
 
+        self.execute(self.parse_command(command))
+
+    def process_bytes(self, command: bytes) -> None:
+        """
+        Processes a single command given as bytes, e.g. a line from toy_robot.reader.
+
+        Surrounding whitespace, including the b"\\r" of CRLF line endings, is stripped.
+        The operand-free commands are then looked up directly; anything else (PLACE or
+        invalid input) is decoded and handled exactly like process_command().
+        """
+        command = command.strip()
+        parsed = _BYTES_COMMANDS.get(command)
+        if parsed is not None:
+            self.execute(parsed)
+        else:
+            self.process_command(command.decode("utf-8", errors="replace"))
+
+    def _process_command_instrumented(self, command: str) -> None:
+        """
+        process_command() with parse and execute timed and the outcome recorded.
+        """
+        clock = time.perf_counter_ns
+        start = clock()
+        parsed = self.parse_command(command)
+        parsed_at = clock()
+        outcome = self.execute(parsed)
+        finished = clock()
+
+        if parsed:
+            cmd = parsed[0]
+        else:
+            cmd, outcome = self._classify_rejection(command)
+            if self.trace is not None:
+                self.trace.record(cmd, outcome, *self.robot.state())
+        self.metrics.record(cmd, outcome, parsed_at - start, finished - parsed_at)
+
+    def _process_bytes_instrumented(self, command: bytes) -> None:
+        self._process_command_instrumented(command.strip().decode("utf-8", errors="replace"))
+
+    def _process_command_traced(self, command: str) -> None:
+        """
+        process_command() with rejected commands recorded in the trace too.
+        """
         parsed = self.parse_command(command)
+        if parsed:
+            self.execute(parsed)
+        else:
+            self.trace.record(*self._classify_rejection(command), *self.robot.state())
+
+    def _classify_rejection(self, command: str) -> Tuple[str, str]:
+        """
+        Tells a malformed known command from an unrecognised one. Only rejected
+        commands need this extra work.
+
+        Returns:
+        - tuple: (command name or "UNKNOWN", OUTCOME_MALFORMED or OUTCOME_UNRECOGNISED)
+        """
+        parts = command.split()
+        if parts and (parts[0] in VALID_COMMANDS or parts[0] == "GOTO" and self.planner is not None):
+            return parts[0], OUTCOME_MALFORMED
+        return "UNKNOWN", OUTCOME_UNRECOGNISED if parts else OUTCOME_MALFORMED
+
+    def execute(self, parsed: Optional[Union[Tuple[str], Tuple[str, int, int, str]]]) -> str:
+        """
+        Executes a command that has already been parsed by parse_command().
+
+        Parameters:
+        - parsed: a parsed command tuple, or None for a rejected command
+
+        Returns:
+        - str: one of the OUTCOME_* constants
+        """
         if not parsed:
             # Skip invalid commands
-            return
+            return OUTCOME_MALFORMED
 
         cmd = parsed[0]
 
@@ -67,14 +219,14 @@ class RobotController:
             _ , x, y, direction = parsed
 
             if not self.navigation.is_valid_position(x, y):
-                self.logger.warning(f"PLACE ignored: invalid position ({x},{y},{direction})")
-                return
+                log_event(self.logger, logging.WARNING, "PLACE ignored: invalid position (%s,%s,%s)", x, y, direction, extra=EVENT_BAD_PLACE)
+                return OUTCOME_INVALID_PLACE
             
             self.robot.place(x, y, direction)
 
         elif not self.robot.is_placed:
-            self.logger.warning(f"Ignoring '{cmd}' as no PLACE command has been issued yet.")
-            return
+            log_event(self.logger, logging.WARNING, "Ignoring '%s' as no PLACE command has been issued yet.", cmd, extra=EVENT_UNPLACED)
+            return OUTCOME_UNPLACED
 
         elif cmd == "MOVE":
             """
@@ -89,7 +241,8 @@ class RobotController:
             if self.navigation.is_valid_position(new_x, new_y):
                 self.robot.update_position(new_x, new_y)
             else:
-                self.logger.warning(f"Unsafe MOVE ignored: ({new_x},{new_y}{current_direction})")
+                log_event(self.logger, logging.WARNING, "Unsafe MOVE ignored: (%s,%s%s)", new_x, new_y, current_direction, extra=EVENT_UNSAFE_MOVE)
+                return OUTCOME_UNSAFE_MOVE
 
         elif cmd == "LEFT":
             self.robot.turn_left()
@@ -98,7 +251,64 @@ class RobotController:
             self.robot.turn_right()
 
         elif cmd == "REPORT":
-            self.robot.report()
+            self.sink.write(*self.robot.state())
+
+        elif cmd == "GOTO":
+            return self._goto(parsed[1], parsed[2])
+
+        return OUTCOME_EXECUTED
+
+    def _execute_traced(self, parsed: Optional[Union[Tuple[str], Tuple[str, int, int, str]]]) -> str:
+        """
+        execute() with the command, its outcome and the resulting state recorded in the
+        trace. Rejected commands are left to process_command(), which knows what they were.
+        """
+        outcome = type(self).execute(self, parsed)
+        if parsed:
+            self.trace.record(parsed[0], outcome, *self.robot.state())
+        return outcome
+
+    def _goto(self, x: int, y: int) -> str:
+        """
+        Executes the planner's shortest LEFT/RIGHT/MOVE sequence to (x, y). If a step is
+        rejected, e.g. because the Navigation changed since the plan's tables were
+        built, the rest of the sequence is abandoned and that step's outcome returned.
+        """
+        commands = self.planner.plan(*self.robot.state(), x, y)
+        if commands is None:
+            log_event(self.logger, logging.WARNING, "GOTO ignored: (%s,%s) is unreachable", x, y, extra=EVENT_UNREACHABLE)
+            return OUTCOME_UNREACHABLE
+        execute = self.execute
+        for command in commands:
+            outcome = execute(command)
+            if outcome != OUTCOME_EXECUTED:
+                return outcome
+        return OUTCOME_EXECUTED
+
+    def execute_bytecode(self, bytecode: "Bytecode") -> None:
+        """
+        Executes a compiled program without parsing any strings.
+
+        Parameters:
+        - bytecode: a program produced by toy_robot.bytecode.compile_lines()
+
+        PLACE positions are still checked against the navigation module at execution
+        time, so the same bytecode can be replayed on grids of different sizes. GOTO
+        is planned when it is executed, from wherever the robot is by then.
+        """
+        operands = bytecode.operands
+        next_operand = 0
+        for op in bytecode.ops:
+            if op == OP_PLACE:
+                x, y, direction = operands[next_operand:next_operand + 3]
+                next_operand += 3
+                self.execute(("PLACE", x, y, DIRECTIONS[direction]))
+            elif op == OP_GOTO:
+                x, y = operands[next_operand:next_operand + 2]
+                next_operand += 3
+                self.execute(("GOTO", x, y))
+            else:
+                self.execute(_BYTECODE_COMMANDS[op])
 
     def parse_command(self, command: str) -> Optional[Union[Tuple[str], Tuple[str, int, int, str]]]:
         """
@@ -111,38 +321,33 @@ class RobotController:
         - tuple representing parsed command:
             - ("PLACE", x, y, direction) if valid PLACE
             - ("MOVE",) or ("LEFT",) or ("RIGHT",) for other commands
+            - ("GOTO", x, y) if valid GOTO and the controller has a planner
             - None if the command is invalid or malformed
         """
-        parts = command.strip().split()
+        parsed, rejection = self._tokenize(command)
+        if rejection is not None:
+            log_event(self.logger, *rejection[:-1], extra=rejection[-1])
+        return parsed
 
-        if not parts: # Empty command
-            return None
-
-        cmd = parts[0]
-
-        if cmd not in VALID_COMMANDS:
-            self.logger.warning(f"Unrecognised command: '{command}'")
-            return None
+    def _parse_command_cached(self, command: str) -> Optional[Union[Tuple[str], Tuple[str, int, int, str]]]:
+        """
+        parse_command() memoised in the parse cache. Rejections are logged according
+        to the cache's log_repeats setting.
+        """
+        cache = self.parse_cache
+        entry = cache.get(command)
+        if entry is None:
+            entry = self._tokenize(command)
+            cache.put(command, entry)
+        elif not cache.log_repeats:
+            return entry[0]
+        rejection = entry[1]
+        if rejection is not None:
+            log_event(self.logger, *rejection[:-1], extra=rejection[-1])
+        return entry[0]
 
-        if cmd == "PLACE":
-            # PLACE must have exactly one argument: "X,Y,DIRECTION"
-            if len(parts) != 2:
-                return None
-            try:
-                x_str, y_str, direction = parts[1].split(",")
-                x, y = int(x_str), int(y_str) # Throws ValueError if not integers
-                direction = direction.strip()
-                
-                if direction not in RobotInterface.GET_CARDINAL_DIRECTIONS:
-                    raise ValueError("Invalid direction.")
-                    
-                return ("PLACE", x, y, direction)
-            except (ValueError, IndexError) as e:
-                self.logger.error(f"Invalid PLACE command format: {command} - {e}")
-                return None # PLACE format is invalid
-
-        # All other commands must be exactly one word
-        if len(parts) == 1:
-            return (cmd,)
-
-        return None # Invalid command format
+    def _tokenize(self, command: str) -> Tuple[Parsed, Rejection]:
+        """
+        Parses a command without logging (see toy_robot.tokenizer.tokenize()).
+        """
+        return tokenize(command, self.planner is not None)
@@ -0,0 +1,185 @@
+"""
+fleet.py
+
+This file defines the FleetEngine class, which simulates many independent robots in
+lockstep. Instead of one Robot object per robot, the state of the whole fleet is kept
+in NumPy arrays and every tick applies one opcode to every robot at once.
+
+The per-robot behaviour matches RobotController exactly:
+- Nothing but a valid PLACE is executed until the robot has been placed
+- PLACE commands with out-of-bounds coordinates are ignored
+- MOVE commands that would leave the table are ignored
+- REPORT produces the same "Output: X,Y,DIRECTION" line as Robot.report()
+
+Responsibilities:
+- Store x, y, direction and placed-flag for every robot in the fleet
+- Apply one opcode per robot per tick using array masks for bounds checks
+- Encode command strings into opcode arrays
+- Format REPORT output for the robots that reported
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import (
+    DIRECTION_DX,
+    DIRECTION_DY,
+    DIRECTIONS,
+    OP_LEFT,
+    OP_MOVE,
+    OP_NOP,
+    OP_PLACE,
+    OP_REPORT,
+    OP_RIGHT,
+    encode,
+)
+from toy_robot.robot import Robot
+
+_DX = np.array(DIRECTION_DX, dtype=np.int64)
+_DY = np.array(DIRECTION_DY, dtype=np.int64)
+
+_INT64 = np.iinfo(np.int64)
+_NOP = (OP_NOP, 0, 0, 0)
+
+
+def _encode_row(parsed) -> Tuple[int, int, int, int]:
+    # A PLACE beyond int64 cannot be on the grid, so it is ignored like any other
+    # out-of-bounds PLACE instead of overflowing the operand arrays
+    row = encode(parsed)
+    if row[0] == OP_PLACE and not (_INT64.min <= row[1] <= _INT64.max and _INT64.min <= row[2] <= _INT64.max):
+        return _NOP
+    return row
+
+
+class FleetEngine:
+    """
+    The FleetEngine holds the state of `size` robots sharing the same grid dimensions.
+    Robot i is addressed by its index into the state arrays.
+
+    Unlike RobotController, ignored commands are not logged per robot, as a single
+    tick can produce tens of thousands of warnings.
+    """
+
+    def __init__(self, size: int, grid_size: int = 5) -> None:
+        """
+        Initialise a fleet of unplaced robots.
+
+        Parameters:
+        - size (int): Number of robots in the fleet
+        - grid_size (int): The dimension of the square grid (default: 5)
+        """
+        self.size: int = size
+        self.grid_size: int = grid_size
+        self.x = np.zeros(size, dtype=np.int64)
+        self.y = np.zeros(size, dtype=np.int64)
+        self.direction = np.zeros(size, dtype=np.int8)
+        self.placed = np.zeros(size, dtype=bool)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Parsing is delegated to a controller so the acceptance rules stay identical
+        self._parser = RobotController(robot=Robot(), navigation=Navigation(grid_size))
+
+    def _in_bounds(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return (x >= 0) & (x < self.grid_size) & (y >= 0) & (y < self.grid_size)
+
+    def step(
+        self,
+        opcodes: np.ndarray,
+        place_x: Optional[np.ndarray] = None,
+        place_y: Optional[np.ndarray] = None,
+        place_direction: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Apply one opcode to every robot in the fleet.
+
+        Parameters:
+        - opcodes: array of `size` opcodes, one per robot
+        - place_x, place_y, place_direction: PLACE operands, one per robot. They are
+          only read where the opcode is OP_PLACE and may be omitted if there are none.
+
+        Returns:
+        - np.ndarray: indices of the robots that executed a REPORT, in ascending order
+        """
+        opcodes = np.asarray(opcodes)
+        if opcodes.shape != (self.size,):
+            raise ValueError(f"Expected {self.size} opcodes, got shape {opcodes.shape}")
+
+        # Masks are computed before any state changes, as each robot runs exactly one opcode
+        placing = opcodes == OP_PLACE
+        active = self.placed & ~placing
+        moving = active & (opcodes == OP_MOVE)
+        turning_left = active & (opcodes == OP_LEFT)
+        turning_right = active & (opcodes == OP_RIGHT)
+        reporting = active & (opcodes == OP_REPORT)
+
+        if placing.any():
+            px = np.asarray(place_x)[placing]
+            py = np.asarray(place_y)[placing]
+            valid = self._in_bounds(px, py)
+            targets = np.flatnonzero(placing)[valid]
+            self.x[targets] = px[valid]
+            self.y[targets] = py[valid]
+            self.direction[targets] = np.asarray(place_direction)[placing][valid]
+            self.placed[targets] = True
+
+        if moving.any():
+            movers = np.flatnonzero(moving)
+            headings = self.direction[movers]
+            new_x = self.x[movers] + _DX[headings]
+            new_y = self.y[movers] + _DY[headings]
+            safe = self._in_bounds(new_x, new_y)
+            self.x[movers[safe]] = new_x[safe]
+            self.y[movers[safe]] = new_y[safe]
+
+        self.direction[turning_left] = (self.direction[turning_left] - 1) % 4
+        self.direction[turning_right] = (self.direction[turning_right] + 1) % 4
+
+        return np.flatnonzero(reporting)
+
+    def encode_commands(self, commands: Sequence[str]) -> np.ndarray:
+        """
+        Parse one command string per robot into opcode and operand arrays.
+
+        Parameters:
+        - commands: sequence of `size` raw command strings
+
+        Returns:
+        - np.ndarray: a (4, size) array of rows opcode, x, y and direction index,
+          which can be unpacked straight into step()
+        """
+        return np.array(
+            [_encode_row(self._parser.parse_command(command)) for command in commands],
+            dtype=np.int64,
+        ).reshape(len(commands), 4).T
+
+    def step_commands(self, commands: Sequence[str]) -> List[str]:
+        """
+        Parse and apply one command string per robot.
+
+        Parameters:
+        - commands: sequence of `size` raw command strings
+
+        Returns:
+        - list of REPORT output lines, ordered by robot index
+        """
+        reporters = self.step(*self.encode_commands(commands))
+        return self.report_lines(reporters)
+
+    def report_lines(self, indices: Sequence[int]) -> List[str]:
+        """
+        Format the REPORT output for the given robots.
+
+        Parameters:
+        - indices: robot indices, e.g. the return value of step()
+
+        Returns:
+        - list of strings in the same format printed by Robot.report()
+        """
+        return [
+            f"Output: {self.x[i]},{self.y[i]},{DIRECTIONS[self.direction[i]]}"
+            for i in indices
+        ]
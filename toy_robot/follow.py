@@ -0,0 +1,116 @@
+"""
+follow.py
+
+This file defines the FileFollower class, which reads a command file that is still
+being appended to, in the manner of `tail -F`. Each poll returns only the complete
+lines appended since the previous poll; a trailing line without its b"\\n" is held
+back until the rest of it arrives.
+
+The follower also notices when the file is truncated (it is read again from the
+start) or rotated, i.e. renamed away and replaced by a new file at the same path (the
+rest of the old file is read first, then the new file from the start).
+
+Responsibilities:
+- Remember the read offset and any partial trailing line between polls
+- Return newly appended complete lines as bytes
+- Detect truncation and rotation of the followed file
+"""
+
+import logging
+import os
+from typing import BinaryIO, Iterator, Optional
+
+from toy_robot.reader import BLOCK_SIZE
+
+
+class FileFollower:
+    """
+    The FileFollower incrementally reads complete lines from a growing file.
+    Use it as a context manager, or call close() when done.
+    """
+
+    def __init__(self, filename: str, from_end: bool = False) -> None:
+        """
+        Parameters:
+        - filename: the file to follow; it does not need to exist yet
+        - from_end: if True, skip the content already in the file and only return
+          lines appended from now on
+        """
+        self.filename = filename
+        self.offset: int = 0
+        self.pending: bytes = b""
+        self._file: Optional[BinaryIO] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if self._open() and from_end:
+            self.offset = os.fstat(self._file.fileno()).st_size
+
+    def __enter__(self) -> "FileFollower":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def poll(self) -> Iterator[bytes]:
+        """
+        Yield the complete lines appended since the last poll, without their b"\\n".
+        """
+        if self._file is None:
+            if not self._open():
+                return
+        elif self._rotated():
+            # Finish the old file before switching to its replacement
+            yield from self._read_lines()
+            if self.pending:
+                self.logger.warning("Discarding incomplete last line of rotated file %s.", self.filename)
+            self.close()
+            self.offset = 0
+            self.pending = b""
+            if not self._open():
+                # The replacement went away again; open it once it is recreated
+                return
+            self.logger.info("Following new file at %s.", self.filename)
+
+        if os.fstat(self._file.fileno()).st_size < self.offset:
+            self.logger.warning("%s was truncated; reading it again from the start.", self.filename)
+            self.offset = 0
+            self.pending = b""
+
+        yield from self._read_lines()
+
+    def _open(self) -> bool:
+        try:
+            self._file = open(self.filename, "rb")
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _rotated(self) -> bool:
+        try:
+            current = os.stat(self.filename)
+        except FileNotFoundError:
+            # Renamed away and not yet replaced: keep reading the old file
+            return False
+        opened = os.fstat(self._file.fileno())
+        return (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev)
+
+    def _read_lines(self) -> Iterator[bytes]:
+        file = self._file
+        file.seek(self.offset)
+        while True:
+            block = file.read(BLOCK_SIZE)
+            if not block:
+                return
+            self.offset += len(block)
+            if self.pending:
+                block = self.pending + block
+            end = block.rfind(b"\n")
+            if end == -1:
+                self.pending = block
+                continue
+            self.pending = block[end + 1:]
+            yield from block[:end].split(b"\n")
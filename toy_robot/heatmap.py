@@ -0,0 +1,192 @@
+"""
+heatmap.py
+
+This file defines the HeatmapAnalytics class, which replays command streams and
+accumulates per-cell statistics for operations dashboards:
+
+- visits[y, x]: how many times the robot arrived at the cell, by PLACE or MOVE
+- dwell[y, x, d]: how many commands the robot spent at the cell facing direction d
+  (directions in NORTH, EAST, SOUTH, WEST order), i.e. dwell time in commands
+- rejected_moves[y, x, d]: how many MOVEs were rejected at the cell's edge facing d
+
+The replay runs on packed states and the Navigation-validated transition tables (see
+transitions.py). Instead of updating a counter per event, the states of each kind of
+event are appended to small fixed-size buffers, and each full buffer is folded into
+preallocated int64 NumPy arrays with one numpy.bincount() call. Memory use therefore
+depends only on the grid size and the batch size, never on the length of the stream.
+
+Responsibilities:
+- Replay command streams and record visit, dwell and rejected-MOVE events
+- Accumulate events in preallocated NumPy arrays in batches
+- Export the results as .npy files
+"""
+
+import os
+from array import array
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from toy_robot.cache import ParseCache
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import NavigationInterface
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import BYTES_OPCODES, OP_MOVE, OP_PLACE, encode
+from toy_robot.reader import iter_lines
+from toy_robot.robot import Robot
+from toy_robot.transitions import STATE_UNPLACED, TransitionTable, square_grid_size
+
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+class HeatmapAnalytics:
+    """
+    Accumulates visit, dwell and rejected-MOVE counts over any number of command
+    streams. The robot's state carries over from one stream to the next.
+    """
+
+    def __init__(
+        self,
+        navigation: Optional[NavigationInterface] = None,
+        grid_size: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Parameters:
+        - navigation: validates positions (default: a 5×5 Navigation)
+        - grid_size: dimension of the square grid (default: from navigation.bounds())
+        - batch_size: number of events buffered before they are folded into the arrays
+
+        Raises:
+        - ValueError if the navigation does not cover a square grid of that size
+          (see transitions.square_grid_size)
+        """
+        navigation = navigation if navigation is not None else Navigation()
+        self.grid_size: int = square_grid_size(navigation, grid_size)
+        self.batch_size: int = batch_size
+        self.transitions = TransitionTable(self.grid_size, navigation)
+        self.state: int = STATE_UNPLACED
+        self.commands: int = 0
+
+        # Per-state counters; state 0 (unplaced) is counted but never exported
+        num_states = self.transitions.num_states
+        self._visits = np.zeros(num_states, dtype=np.int64)
+        self._dwell = np.zeros(num_states, dtype=np.int64)
+        self._rejected = np.zeros(num_states, dtype=np.int64)
+        self._visit_buffer = array("i")
+        self._dwell_buffer = array("i")
+        self._rejected_buffer = array("i")
+        self._parser = RobotController(robot=Robot(), navigation=navigation, parse_cache=ParseCache())
+
+    def feed(self, lines: Iterable[bytes]) -> None:
+        """
+        Replay a stream of command lines, given as bytes without their newlines.
+        """
+        tables = self.transitions.tables
+        move = tables[OP_MOVE]
+        place = self.transitions.place
+        parse = self._parser.parse_command
+        batch_size = self.batch_size
+        visit = self._visit_buffer.append
+        dwell_buffer = self._dwell_buffer
+        dwell = dwell_buffer.append
+        reject = self._rejected_buffer.append
+        state = self.state
+        commands = 0
+
+        for line in lines:
+            command = line.strip()
+            if not command:
+                continue
+            commands += 1
+            op = BYTES_OPCODES.get(command)
+            if op is None:
+                op, x, y, direction = encode(parse(command.decode("utf-8", errors="replace")))
+            if op == OP_MOVE:
+                following = move[state]
+                if following != state:
+                    state = following
+                    visit(state)
+                elif state:
+                    reject(state)
+            elif op == OP_PLACE:
+                target = place(x, y, direction)
+                if target is not None:
+                    state = target
+                    visit(state)
+            else:
+                state = tables[op][state]
+            if state:
+                dwell(state)
+                if len(dwell_buffer) >= batch_size:
+                    self._flush()
+
+        self.state = state
+        self.commands += commands
+        self._flush()
+
+    def run_file(self, filename: str) -> None:
+        """
+        Replay a command file (memory-mapped, see toy_robot.reader).
+        """
+        with open(filename, "rb") as file:
+            self.feed(iter_lines(file))
+
+    def _flush(self) -> None:
+        # Fold the buffered events into the counters and empty the buffers in place
+        num_states = self.transitions.num_states
+        for buffer, counts in (
+            (self._visit_buffer, self._visits),
+            (self._dwell_buffer, self._dwell),
+            (self._rejected_buffer, self._rejected),
+        ):
+            if buffer:
+                counts += np.bincount(np.frombuffer(buffer, dtype=np.int32), minlength=num_states)
+                del buffer[:]
+
+    def _per_cell(self, counts: np.ndarray) -> np.ndarray:
+        # Placed state s is 1 + ((y * grid_size + x) * 4 + direction)
+        return counts[1:].reshape(self.grid_size, self.grid_size, 4).copy()
+
+    @property
+    def visits(self) -> np.ndarray:
+        """
+        Arrivals per cell, indexed [y, x].
+        """
+        return self._per_cell(self._visits).sum(axis=2)
+
+    @property
+    def dwell(self) -> np.ndarray:
+        """
+        Commands spent per cell and direction, indexed [y, x, direction].
+        """
+        return self._per_cell(self._dwell)
+
+    @property
+    def rejected_moves(self) -> np.ndarray:
+        """
+        Rejected MOVEs per cell edge, indexed [y, x, direction].
+        """
+        return self._per_cell(self._rejected)
+
+    def coverage(self) -> float:
+        """
+        Return the fraction of walkable cells the robot has visited.
+        """
+        walkable = np.array(self.transitions.walkable, dtype=bool).reshape(self.grid_size, self.grid_size)
+        total = int(walkable.sum())
+        return float((self.visits[walkable] > 0).sum()) / total if total else 0.0
+
+    def save(self, directory: str) -> Dict[str, str]:
+        """
+        Write visits.npy, dwell.npy and rejected_moves.npy to a directory.
+
+        Returns:
+        - dict: the path of each file, keyed by name
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name, values in (("visits", self.visits), ("dwell", self.dwell), ("rejected_moves", self.rejected_moves)):
+            paths[name] = os.path.join(directory, f"{name}.npy")
+            np.save(paths[name], values)
+        return paths
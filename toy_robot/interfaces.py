@@ -12,7 +12,7 @@ Responsibilities:
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 class RobotInterface(ABC):
     """
@@ -41,9 +41,59 @@ class RobotInterface(ABC):
     @abstractmethod
     def report(self) -> Tuple[int, int, str]: ...
 
+    def state(self) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+        """
+        Return (x, y, direction), all None while unplaced. The default reads the
+        current_x, current_y and current_direction attributes.
+        """
+        return self.current_x, self.current_y, self.current_direction
+
 class NavigationInterface(ABC):
     """
     The NavigationInterface defines the essential methods that any Navigation class must implement.
     """
     @abstractmethod
     def is_valid_position(self, x: int, y: int) -> bool: ...
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        """
+        Return (width, height) of the grid positions are checked against, or None if
+        the navigation does not say. The default reads a square `grid_size` attribute.
+        """
+        grid_size = getattr(self, "grid_size", None)
+        return None if grid_size is None else (grid_size, grid_size)
+
+class OutputSinkInterface(ABC):
+    """
+    The OutputSinkInterface defines where the controller writes REPORT results.
+    """
+    @abstractmethod
+    def write(self, x: int, y: int, direction: str) -> None: ...
+    @abstractmethod
+    def flush(self) -> None: ...
+
+class Message(NamedTuple):
+    """
+    A command delivered by a message broker for one robot. `attempts` counts the
+    deliveries so far, including this one.
+    """
+    id: int
+    robot: str
+    command: str
+    attempts: int
+    published_at: float
+
+class MessageBrokerInterface(ABC):
+    """
+    The MessageBrokerInterface defines the at-least-once queue a MessageConsumer reads
+    commands from. Received messages are leased: they are redelivered unless acked, and
+    a robot's messages are delivered in the order they were published.
+    """
+    @abstractmethod
+    def publish(self, messages: Iterable[Tuple[str, str]]) -> None: ...
+    @abstractmethod
+    def receive(self, max_messages: int) -> List[Message]: ...
+    @abstractmethod
+    def ack(self, ids: Sequence[int]) -> None: ...
+    @abstractmethod
+    def nack(self, ids: Sequence[int]) -> None: ...
@@ -0,0 +1,66 @@
+"""
+log_events.py
+
+This file defines the event tags attached to the warnings logged on the command hot
+path. Each tag is passed as the `extra` argument of a logging call and sets an `event`
+attribute on the log record, so handlers can classify records (e.g. to aggregate them
+into counts) without parsing the message text.
+
+Tagged warnings are logged through log_event(), which asks the installed event limiter
+(see config/logging_config.py) whether to log the event or only count it. The decision
+is made before a log record is created, so an event that is only counted costs the
+caller a counter update instead of a record.
+"""
+
+import logging
+import os
+
+# Decides which tagged events are logged, see install_limiter()
+_limiter = None
+
+EVENT_UNSAFE_MOVE = {"event": "unsafe_move"}
+EVENT_UNPLACED = {"event": "unplaced_command"}
+EVENT_BAD_PLACE = {"event": "bad_place"}
+EVENT_UNRECOGNISED = {"event": "unrecognised_command"}
+EVENT_OUT_OF_BOUNDS = {"event": "out_of_bounds"}
+EVENT_BLOCKED = {"event": "blocked_cell"}
+EVENT_OCCUPIED = {"event": "occupied_cell"}
+EVENT_BAD_GOTO = {"event": "bad_goto"}
+EVENT_UNREACHABLE = {"event": "unreachable_target"}
+
+
+def install_limiter(limiter) -> None:
+    """
+    Route tagged events through `limiter`, whose allow(event) returns whether an event
+    is logged (True) or only counted (False).
+    """
+    global _limiter
+    _limiter = limiter
+
+
+def remove_limiter(limiter) -> None:
+    """
+    Log every tagged event again, unless a different limiter was installed since.
+    """
+    global _limiter
+    if _limiter is limiter:
+        _limiter = None
+
+
+def log_event(logger: logging.Logger, level: int, msg: str, *args, extra: dict) -> None:
+    """
+    logger.log(level, msg, *args, extra=extra) for a tagged event, unless the installed
+    limiter only counts it.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    limiter = _limiter
+    if limiter is not None and not limiter.allow(extra["event"]):
+        return
+    logger.log(level, msg, *args, extra=extra, stacklevel=2)
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked worker, e.g. a multiprocessing.Pool process, may be terminated before it
+    # could log its counts, so it logs every event itself
+    os.register_at_fork(after_in_child=lambda: install_limiter(None))
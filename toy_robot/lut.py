@@ -0,0 +1,144 @@
+"""
+lut.py
+
+This file defines a lookup-table execution core. The robot's whole state is packed into
+a single small integer (see transitions.py), and MOVE, LEFT and RIGHT are precomputed
+as state-to-state tables for the configured grid, with MOVE already validated against
+the Navigation. Executing one of these commands is then a single table index instead
+of string comparisons, a direction list lookup, a delta lookup and a call into
+Navigation.
+
+TableRobot implements RobotInterface and TableController extends RobotController, so
+they are drop-in replacements: rejected commands take the regular RobotController path
+and are logged exactly as before.
+
+Responsibilities:
+- Store the robot's state as a packed integer
+- Precompute validated transition tables from the Navigation
+- Execute MOVE, LEFT and RIGHT with one table lookup each
+"""
+
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from toy_robot.cache import ParseCache
+from toy_robot.controller import OUTCOME_EXECUTED, RobotController
+from toy_robot.interfaces import NavigationInterface, OutputSinkInterface, RobotInterface
+from toy_robot.metrics import CommandMetrics
+from toy_robot.opcodes import DIRECTION_DX, DIRECTION_DY, DIRECTION_INDEX, DIRECTIONS, OP_LEFT, OP_MOVE, OP_RIGHT
+from toy_robot.transitions import STATE_UNPLACED, TransitionTable, decode_state, encode_state, square_grid_size
+
+if TYPE_CHECKING:
+    from toy_robot.pathfinding import GotoPlanner
+    from toy_robot.trace import TraceRecorder
+
+
+class TableRobot(RobotInterface):
+    """
+    A Robot whose position and direction are stored as one packed state integer.
+    Positions must lie on the grid, which the controller guarantees by validating
+    them before calling place() or update_position().
+    """
+
+    def __init__(self, grid_size: int = 5) -> None:
+        """
+        Initialise an unplaced robot for a square grid of the given size.
+        """
+        self.grid_size: int = grid_size
+        self.packed: int = STATE_UNPLACED
+
+    @property
+    def is_placed(self) -> bool:
+        return self.packed != STATE_UNPLACED
+
+    @property
+    def current_x(self) -> Optional[int]:
+        return self.state()[0]
+
+    @property
+    def current_y(self) -> Optional[int]:
+        return self.state()[1]
+
+    @property
+    def current_direction(self) -> Optional[str]:
+        return self.state()[2]
+
+    def place(self, x: int, y: int, direction: str) -> None:
+        self.packed = encode_state(x, y, DIRECTION_INDEX[direction], self.grid_size)
+
+    def propose_move(self) -> Tuple[int, int, str]:
+        x, y, direction = decode_state(self.packed, self.grid_size)
+        return x + DIRECTION_DX[direction], y + DIRECTION_DY[direction], DIRECTIONS[direction]
+
+    def update_position(self, new_x: int, new_y: int) -> None:
+        direction = (self.packed - 1) & 3
+        self.packed = encode_state(new_x, new_y, direction, self.grid_size)
+
+    def turn_left(self) -> None:
+        # The direction index occupies the low two bits of (packed - 1)
+        direction = (self.packed - 1) & 3
+        self.packed += ((direction - 1) & 3) - direction
+
+    def turn_right(self) -> None:
+        direction = (self.packed - 1) & 3
+        self.packed += ((direction + 1) & 3) - direction
+
+    def state(self) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+        if self.packed == STATE_UNPLACED:
+            return None, None, None
+        x, y, direction = decode_state(self.packed, self.grid_size)
+        return x, y, DIRECTIONS[direction]
+
+    def report(self) -> None:
+        x, y, direction = self.state()
+        print(f"Output: {x},{y},{direction}")
+
+
+class TableController(RobotController):
+    """
+    A RobotController that executes MOVE, LEFT and RIGHT on a TableRobot with a single
+    table lookup. Tables are built once, from the robot's grid size and the
+    Navigation's is_valid_position(), so any Navigation implementation is supported.
+    """
+
+    def __init__(
+        self,
+        robot: TableRobot,
+        navigation: NavigationInterface,
+        sink: Optional[OutputSinkInterface] = None,
+        metrics: Optional[CommandMetrics] = None,
+        parse_cache: Optional[ParseCache] = None,
+        planner: Optional["GotoPlanner"] = None,
+        trace: Optional["TraceRecorder"] = None,
+    ) -> None:
+        """
+        Parameters are as for RobotController.
+
+        Raises:
+        - ValueError if the navigation's bounds() are not the robot's square grid, or
+          unknown, since PLACE is validated by the navigation but the tables cover the
+          robot's grid (see transitions.square_grid_size)
+        """
+        if square_grid_size(navigation) != robot.grid_size:
+            raise ValueError(f"{type(navigation).__name__} does not cover the robot's "
+                             f"{robot.grid_size}x{robot.grid_size} grid.")
+        super().__init__(robot, navigation, sink, metrics, parse_cache, planner, trace)
+        self.transitions = TransitionTable(robot.grid_size, navigation)
+        tables = self.transitions.tables
+        self._command_tables = {
+            "MOVE": tables[OP_MOVE],
+            "LEFT": tables[OP_LEFT],
+            "RIGHT": tables[OP_RIGHT],
+        }
+
+    def execute(self, parsed: Optional[Union[Tuple[str], Tuple[str, int, int, str]]]) -> str:
+        if parsed:
+            table = self._command_tables.get(parsed[0])
+            if table is not None:
+                state = self.robot.packed
+                new_state = table[state]
+                # An unchanged state means the robot is unplaced or the MOVE is unsafe
+                if new_state != state:
+                    self.robot.packed = new_state
+                    return OUTCOME_EXECUTED
+        # PLACE, REPORT and every rejection take the regular path, including its logging
+        return super().execute(parsed)
@@ -0,0 +1,319 @@
+"""
+messaging.py
+
+This file feeds robots from a message queue. A MessageConsumer pulls commands from a
+broker in micro-batches, dispatches each one to its robot's own RobotController, and
+acknowledges the batch only once every command in it has been processed and the
+REPORT output flushed. Failed deliveries are handed back to the broker for retry.
+
+Delivery is at least once: a consumer that dies before acknowledging a batch gets it
+redelivered once the lease on it expires, so a robot may see a command twice.
+
+SQLiteBroker is a local stand-in for a real broker, backed by a SQLite file (or an
+in-memory database), so the consumer can be run and benchmarked without outside
+services. It provides the same guarantees a consumer relies on:
+
+- Received messages are leased for `visibility_timeout` seconds and redelivered if
+  they are not acknowledged in time
+- A robot's messages are delivered in publish order: a message is held back while an
+  earlier message for the same robot is leased or waiting to be retried
+- Messages that fail `max_attempts` times are moved to a dead-letter table
+
+Responsibilities:
+- Publish, lease, acknowledge and retry commands in a SQLite-backed queue
+- Pull commands in micro-batches and route them to per-robot controllers
+- Acknowledge processed commands and hand failed ones back for retry
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import Message, MessageBrokerInterface
+from toy_robot.navigation import Navigation
+from toy_robot.robot import Robot
+
+DEFAULT_BATCH_SIZE = 256
+
+# Ids bound per "WHERE id IN (...)" statement, below SQLite's older 999-variable limit
+_IDS_PER_STATEMENT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    robot TEXT NOT NULL,
+    command TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    published_at REAL NOT NULL,
+    available_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_by_robot ON messages (robot, available_at);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    robot TEXT NOT NULL,
+    command TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    published_at REAL NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+# The oldest available messages whose robot has no earlier message leased or waiting
+_RECEIVE = """
+SELECT id, robot, command, attempts + 1, published_at FROM messages AS m
+WHERE available_at <= :now AND NOT EXISTS (
+    SELECT 1 FROM messages AS earlier
+    WHERE earlier.robot = m.robot AND earlier.available_at > :now AND earlier.id < m.id
+)
+ORDER BY id LIMIT :limit
+"""
+
+
+class SQLiteBroker(MessageBrokerInterface):
+    """
+    A local, SQLite-backed stand-in for a message broker. Several consumers, in
+    threads or processes, can share one database file, each with its own broker.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        visibility_timeout: float = 30.0,
+        max_attempts: int = 5,
+        retry_delay: float = 0.0,
+    ) -> None:
+        """
+        Parameters:
+        - path: database file, or ":memory:" for a private in-memory queue
+        - visibility_timeout: seconds a received message stays leased before it is
+          redelivered
+        - max_attempts: deliveries after which a failed message is dead-lettered
+        - retry_delay: seconds a nacked message waits before it is redelivered
+        """
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Transactions are managed explicitly, see _transaction()
+        self.connection = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SQLiteBroker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self.connection)
+
+    def _for_ids(self, statement: str, ids: Sequence[int], *leading) -> None:
+        # One statement per chunk of ids instead of one per id
+        for start in range(0, len(ids), _IDS_PER_STATEMENT):
+            chunk = ids[start:start + _IDS_PER_STATEMENT]
+            self.connection.execute(statement.format(",".join("?" * len(chunk))), (*leading, *chunk))
+
+    def publish(self, messages: Iterable[Tuple[str, str]]) -> None:
+        """
+        Append (robot, command) messages to the queue in one transaction.
+        """
+        now = time.time()
+        with self._transaction():
+            self.connection.executemany(
+                "INSERT INTO messages (robot, command, published_at, available_at) VALUES (?, ?, ?, ?)",
+                ((robot, command, now, now) for robot, command in messages),
+            )
+
+    def receive(self, max_messages: int) -> List[Message]:
+        """
+        Lease up to `max_messages` messages, oldest first.
+        """
+        now = time.time()
+        with self._transaction():
+            rows = self.connection.execute(_RECEIVE, {"now": now, "limit": max_messages}).fetchall()
+            self._for_ids(
+                "UPDATE messages SET attempts = attempts + 1, available_at = ? WHERE id IN ({})",
+                [row[0] for row in rows],
+                now + self.visibility_timeout,
+            )
+        return [Message(*row) for row in rows]
+
+    def ack(self, ids: Sequence[int]) -> None:
+        """
+        Remove processed messages from the queue.
+        """
+        with self._transaction():
+            self._for_ids("DELETE FROM messages WHERE id IN ({})", ids)
+
+    def nack(self, ids: Sequence[int]) -> None:
+        """
+        Hand messages back for redelivery after `retry_delay`, or dead-letter the ones
+        that have used up their attempts.
+        """
+        now = time.time()
+        with self._transaction():
+            self.connection.executemany(
+                "INSERT INTO dead_letters (id, robot, command, attempts, published_at, failed_at) "
+                "SELECT id, robot, command, attempts, published_at, ? FROM messages WHERE id = ? AND attempts >= ?",
+                ((now, i, self.max_attempts) for i in ids),
+            )
+            self.connection.executemany(
+                "DELETE FROM messages WHERE id = ? AND attempts >= ?", ((i, self.max_attempts) for i in ids)
+            )
+            self.connection.executemany(
+                "UPDATE messages SET available_at = ? WHERE id = ?", ((now + self.retry_delay, i) for i in ids)
+            )
+
+    def pending(self) -> int:
+        """
+        Return the number of messages not yet acknowledged or dead-lettered.
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def dead_letters(self) -> List[Message]:
+        """
+        Return the dead-lettered messages in publish order.
+        """
+        return [
+            Message(*row)
+            for row in self.connection.execute(
+                "SELECT id, robot, command, attempts, published_at FROM dead_letters ORDER BY id"
+            )
+        ]
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT, rolled back on error. Taking the write lock up front
+    keeps two consumers from leasing the same messages.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> None:
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self.connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+class MessageConsumer:
+    """
+    Pulls commands from a broker in micro-batches and runs each robot's commands on
+    its own RobotController, created on the robot's first message.
+    """
+
+    def __init__(
+        self,
+        broker: MessageBrokerInterface,
+        controller_factory: Optional[Callable[[str], RobotController]] = None,
+        grid_size: int = 5,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Parameters:
+        - broker: where commands are received from
+        - controller_factory: builds the controller for a robot id (default: a
+          RobotController with its own Robot and the default stdout sink)
+        - grid_size: dimension of the square grid shared by the default controllers
+        - batch_size: most messages received, processed and acknowledged together
+        """
+        self.broker = broker
+        self.navigation = Navigation(grid_size)
+        self.controller_factory = controller_factory or self._default_controller
+        self.batch_size = batch_size
+        self.controllers: Dict[str, RobotController] = {}
+        self.processed = 0
+        self.failed = 0
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _default_controller(self, robot: str) -> RobotController:
+        return RobotController(robot=Robot(), navigation=self.navigation)
+
+    def poll(self) -> int:
+        """
+        Receive and process one batch.
+
+        A message whose processing raises is nacked, together with the rest of its
+        robot's messages in the batch, so the robot's commands are retried in order.
+        Everything else is acknowledged once the batch's REPORT output is flushed.
+
+        Returns:
+        - int: number of messages received
+        """
+        messages = self.broker.receive(self.batch_size)
+        if not messages:
+            return 0
+
+        controllers = self.controllers
+        done: List[int] = []
+        failed: List[int] = []
+        blocked = set()
+        touched: Dict[str, RobotController] = {}
+        for message in messages:
+            robot = message.robot
+            if robot in blocked:
+                failed.append(message.id)
+                continue
+            try:
+                controller = controllers.get(robot)
+                if controller is None:
+                    controller = controllers[robot] = self.controller_factory(robot)
+                controller.process_command(message.command)
+            except Exception:
+                self.logger.exception("Delivery %s of %r for robot %s failed (attempt %s).",
+                                      message.id, message.command, robot, message.attempts)
+                blocked.add(robot)
+                failed.append(message.id)
+                continue
+            touched[robot] = controller
+            done.append(message.id)
+
+        # Output must be durable before the commands that produced it are acknowledged
+        for controller in touched.values():
+            controller.sink.flush()
+        if done:
+            self.broker.ack(done)
+        if failed:
+            self.broker.nack(failed)
+        self.processed += len(done)
+        self.failed += len(failed)
+        return len(messages)
+
+    def drain(self) -> int:
+        """
+        Process batches until the broker has nothing to deliver.
+
+        Returns:
+        - int: number of messages received
+        """
+        total = 0
+        while True:
+            received = self.poll()
+            if not received:
+                return total
+            total += received
+
+    def run(self, poll_interval: float = 0.05, stop: Optional[threading.Event] = None) -> None:
+        """
+        Keep consuming, waiting `poll_interval` seconds whenever the queue is empty.
+
+        Parameters:
+        - poll_interval: seconds to wait between polls when there is nothing to deliver
+        - stop: when set, consuming ends after the current batch; without it,
+          consuming continues until interrupted
+        """
+        stop = stop if stop is not None else threading.Event()
+        while not stop.is_set():
+            if not self.poll():
+                stop.wait(poll_interval)
@@ -0,0 +1,111 @@
+"""
+metrics.py
+
+This file defines the opt-in instrumentation used by RobotController. When a
+CommandMetrics instance is passed to the controller, every command is counted by type
+and outcome, and the time spent parsing and executing it is recorded in separate
+latency histograms. Without one, the controller runs its uninstrumented code path.
+
+Responsibilities:
+- Count commands by type and outcome
+- Record parse and execute latencies in fixed-bucket histograms
+- Expose the data as a snapshot dictionary and as Prometheus text
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Histogram bucket upper bounds in nanoseconds: 250ns doubling up to ~0.5s
+LATENCY_BUCKETS_NS: Tuple[int, ...] = tuple(250 * 2 ** i for i in range(22))
+
+
+class LatencyHistogram:
+    """
+    A cumulative-on-export histogram of latencies in nanoseconds.
+    """
+
+    def __init__(self, buckets: Tuple[int, ...] = LATENCY_BUCKETS_NS) -> None:
+        self.buckets = buckets
+        # One count per bucket, plus an overflow bucket for +Inf
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.total_ns = 0
+        self.count = 0
+
+    def observe(self, ns: int) -> None:
+        self.counts[bisect_left(self.buckets, ns)] += 1
+        self.total_ns += ns
+        self.count += 1
+
+    def snapshot(self) -> Dict:
+        return {
+            "buckets_ns": list(self.buckets),
+            "counts": list(self.counts),
+            "sum_ns": self.total_ns,
+            "count": self.count,
+        }
+
+
+class CommandMetrics:
+    """
+    The CommandMetrics class collects per-command counters and latency histograms.
+    One instance can be shared by several controllers to aggregate their metrics.
+    """
+
+    def __init__(self) -> None:
+        self.commands: Counter = Counter()
+        self.parse_latency = LatencyHistogram()
+        self.execute_latency = LatencyHistogram()
+
+    def record(self, command: str, outcome: str, parse_ns: int, execute_ns: int) -> None:
+        """
+        Record one processed command.
+
+        Parameters:
+        - command: the command type, e.g. "MOVE", or "UNKNOWN" if unrecognised
+        - outcome: one of the OUTCOME_* constants in toy_robot.controller
+        - parse_ns, execute_ns: time spent in each phase, in nanoseconds
+        """
+        self.commands[command, outcome] += 1
+        self.parse_latency.observe(parse_ns)
+        self.execute_latency.observe(execute_ns)
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def snapshot(self) -> Dict:
+        """
+        Return a point-in-time copy of all metrics as plain Python data.
+        """
+        return {
+            "commands": [
+                {"command": command, "outcome": outcome, "count": count}
+                for (command, outcome), count in sorted(self.commands.items())
+            ],
+            "parse_latency": self.parse_latency.snapshot(),
+            "execute_latency": self.execute_latency.snapshot(),
+        }
+
+    def to_prometheus(self, prefix: str = "toy_robot") -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {prefix}_commands_total Commands processed, by command type and outcome.",
+            f"# TYPE {prefix}_commands_total counter",
+        ]
+        for (command, outcome), count in sorted(self.commands.items()):
+            lines.append(f'{prefix}_commands_total{{command="{command}",outcome="{outcome}"}} {count}')
+
+        for phase, histogram in (("parse", self.parse_latency), ("execute", self.execute_latency)):
+            name = f"{prefix}_{phase}_latency_seconds"
+            lines.append(f"# HELP {name} Time spent in the {phase} phase of a command.")
+            lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{bound / 1e9:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum {histogram.total_ns / 1e9:g}")
+            lines.append(f"{name}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
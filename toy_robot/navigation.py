@@ -12,6 +12,7 @@ Responsibilities:
 
 import logging
 from toy_robot.interfaces import NavigationInterface
+from toy_robot.log_events import EVENT_OUT_OF_BOUNDS, log_event
 
 class Navigation(NavigationInterface):
     """
@@ -43,6 +44,6 @@ class Navigation(NavigationInterface):
         if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
             return True
         else:
-            self.logger.warning(f"Invalid position check: ({x},{y}) is out of bounds.")
+            log_event(self.logger, logging.WARNING, "Invalid position check: (%s,%s) is out of bounds.", x, y, extra=EVENT_OUT_OF_BOUNDS)
             return False
 
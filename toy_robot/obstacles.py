@@ -0,0 +1,161 @@
+"""
+obstacles.py
+
+This file defines the ObstacleNavigation class, a Navigation for rectangular floors
+with blocked cells. Blocked cells are stored in a bitset with one bit per cell, so a
+10,000 × 10,000 floor needs about 12 MB, and every position check is O(1).
+
+Cell (x, y) is bit number y * width + x, stored least significant bit first, which
+matches numpy.packbits(..., bitorder="little") on a row-major grid.
+
+Obstacle files come in two formats:
+- Text: one blocked cell "X,Y" or inclusive rectangle "X1,Y1-X2,Y2" per line.
+  Blank lines and lines starting with '#' are ignored.
+- Binary: the output of save(), a small header followed by the raw bitset.
+
+Responsibilities:
+- Enforce the bounds of a rectangular grid
+- Reject positions on blocked cells
+- Load and save obstacle maps
+"""
+
+import logging
+import struct
+from typing import Optional, Tuple
+
+from toy_robot.interfaces import NavigationInterface
+from toy_robot.log_events import EVENT_BLOCKED, EVENT_OUT_OF_BOUNDS, log_event
+
+_MAGIC = b"TRBM"
+_HEADER = struct.Struct("<4sII")
+
+
+class ObstacleNavigation(NavigationInterface):
+    """
+    The ObstacleNavigation class validates positions against the bounds of a
+    width × height grid and a bit-packed map of blocked cells.
+
+    The engines built on packed states (TableController, GotoPlanner,
+    HeatmapAnalytics) need a square grid, and accept this navigation only when
+    width == height. Simulator.run_parallel() does not accept it at all, since
+    it only checks grid bounds.
+    """
+
+    def __init__(self, width: int, height: int, bits: Optional[bytearray] = None) -> None:
+        """
+        Initialise the navigation system with no blocked cells, or with an existing bitset.
+
+        Parameters:
+        - width (int): Number of columns
+        - height (int): Number of rows
+        - bits (bytearray): Optional bitset of blocked cells, (width * height + 7) // 8 bytes
+        """
+        size = (width * height + 7) // 8
+        if bits is not None and len(bits) != size:
+            raise ValueError(f"Obstacle bitset must be {size} bytes for a {width}x{height} grid, got {len(bits)}.")
+        self.width: int = width
+        self.height: int = height
+        self.bits: bytearray = bits if bits is not None else bytearray(size)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def is_valid_position(self, x: int, y: int) -> bool:
+        """
+        Check whether the given position lies on the grid and is not blocked.
+
+        Parameters:
+        - x (int): X-coordinate on the grid
+        - y (int): Y-coordinate on the grid
+
+        Returns:
+        - bool: True if the position is valid, False otherwise
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            log_event(self.logger, logging.WARNING, "Invalid position check: (%s,%s) is out of bounds.", x, y, extra=EVENT_OUT_OF_BOUNDS)
+            return False
+        index = y * self.width + x
+        if self.bits[index >> 3] >> (index & 7) & 1:
+            log_event(self.logger, logging.WARNING, "Invalid position check: (%s,%s) is blocked.", x, y, extra=EVENT_BLOCKED)
+            return False
+        return True
+
+    def bounds(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """
+        Return whether an on-grid cell is blocked, without logging.
+        """
+        index = y * self.width + x
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def block(self, x1: int, y1: int, x2: Optional[int] = None, y2: Optional[int] = None) -> None:
+        """
+        Block a single cell, or every cell of the inclusive rectangle (x1, y1)-(x2, y2).
+
+        Raises:
+        - ValueError if any part of the rectangle is off the grid
+        """
+        x2 = x1 if x2 is None else x2
+        y2 = y1 if y2 is None else y2
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        if x1 < 0 or y1 < 0 or x2 >= self.width or y2 >= self.height:
+            raise ValueError(f"Obstacle ({x1},{y1})-({x2},{y2}) is outside the {self.width}x{self.height} grid.")
+        for y in range(y1, y2 + 1):
+            self._set_bits(y * self.width + x1, y * self.width + x2)
+
+    def _set_bits(self, start: int, end: int) -> None:
+        # Set bits start..end inclusive, filling whole bytes with one slice assignment
+        first, last = start >> 3, end >> 3
+        if first == last:
+            self.bits[first] |= ((1 << (end - start + 1)) - 1) << (start & 7)
+            return
+        self.bits[first] |= (0xFF << (start & 7)) & 0xFF
+        self.bits[first + 1:last] = b"\xff" * (last - first - 1)
+        self.bits[last] |= (1 << ((end & 7) + 1)) - 1
+
+    def save(self, path: str) -> None:
+        """
+        Write the grid dimensions and bitset in the binary obstacle format.
+        """
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, self.width, self.height))
+            file.write(self.bits)
+
+    @classmethod
+    def from_file(cls, path: str, width: Optional[int] = None, height: Optional[int] = None) -> "ObstacleNavigation":
+        """
+        Load an obstacle map in either the binary or the text format.
+
+        Parameters:
+        - path: the obstacle file
+        - width, height: grid dimensions, required for text files (binary files
+          store their own)
+
+        Raises:
+        - ValueError if the file is malformed or the dimensions are missing
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) == _HEADER.size and header[:4] == _MAGIC:
+                _, width, height = _HEADER.unpack(header)
+                navigation = cls(width, height)
+                if file.readinto(navigation.bits) != len(navigation.bits):
+                    raise ValueError(f"Obstacle file {path} is truncated.")
+                return navigation
+
+        if width is None or height is None:
+            raise ValueError("Grid width and height are required for text obstacle files.")
+        navigation = cls(width, height)
+        with open(path, "r") as file:
+            for number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    corners = [tuple(int(v) for v in corner.split(",")) for corner in line.split("-", 1)]
+                    (x1, y1), (x2, y2) = corners[0], corners[-1]
+                except ValueError:
+                    raise ValueError(f"Invalid obstacle on line {number} of {path}: '{line}'") from None
+                navigation.block(x1, y1, x2, y2)
+        return navigation
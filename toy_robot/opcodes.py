@@ -0,0 +1,68 @@
+"""
+opcodes.py
+
+This file defines the compact integer encoding shared by the non-string execution
+engines. Commands and directions are mapped to small integers so they can be stored
+in arrays and used as table indices instead of being compared as strings.
+
+Responsibilities:
+- Define the opcode for each supported command
+- Map cardinal directions to and from integer indices
+- Convert a parsed command tuple into its opcode form
+"""
+
+from typing import Optional, Tuple, Union
+
+from toy_robot.interfaces import RobotInterface
+
+# Opcodes. NOP stands in for any command that was rejected while parsing.
+OP_NOP = 0
+OP_PLACE = 1
+OP_MOVE = 2
+OP_LEFT = 3
+OP_RIGHT = 4
+OP_REPORT = 5
+# GOTO X,Y, only accepted by controllers with a GotoPlanner. It is not in OPCODES, as
+# it is never a one-word command and only the bytecode and trace formats store it.
+OP_GOTO = 6
+
+OPCODES = {
+    "PLACE": OP_PLACE,
+    "MOVE": OP_MOVE,
+    "LEFT": OP_LEFT,
+    "RIGHT": OP_RIGHT,
+    "REPORT": OP_REPORT,
+}
+OPCODE_NAMES = {op: name for name, op in OPCODES.items()}
+OPCODE_NAMES[OP_NOP] = "NOP"
+OPCODE_NAMES[OP_GOTO] = "GOTO"
+
+# Operand-free commands as they appear in raw input, so most lines need no parsing
+BYTES_OPCODES = {name.encode(): op for name, op in OPCODES.items() if op != OP_PLACE}
+
+# Directions are indexed in clockwise order, so turning is +/- 1 modulo 4
+DIRECTIONS = RobotInterface.GET_CARDINAL_DIRECTIONS
+DIRECTION_INDEX = {name: idx for idx, name in enumerate(DIRECTIONS)}
+DIRECTION_DX = tuple(RobotInterface.GET_DIRECTION_DELTAS[name][0] for name in DIRECTIONS)
+DIRECTION_DY = tuple(RobotInterface.GET_DIRECTION_DELTAS[name][1] for name in DIRECTIONS)
+
+
+def encode(parsed: Optional[Union[Tuple[str], Tuple[str, int, int, str]]]) -> Tuple[int, int, int, int]:
+    """
+    Convert the output of RobotController.parse_command() into opcode form.
+
+    Parameters:
+    - parsed: a parsed command tuple, or None for a rejected command
+
+    Returns:
+    - tuple: (opcode, x, y, direction_index). The operands are only meaningful
+      for OP_PLACE and OP_GOTO (which has no direction) and are 0 otherwise.
+    """
+    if not parsed:
+        return OP_NOP, 0, 0, 0
+    if parsed[0] == "PLACE":
+        _, x, y, direction = parsed
+        return OP_PLACE, x, y, DIRECTION_INDEX[direction]
+    if parsed[0] == "GOTO":
+        return OP_GOTO, parsed[1], parsed[2], 0
+    return OPCODES[parsed[0]], 0, 0, 0
@@ -0,0 +1,149 @@
+"""
+output.py
+
+This file defines the output sinks that receive REPORT results from the RobotController.
+Decoupling output from the Robot lets REPORT-heavy streams batch their writes instead
+of paying for a terminal write per REPORT, and lets embedding callers read results
+directly instead of capturing stdout.
+
+Responsibilities:
+- Print REPORT results to stdout (the default, one line per REPORT)
+- Buffer text or fixed-width binary records and flush them by count or by time
+- Collect results in memory for embedding callers
+"""
+
+import struct
+import sys
+import time
+from abc import abstractmethod
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Tuple
+
+from toy_robot.interfaces import OutputSinkInterface
+from toy_robot.opcodes import DIRECTION_INDEX, DIRECTIONS
+
+# x, y, direction index
+BINARY_RECORD = struct.Struct("<iiB")
+
+
+class StdoutSink(OutputSinkInterface):
+    """
+    Prints each REPORT as soon as it happens, in the format "Output: X,Y,DIRECTION".
+    """
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        print(f"Output: {x},{y},{direction}")
+
+    def flush(self) -> None:
+        sys.stdout.flush()
+
+
+class _BufferedSink(OutputSinkInterface):
+    """
+    Shared flush policy for the buffered sinks, which implement write() and
+    _write_out(). The buffer is written out when it
+    holds `flush_every` records, when `flush_interval` seconds have passed since the
+    last flush (checked on each write), or when flush() is called.
+    """
+
+    def __init__(self, flush_every: Optional[int] = 1024, flush_interval: Optional[float] = None) -> None:
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def _written(self) -> None:
+        self.pending += 1
+        if self.flush_every is not None and self.pending >= self.flush_every:
+            self.flush()
+        elif self.flush_interval is not None and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._write_out()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    @abstractmethod
+    def _write_out(self) -> None: ...
+
+
+class BufferedTextSink(_BufferedSink):
+    """
+    Writes REPORT lines to a text stream in batches.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_every: Optional[int] = 1024, flush_interval: Optional[float] = None) -> None:
+        """
+        Parameters:
+        - stream: text stream to write to (default: sys.stdout)
+        - flush_every, flush_interval: flush policy, see _BufferedSink
+        """
+        super().__init__(flush_every, flush_interval)
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer: List[str] = []
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        self.buffer.append(f"Output: {x},{y},{direction}\n")
+        self._written()
+
+    def _write_out(self) -> None:
+        if self.buffer:
+            self.stream.write("".join(self.buffer))
+            self.buffer.clear()
+        self.stream.flush()
+
+
+class BinaryRecordSink(_BufferedSink):
+    """
+    Writes each REPORT as a fixed-width little-endian record (int32 x, int32 y,
+    uint8 direction index) to a binary stream. Use read_binary_records() to decode.
+    """
+
+    def __init__(self, stream: BinaryIO, flush_every: Optional[int] = 4096, flush_interval: Optional[float] = None) -> None:
+        super().__init__(flush_every, flush_interval)
+        self.stream = stream
+        self.buffer = bytearray()
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        self.buffer += BINARY_RECORD.pack(x, y, DIRECTION_INDEX[direction])
+        self._written()
+
+    def _write_out(self) -> None:
+        if self.buffer:
+            self.stream.write(self.buffer)
+            self.buffer.clear()
+        self.stream.flush()
+
+
+class ListSink(OutputSinkInterface):
+    """
+    Keeps REPORT results in memory as (x, y, direction) tuples.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Tuple[int, int, str]] = []
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        self.records.append((x, y, direction))
+
+    def flush(self) -> None:
+        pass
+
+    def lines(self) -> List[str]:
+        """
+        Return the results formatted as "Output: X,Y,DIRECTION" lines.
+        """
+        return [f"Output: {x},{y},{direction}" for x, y, direction in self.records]
+
+
+def read_binary_records(stream: BinaryIO) -> Iterator[Tuple[int, int, str]]:
+    """
+    Decode the records written by a BinaryRecordSink.
+    """
+    block_size = BINARY_RECORD.size * 4096
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        for x, y, direction in BINARY_RECORD.iter_unpack(block):
+            yield x, y, DIRECTIONS[direction]
@@ -0,0 +1,192 @@
+"""
+parallel.py
+
+This file runs very large command files across a process pool. On a fixed grid any
+chunk of commands is a function from start state to end state (see transitions.py),
+and such functions compose. The file is processed in two parallel passes:
+
+1. Map: each chunk is summarised as its transition function, for every start state.
+2. Reduce: the functions are composed in order, giving the exact start state of
+   every chunk and the final state of the whole file.
+3. Replay: each chunk is replayed from its known start state to produce its REPORT
+   output, which is returned in file order.
+
+The file can start from any state, e.g. that of a robot placed by earlier commands.
+Commands are parsed without logging (see tokenizer.tokenize), since both passes parse
+every chunk and would otherwise log each rejected command twice.
+
+Only the first pass has to consider every start state, and only until the first
+valid PLACE in the chunk, after which the chunk's outcome no longer depends on where
+it started. It tracks the function as the distinct states it maps to plus an index
+into them, and applies each command to the distinct states only, as one NumPy
+lookup. Commands that merge states (e.g. MOVEs against an edge) shrink that set, so
+most of a chunk costs far less than one lookup per start state.
+
+With a single process there is nothing to run in parallel, so the file is replayed
+chunk by chunk from the start state instead, which skips the first pass.
+
+Responsibilities:
+- Split a command file into newline-aligned byte ranges
+- Summarise and replay chunks in worker processes
+- Compose chunk transition functions into the final state and ordered REPORT states
+"""
+
+import io
+import logging
+import os
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from toy_robot.opcodes import OP_NOP, OP_PLACE, OP_REPORT, encode
+from toy_robot.tokenizer import tokenize
+from toy_robot.transitions import STATE_UNPLACED, TransitionTable
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Commands applied between removing duplicates from a chunk's image states
+_DEDUPE_EVERY = 64
+
+logger = logging.getLogger(__name__)
+
+# Per-process tables, created on first use in each worker
+_worker_tables: Optional[TransitionTable] = None
+_worker_arrays: List[np.ndarray] = []
+
+
+def _worker_state(grid_size: int) -> TransitionTable:
+    global _worker_tables, _worker_arrays
+    if _worker_tables is None or _worker_tables.grid_size != grid_size:
+        _worker_tables = TransitionTable(grid_size)
+        _worker_arrays = [np.asarray(table, dtype=np.int64) for table in _worker_tables.tables]
+    return _worker_tables
+
+
+def chunk_boundaries(filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges of roughly `chunk_size` that end on a line break.
+
+    Returns:
+    - list of (start, end) offsets covering the whole file in order
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as file:
+        while boundaries[-1] + chunk_size < size:
+            file.seek(boundaries[-1] + chunk_size)
+            file.readline()
+            boundaries.append(min(file.tell(), size))
+    if boundaries[-1] != size or size == 0:
+        boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _iter_opcodes(filename: str, start: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    with open(filename, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    for line in io.StringIO(data.decode("utf-8"), newline=None):
+        command = line.strip()
+        if command:
+            yield encode(tokenize(command)[0])
+
+
+def _summarise_chunk(args: Tuple[str, int, int, int]) -> np.ndarray:
+    """
+    Map step: compute the chunk's end state for every possible start state.
+    """
+    filename, start, end, grid_size = args
+    tables = _worker_state(grid_size)
+    arrays = _worker_arrays
+
+    # The function so far is image[index]: image holds the states reached, and index
+    # the position in image that each start state reached
+    opcodes = _iter_opcodes(filename, start, end)
+    image = np.arange(tables.num_states, dtype=np.int64)
+    index = image.copy()
+    pending = 0
+    for op, x, y, direction in opcodes:
+        if op == OP_PLACE:
+            target = tables.place(x, y, direction)
+            if target is not None:
+                # From here on the chunk no longer depends on its start state
+                state = target
+                for op, x, y, direction in opcodes:
+                    state = tables.apply(state, op, x, y, direction)
+                return np.full(tables.num_states, state, dtype=np.int64)
+        elif op != OP_NOP and op != OP_REPORT:
+            image = arrays[op][image]
+            pending += 1
+            if pending == _DEDUPE_EVERY:
+                image, merged = np.unique(image, return_inverse=True)
+                index = merged[index]
+                pending = 0
+    return image[index]
+
+
+def _replay_chunk(args: Tuple[str, int, int, int, int]) -> Tuple[int, List[int]]:
+    """
+    Replay step: run the chunk from its known start state and collect the state at
+    every REPORT.
+
+    Returns:
+    - tuple: (end_state, reports)
+    """
+    filename, start, end, grid_size, state = args
+    tables = _worker_state(grid_size)
+
+    reports = []
+    for op, x, y, direction in _iter_opcodes(filename, start, end):
+        if op == OP_REPORT:
+            if state != STATE_UNPLACED:
+                reports.append(state)
+        else:
+            state = tables.apply(state, op, x, y, direction)
+    return state, reports
+
+
+def run_parallel(
+    filename: str,
+    grid_size: int = 5,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_state: int = STATE_UNPLACED,
+) -> Tuple[int, List[int]]:
+    """
+    Execute a command file on a process pool.
+
+    Parameters:
+    - filename: path of the command file
+    - grid_size: dimension of the square grid
+    - processes: number of worker processes (default: os.cpu_count()); with 1 the
+      chunks are replayed in this process, one after the other
+    - chunk_size: approximate number of bytes per chunk
+    - start_state: the state the file starts from, encoded as in TransitionTable
+
+    Returns:
+    - tuple: (final_state, reports), where final_state and each entry of reports
+      (the state at every executed REPORT, in file order) are encoded as in TransitionTable
+    """
+    chunks = chunk_boundaries(filename, chunk_size)
+    state = start_state
+    reports: List[int] = []
+    if processes == 1:
+        for start, end in chunks:
+            state, chunk_reports = _replay_chunk((filename, start, end, grid_size, state))
+            reports.extend(chunk_reports)
+        logger.debug("Processed %s chunks of %s sequentially", len(chunks), filename)
+        return state, reports
+
+    with Pool(processes) as pool:
+        summaries = pool.imap(_summarise_chunk, [(filename, start, end, grid_size) for start, end in chunks])
+
+        replay_args = []
+        for (start, end), function in zip(chunks, summaries):
+            replay_args.append((filename, start, end, grid_size, state))
+            state = int(function[state])
+
+        for _, chunk_reports in pool.imap(_replay_chunk, replay_args):
+            reports.extend(chunk_reports)
+
+    logger.debug("Processed %s chunks of %s in parallel", len(chunks), filename)
+    return state, reports
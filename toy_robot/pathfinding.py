@@ -0,0 +1,131 @@
+"""
+pathfinding.py
+
+This file defines the GotoPlanner, which expands a GOTO X,Y command into the shortest
+sequence of LEFT, RIGHT and MOVE commands that takes the robot from its current
+position and direction to cell (X, Y), facing any direction.
+
+Plans are read off a distance field: for every packed robot state (see transitions.py)
+the number of commands needed to reach the target. A field is computed once per
+target with a breadth-first search backwards from the target cell over the
+Navigation-validated transition tables, and kept in an LRU cache, so repeated GOTOs to
+the same destination only walk the field from the robot's state, one command per step.
+
+Responsibilities:
+- Compute distance fields over (x, y, direction) states for a target cell
+- Cache distance fields per target with LRU eviction
+- Walk a distance field into an optimal command sequence
+"""
+
+from array import array
+from collections import deque
+from typing import List, Optional, Tuple
+
+from toy_robot.cache import LRUCache
+from toy_robot.interfaces import NavigationInterface
+from toy_robot.opcodes import DIRECTION_INDEX, OP_LEFT, OP_MOVE, OP_RIGHT
+from toy_robot.transitions import TransitionTable, encode_state, square_grid_size
+
+UNREACHABLE = -1
+
+# Tried in this order when several commands lie on a shortest path
+_STEPS = ((OP_MOVE, ("MOVE",)), (OP_LEFT, ("LEFT",)), (OP_RIGHT, ("RIGHT",)))
+
+
+class GotoPlanner:
+    """
+    The GotoPlanner plans GOTO commands on a square grid. One planner can be shared by
+    many controllers on the same table, so they also share its cache of distance fields.
+
+    Walkable cells are taken from the Navigation once, when the planner is created.
+    The controller still validates every MOVE of a plan as it executes it.
+    """
+
+    def __init__(self, navigation: NavigationInterface, grid_size: Optional[int] = None, cache_size: int = 64) -> None:
+        """
+        Parameters:
+        - navigation: decides which cells of the grid can be entered
+        - grid_size: dimension of the square grid (default: from navigation.bounds())
+        - cache_size: number of distance fields (one per target) kept in memory
+
+        Raises:
+        - ValueError if the navigation does not cover a square grid of that size
+          (see transitions.square_grid_size)
+        """
+        grid_size = square_grid_size(navigation, grid_size)
+        self.transitions = TransitionTable(grid_size, navigation)
+        self.fields: LRUCache = LRUCache(cache_size)
+        self._predecessors: Optional[List[List[int]]] = None
+
+    def distance_field(self, x: int, y: int) -> Optional[array]:
+        """
+        Return the distance field of a target cell, from the cache if possible.
+        field[state] is the number of commands from that state to the target, or
+        UNREACHABLE. Returns None if the target cell itself cannot be entered.
+        """
+        if not self.transitions.is_valid_position(x, y):
+            return None
+        field = self.fields.get((x, y))
+        if field is None:
+            field = self._search(x, y)
+            self.fields.put((x, y), field)
+        return field
+
+    def plan(self, x: int, y: int, direction: str, target_x: int, target_y: int) -> Optional[List[Tuple[str]]]:
+        """
+        Return the shortest list of parsed commands, e.g. [("LEFT",), ("MOVE",)], that
+        takes a robot at (x, y) facing `direction` to the target cell, or None if the
+        target cannot be reached.
+        """
+        field = self.distance_field(target_x, target_y)
+        if field is None:
+            return None
+        transitions = self.transitions
+        state = transitions.encode(x, y, DIRECTION_INDEX[direction])
+        distance = field[state]
+        if distance == UNREACHABLE:
+            return None
+
+        tables = transitions.tables
+        commands = []
+        while distance:
+            for op, command in _STEPS:
+                following = tables[op][state]
+                if following != state and field[following] == distance - 1:
+                    commands.append(command)
+                    state, distance = following, distance - 1
+                    break
+        return commands
+
+    def _search(self, x: int, y: int) -> array:
+        # Breadth-first search backwards from the four states on the target cell
+        predecessors = self._predecessors
+        if predecessors is None:
+            predecessors = self._predecessors = self._build_predecessors()
+        grid_size = self.transitions.grid_size
+        field = array("i", [UNREACHABLE]) * self.transitions.num_states
+        queue = deque()
+        for direction in range(4):
+            state = encode_state(x, y, direction, grid_size)
+            field[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            distance = field[state] + 1
+            for previous in predecessors[state]:
+                if field[previous] == UNREACHABLE:
+                    field[previous] = distance
+                    queue.append(previous)
+        return field
+
+    def _build_predecessors(self) -> List[List[int]]:
+        # Reverse the MOVE, LEFT and RIGHT transitions once; every search reuses them
+        tables = self.transitions.tables
+        predecessors: List[List[int]] = [[] for _ in range(self.transitions.num_states)]
+        for op, _ in _STEPS:
+            table = tables[op]
+            for state in range(1, len(table)):
+                following = table[state]
+                if following != state:
+                    predecessors[following].append(state)
+        return predecessors
@@ -0,0 +1,109 @@
+"""
+reader.py
+
+This file provides a bytes-level line reader for command input. Regular files are
+memory-mapped and scanned for newline offsets directly, so lines are never decoded
+into str objects by the reader and memory use does not grow with the file size.
+Streams that cannot be mapped, such as pipes on stdin, are read in fixed-size blocks
+instead.
+
+Lines are separated by b"\\n"; a trailing b"\\r" is left on the line for the caller
+to strip along with any other surrounding whitespace.
+
+Responsibilities:
+- Memory-map regular files and scan them for line breaks
+- Fall back to block reads for unmappable streams
+- Yield each line as bytes without decoding it
+- Optionally report the byte offset after each line, so a run can be resumed
+"""
+
+import mmap
+import os
+import stat
+from typing import BinaryIO, Iterator, Tuple
+
+BLOCK_SIZE = 1024 * 1024
+
+
+def _is_mappable(file: BinaryIO) -> bool:
+    try:
+        info = os.fstat(file.fileno())
+    except (AttributeError, OSError, ValueError):
+        return False
+    return stat.S_ISREG(info.st_mode) and info.st_size > 0
+
+
+def iter_lines(file: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield the lines of a binary file or stream, without their trailing b"\\n".
+
+    Parameters:
+    - file: a file object opened in binary mode, e.g. open(path, "rb") or sys.stdin.buffer
+
+    Regular files are memory-mapped from the start of the file; other streams are
+    read from their current position.
+    """
+    if _is_mappable(file):
+        yield from _iter_mapped_lines(file)
+    else:
+        yield from _iter_block_lines(file)
+
+
+def _iter_mapped_lines(file: BinaryIO) -> Iterator[bytes]:
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        find = mapped.find
+        size = len(mapped)
+        start = 0
+        while start < size:
+            end = find(b"\n", start)
+            if end == -1:
+                end = size
+            yield mapped[start:end]
+            start = end + 1
+
+
+def _iter_block_lines(file: BinaryIO) -> Iterator[bytes]:
+    pending = b""
+    while True:
+        block = file.read(BLOCK_SIZE)
+        if not block:
+            break
+        if pending:
+            block = pending + block
+        start = 0
+        end = block.find(b"\n")
+        while end != -1:
+            yield block[start:end]
+            start = end + 1
+            end = block.find(b"\n", start)
+        pending = block[start:]
+    if pending:
+        yield pending
+
+
+def iter_lines_from(file: BinaryIO, offset: int = 0) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (line, next_offset) pairs for a regular file, starting at a byte offset.
+    next_offset is the offset just past the line's b"\n", i.e. where reading should
+    resume once the line has been processed.
+
+    Parameters:
+    - file: a regular file opened in binary mode
+    - offset: byte offset of the first line to read; must be at a line start
+    """
+    if _is_mappable(file):
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            find = mapped.find
+            size = len(mapped)
+            start = offset
+            while start < size:
+                end = find(b"\n", start)
+                if end == -1:
+                    end = size
+                yield mapped[start:end], min(end + 1, size)
+                start = end + 1
+    else:
+        file.seek(offset)
+        for line in _iter_block_lines(file):
+            offset += len(line) + 1
+            yield line, min(offset, file.tell())
@@ -87,6 +87,15 @@ class Robot(RobotInterface):
         idx = self.GET_CARDINAL_DIRECTIONS.index(self.current_direction)
         self.current_direction = self.GET_CARDINAL_DIRECTIONS[(idx + 1) % 4]
 
+    def state(self) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+        """
+        Return the robot's current position and direction without printing it.
+
+        Returns:
+        - tuple: (x, y, direction), all None if the robot has not been placed
+        """
+        return self.current_x, self.current_y, self.current_direction
+
     def report(self) -> None:
         """
         Print the robot's current position and direction in the format: X,Y,DIRECTION
@@ -0,0 +1,143 @@
+"""
+server.py
+
+This file defines the CommandServer class, an asyncio server that accepts commands over
+TCP or Unix sockets. Each connection gets its own robot session: a RobotController
+with a private Robot, sharing a single stateless Navigation. Commands are newline
+separated, and REPORT output is streamed back to the client that asked for it.
+
+Backpressure and memory bounds:
+- A line is only read once the previous command has been processed and its output
+  has been accepted by the transport, so a client sending faster than we process is
+  slowed down by TCP flow control instead of growing our buffers.
+- Each session's read buffer is capped by the maximum line length, and its write
+  buffer by the write buffer limit.
+
+Responsibilities:
+- Listen on TCP or Unix sockets
+- Create and tear down one robot session per connection
+- Stream REPORT output back to the client
+- Bound per-session memory and the number of concurrent sessions
+"""
+
+import asyncio
+import logging
+from typing import Optional, Set
+
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import OutputSinkInterface
+from toy_robot.navigation import Navigation
+from toy_robot.robot import Robot
+
+
+class _SessionSink(OutputSinkInterface):
+    """
+    Sends REPORT output to the session's client. The transport buffers the writes,
+    and the session loop drains them.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        self.writer.write(f"Output: {x},{y},{direction}\n".encode())
+
+    def flush(self) -> None:
+        pass
+
+
+class CommandServer:
+    """
+    The CommandServer runs one robot session per client connection on a single event loop.
+    """
+
+    def __init__(
+        self,
+        grid_size: int = 5,
+        max_line_length: int = 1024,
+        write_buffer_limit: int = 64 * 1024,
+        max_sessions: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialise the server.
+
+        Parameters:
+        - grid_size (int): The dimension of the square grid for every session (default: 5)
+        - max_line_length (int): Longest accepted command line in bytes; a client
+          sending a longer line is disconnected
+        - write_buffer_limit (int): Bytes of pending output per session before the
+          session stops reading commands until the client catches up
+        - max_sessions (int): Maximum concurrent sessions, or None for no limit
+        - idle_timeout (float): Seconds without a command before a session is
+          closed, or None to keep idle sessions open
+        """
+        self.navigation = Navigation(grid_size)
+        self.max_line_length = max_line_length
+        self.write_buffer_limit = write_buffer_limit
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions: Set[asyncio.StreamWriter] = set()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """
+        Start listening on a TCP socket. Use port 0 to pick a free port.
+        """
+        return await asyncio.start_server(self.handle_session, host, port, limit=self.max_line_length)
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """
+        Start listening on a Unix domain socket at the given path.
+        """
+        return await asyncio.start_unix_server(self.handle_session, path, limit=self.max_line_length)
+
+    async def handle_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Run one robot session until the client disconnects.
+        """
+        if self.max_sessions is not None and len(self.sessions) >= self.max_sessions:
+            self.logger.warning("Rejecting connection: %s sessions already open.", self.max_sessions)
+            writer.close()
+            return
+
+        writer.transport.set_write_buffer_limits(high=self.write_buffer_limit)
+        controller = RobotController(robot=Robot(), navigation=self.navigation, sink=_SessionSink(writer))
+        self.sessions.add(writer)
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Closing idle session.")
+                    break
+                except ValueError:
+                    self.logger.warning("Closing session: command longer than %s bytes.", self.max_line_length)
+                    break
+                if not line:
+                    break
+                if not line.isspace():
+                    controller.process_bytes(line)
+                    # Waits only when the client is not reading its output fast enough
+                    await writer.drain()
+        except ConnectionError as e:
+            self.logger.warning("Session ended by connection error: %s", e)
+        finally:
+            self.sessions.discard(writer)
+            writer.close()
+
+
+def serve_tcp(host: str = "127.0.0.1", port: int = 8765, **options) -> None:
+    """
+    Run a CommandServer on a TCP socket until interrupted.
+
+    Parameters:
+    - host, port: address to listen on
+    - options: keyword arguments passed to CommandServer
+    """
+    async def main() -> None:
+        server = await CommandServer(**options).start_tcp(host, port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
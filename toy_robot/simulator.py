@@ -5,13 +5,27 @@ This file defines the Simulator class, which reads commands from a file
 and feeds them to the RobotController one line at a time.
 
 Responsibilities:
-- Load a default command file
+- Load a default command file, any given file or a stream such as stdin
 - Stream each command to the controller
+- Replay command files from cached bytecode
+- Execute very large command files on a process pool
+- Checkpoint long file runs and resume them after a crash
+- Follow a command file that is still being appended to
 - Gracefully handle missing or unreadable files
 """
 
 import logging
+import threading
+import time
 from toy_robot.controller import RobotController
+from toy_robot.opcodes import DIRECTION_INDEX, DIRECTIONS
+from toy_robot.reader import iter_lines, iter_lines_from
+from toy_robot.transitions import STATE_UNPLACED, decode_state, encode_state
+from typing import BinaryIO, Optional
+
+# The modules behind the optional run modes (bytecode, checkpoint, follow, parallel)
+# are imported by the methods that use them, so the plain file and stream runs start
+# without loading multiprocessing, hashlib, json and friends.
 
 class Simulator:
     """
@@ -36,12 +50,194 @@ class Simulator:
 
         If the file is missing, an error is logged.
         """
-        filename = "data/commands.txt"
+        self.run_from_file("data/commands.txt")
+
+    def run_from_file(self, filename: str) -> None:
+        """
+        Reads commands from the given file and sends each non-empty line to the
+        controller. The file is memory-mapped and scanned as bytes (see
+        toy_robot.reader), so memory use stays constant whatever the file size.
+
+        If the file is missing, an error is logged.
+        """
+        try:
+            with open(filename, "rb") as file:
+                self.run_from_stream(file)
+        except FileNotFoundError:
+            self.logger.error("File not found: %s", filename)
+
+    def run_from_stream(self, stream: BinaryIO) -> None:
+        """
+        Reads commands from a binary file object, e.g. sys.stdin.buffer, and sends
+        each non-empty line to the controller.
+        """
+        process_bytes = self.controller.process_bytes
+        for line in iter_lines(stream):
+            if line and not line.isspace():
+                process_bytes(line)
+        self.controller.sink.flush()
+
+    def run_with_checkpoints(
+        self,
+        filename: str,
+        checkpoint_path: str,
+        every_lines: int = 100_000,
+        every_seconds: Optional[float] = None,
+        resume: bool = True,
+    ) -> None:
+        """
+        Reads commands from the given file like run_from_file(), periodically saving a
+        checkpoint of the robot state and the input offset (see toy_robot.checkpoint).
+        The sink is flushed before each checkpoint, so every REPORT before the saved
+        offset has been written out.
+
+        Parameters:
+        - filename: the command file
+        - checkpoint_path: where the checkpoint is kept
+        - every_lines: save a checkpoint after this many lines
+        - every_seconds: if given, also save a checkpoint once this much time has passed
+        - resume: if a matching checkpoint exists, restore the robot from it and seek to
+          its offset instead of starting at the beginning of the file. The controller's
+          robot should be unplaced in this case.
+
+        A final checkpoint is saved at the end of the file. If the file is missing, an
+        error is logged.
+        """
+        from toy_robot.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+
+        offset = 0
+        if resume:
+            checkpoint = load_checkpoint(checkpoint_path)
+            if checkpoint is not None:
+                if checkpoint.matches(filename):
+                    checkpoint.restore(self.controller.robot)
+                    offset = checkpoint.offset
+                    self.logger.info("Resuming %s from byte %s.", filename, offset)
+                else:
+                    self.logger.warning("Ignoring checkpoint %s: it does not match %s.", checkpoint_path, filename)
+
+        robot = self.controller.robot
+        sink = self.controller.sink
+        process_bytes = self.controller.process_bytes
+
+        def checkpoint_at(position: int) -> None:
+            sink.flush()
+            save_checkpoint(checkpoint_path, Checkpoint.capture(filename, position, robot))
+
+        try:
+            with open(filename, "rb") as file:
+                remaining = every_lines
+                deadline = time.monotonic() + every_seconds if every_seconds is not None else None
+                for line, offset in iter_lines_from(file, offset):
+                    if line and not line.isspace():
+                        process_bytes(line)
+                    remaining -= 1
+                    if remaining == 0 or (deadline is not None and time.monotonic() >= deadline):
+                        checkpoint_at(offset)
+                        remaining = every_lines
+                        if deadline is not None:
+                            deadline = time.monotonic() + every_seconds
+        except FileNotFoundError:
+            self.logger.error("File not found: %s", filename)
+            return
+        checkpoint_at(offset)
+
+    def follow(
+        self,
+        filename: str,
+        poll_interval: float = 0.05,
+        stop: Optional[threading.Event] = None,
+        from_end: bool = False,
+    ) -> None:
+        """
+        Processes the file's commands and then keeps following it, processing each
+        complete line as it is appended (see toy_robot.follow). The controller keeps
+        its state across polls, and the sink is flushed after every batch of lines.
+
+        Parameters:
+        - filename: the file to follow; it does not need to exist yet
+        - poll_interval: seconds to wait between polls when there is no new input
+        - stop: when set, following ends after the current poll; without it, following
+          continues until interrupted
+        - from_end: skip the commands already in the file
+        """
+        from toy_robot.follow import FileFollower
+
+        stop = stop if stop is not None else threading.Event()
+        process_bytes = self.controller.process_bytes
+        with FileFollower(filename, from_end) as follower:
+            while not stop.is_set():
+                processed = False
+                for line in follower.poll():
+                    processed = True
+                    if line and not line.isspace():
+                        process_bytes(line)
+                if processed:
+                    self.controller.sink.flush()
+                else:
+                    stop.wait(poll_interval)
+
+    def run_compiled(self, filename: str = "data/commands.txt", cache_dir: str = "cache/bytecode") -> None:
+        """
+        Compiles the command file to bytecode (or loads it from the on-disk cache) and
+        executes it. Replaying the same file again skips string parsing entirely.
+
+        Unrecognised and malformed commands are only logged when the file is compiled.
+        If the file is missing, an error is logged.
+        """
+        from toy_robot.bytecode import load_or_compile
+
         try:
-            with open(filename, "r") as file:
-                for line in file:
-                    command = line.strip()
-                    if command:
-                        self.controller.process_command(command)
+            bytecode = load_or_compile(filename, self.controller.parse_command, cache_dir,
+                                       goto=self.controller.planner is not None)
         except FileNotFoundError:
-            self.logger.error(f"File not found: {filename}")
+            self.logger.error("File not found: %s", filename)
+            return
+        self.controller.execute_bytecode(bytecode)
+        self.controller.sink.flush()
+
+    def run_parallel(
+        self,
+        filename: str = "data/commands.txt",
+        processes: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        Executes the command file in chunks on a process pool (see toy_robot.parallel)
+        and writes the REPORT output to the controller's sink in file order. The file
+        starts from the controller's robot, and afterwards the robot holds the final
+        state, so further commands can continue from where the file ended.
+
+        This mode only checks the square grid bounds of the controller's navigation,
+        and ignored commands are not logged. If the file is missing, an error is logged.
+        chunk_size defaults to toy_robot.parallel.DEFAULT_CHUNK_SIZE.
+
+        Raises:
+        - ValueError if the controller's navigation is not a plain square-grid
+          Navigation, e.g. an ObstacleNavigation, whose rules this mode cannot follow
+        """
+        from toy_robot.navigation import Navigation
+        from toy_robot.parallel import DEFAULT_CHUNK_SIZE, run_parallel
+
+        navigation = self.controller.navigation
+        if type(navigation) is not Navigation:
+            raise ValueError(
+                f"Parallel runs only support a plain square-grid Navigation, not {type(navigation).__name__}."
+            )
+        grid_size = navigation.grid_size
+        x, y, direction = self.controller.robot.state()
+        start_state = STATE_UNPLACED if x is None else encode_state(x, y, DIRECTION_INDEX[direction], grid_size)
+        try:
+            state, reports = run_parallel(filename, grid_size, processes, chunk_size or DEFAULT_CHUNK_SIZE, start_state)
+        except FileNotFoundError:
+            self.logger.error("File not found: %s", filename)
+            return
+
+        write = self.controller.sink.write
+        for report in reports:
+            x, y, direction = decode_state(report, grid_size)
+            write(x, y, DIRECTIONS[direction])
+        self.controller.sink.flush()
+        if state != STATE_UNPLACED:
+            x, y, direction = decode_state(state, grid_size)
+            self.controller.robot.place(x, y, DIRECTIONS[direction])
@@ -0,0 +1,206 @@
+"""
+state_board.py
+
+This file defines the StateBoard class, a live view of where every robot in a fleet
+is, kept in a multiprocessing.shared_memory block. Worker processes write their
+robots' states into it and any process on the machine can attach to it by name and
+read them, without IPC round-trips or copying the board through a pipe.
+
+The block is a fixed header followed by one fixed-width record per robot slot:
+
+- header: magic b"TRSB", number of slots (uint32)
+- record: sequence (uint64), x (int32), y (int32), direction index (int8, -1 while
+  unplaced), placed flag (uint8), padding to 24 bytes
+
+Writing a record is not atomic, so each record is guarded by its sequence counter
+(a seqlock): the writer makes it odd, writes the state and makes it even again. A
+reader copies the record and re-reads the counter, and retries if the counter was odd
+or has changed, so it never returns a half-written state. Each slot must have a
+single writer; readers never block writers.
+
+Responsibilities:
+- Create or attach to a named shared-memory board with a fixed record layout
+- Publish robot states with the seqlock write protocol
+- Read tear-free records and snapshots of the whole board
+- Publish the state of any RobotController after every command it executes
+"""
+
+import struct
+import sys
+import time
+from multiprocessing import parent_process, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple, Optional
+
+from toy_robot.controller import RobotController
+from toy_robot.opcodes import DIRECTION_INDEX, DIRECTIONS
+
+BOARD_MAGIC = b"TRSB"
+
+# magic, number of slots
+HEADER = struct.Struct("<4sI")
+# sequence, x, y, direction index, placed flag
+RECORD = struct.Struct("<Qiibb6x")
+SEQUENCE = struct.Struct("<Q")
+STATE = struct.Struct("<iibb")
+
+# Reads that find a slot mid-write this many times in a row give up
+DEFAULT_READ_RETRIES = 100_000
+# Attempts made back to back before a read starts yielding the CPU between attempts,
+# so a writer that was preempted or throttled mid-write gets to finish
+_READ_SPINS = 64
+
+# Names of the boards created by this process
+_created = set()
+
+
+class BoardRecord(NamedTuple):
+    """
+    The published state of one slot. Position and direction are None while the robot
+    is unplaced; sequence counts how many times the slot has been written (times two).
+    """
+    x: Optional[int]
+    y: Optional[int]
+    direction: Optional[str]
+    placed: bool
+    sequence: int
+
+
+class StateBoard:
+    """
+    A shared-memory board of robot states. Create one with StateBoard.create() in the
+    process that owns the fleet, and open it anywhere else with StateBoard.attach().
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool = False) -> None:
+        """
+        Wrap an existing shared-memory block; use create() or attach() instead.
+
+        Raises:
+        - ValueError if the block does not hold a state board
+        """
+        magic, slots = HEADER.unpack_from(shm.buf, 0)
+        if magic != BOARD_MAGIC or shm.size < HEADER.size + slots * RECORD.size:
+            shm.close()
+            raise ValueError(f"Shared memory block {shm.name} is not a state board.")
+        self.shm = shm
+        self.name: str = shm.name
+        self.slots: int = slots
+        self.owner = owner
+
+    @classmethod
+    def create(cls, slots: int, name: Optional[str] = None) -> "StateBoard":
+        """
+        Allocate a new board with every slot unplaced. The creating process owns the
+        block and removes it when the board is closed.
+
+        Parameters:
+        - slots: number of robots the board can hold
+        - name: shared-memory name (default: a generated unique name)
+        """
+        shm = SharedMemory(name=name, create=True, size=HEADER.size + slots * RECORD.size)
+        # A fresh block is zero-filled, so every slot starts with an even sequence and
+        # nothing placed
+        HEADER.pack_into(shm.buf, 0, BOARD_MAGIC, slots)
+        _created.add(shm.name)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "StateBoard":
+        """
+        Open an existing board by name. Closing it leaves the block in place.
+        """
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(name=name, track=False))
+        board = cls(SharedMemory(name=name))
+        # Before 3.13 attaching registers the block with this process's resource
+        # tracker, which would unlink it when the process exits. The creator, and
+        # processes started by multiprocessing, share the creator's tracker, where its
+        # own registration must stay.
+        if parent_process() is None and name not in _created:
+            resource_tracker.unregister(board.shm._name, "shared_memory")
+        return board
+
+    def __enter__(self) -> "StateBoard":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _offset(self, slot: int) -> int:
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"slot {slot} is out of range for a board of {self.slots}")
+        return HEADER.size + slot * RECORD.size
+
+    def publish(self, slot: int, x: Optional[int], y: Optional[int], direction: Optional[str]) -> None:
+        """
+        Write a robot's state, as returned by robot.state(), into its slot.
+        """
+        offset = self._offset(slot)
+        buf = self.shm.buf
+        (sequence,) = SEQUENCE.unpack_from(buf, offset)
+        SEQUENCE.pack_into(buf, offset, sequence + 1)
+        if direction is None:
+            STATE.pack_into(buf, offset + SEQUENCE.size, 0, 0, -1, 0)
+        else:
+            STATE.pack_into(buf, offset + SEQUENCE.size, x, y, DIRECTION_INDEX[direction], 1)
+        SEQUENCE.pack_into(buf, offset, sequence + 2)
+
+    def read(self, slot: int, retries: int = DEFAULT_READ_RETRIES) -> BoardRecord:
+        """
+        Read one slot without tearing.
+
+        Raises:
+        - TimeoutError if the slot stayed mid-write for `retries` attempts, e.g.
+          because its writer died while publishing
+        """
+        offset = self._offset(slot)
+        buf = self.shm.buf
+        for attempt in range(retries):
+            sequence, x, y, direction, placed = RECORD.unpack_from(buf, offset)
+            if sequence & 1 or SEQUENCE.unpack_from(buf, offset)[0] != sequence:
+                if attempt >= _READ_SPINS:
+                    time.sleep(0)
+                continue
+            if not placed:
+                return BoardRecord(None, None, None, False, sequence)
+            return BoardRecord(x, y, DIRECTIONS[direction], True, sequence)
+        raise TimeoutError(f"Slot {slot} of state board {self.name} is still being written.")
+
+    def snapshot(self, retries: int = DEFAULT_READ_RETRIES) -> List[BoardRecord]:
+        """
+        Return every slot's record. Each record is tear-free on its own; records of
+        different slots may come from slightly different moments.
+        """
+        return [self.read(slot, retries) for slot in range(self.slots)]
+
+    def bind(self, controller: RobotController, slot: int) -> None:
+        """
+        Publish a controller's robot state into `slot` now and after every command it
+        executes. Works with any RobotController, including subclasses and controllers
+        that already trace or time their commands, by wrapping whichever execute() the
+        instance currently uses.
+        """
+        execute = controller.execute
+        state = controller.robot.state
+        publish = self.publish
+
+        def execute_published(parsed):
+            outcome = execute(parsed)
+            publish(slot, *state())
+            return outcome
+
+        controller.execute = execute_published
+        publish(slot, *state())
+
+    def close(self) -> None:
+        """
+        Detach from the block, and remove it if this process created it.
+        """
+        if self.shm is None:
+            return
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            _created.discard(self.name)
+        self.shm = None
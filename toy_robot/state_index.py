@@ -0,0 +1,223 @@
+"""
+state_index.py
+
+This file builds and queries a sparse index of robot states over a recorded command
+file, answering questions like "where was the robot after line 48,000,000?" without
+replaying the whole file.
+
+The index stores a snapshot every `interval` lines: the packed robot state after that
+line (see transitions.py) and the byte offset at which the next line starts. A query
+seeks the command file to the nearest snapshot at or before the requested line and
+replays at most `interval` lines from there.
+
+Line numbers are 1-based and count every line of the file, including blank ones, so
+they match what an editor shows. The state "at" line N is the state after line N has
+been executed; line 0 is the initial, unplaced state.
+
+Index file format (little-endian):
+- Header: magic b"TRSI", version, grid size, interval, number of lines, source size,
+  SHA-256 of the source
+- Entries: one (offset: uint64, state: uint32) pair per snapshot, starting with line 0
+
+Entries have a fixed size, so the index is memory-mapped and a snapshot is found with
+one struct.unpack_from(), whatever the size of the index.
+
+Opening an index hashes the command file and compares it with the digest the index
+was built from, so a file that was rewritten since, even with the same size, is
+rejected rather than answered with stale states. Hashing is one sequential read,
+far cheaper than the replay the index saves.
+
+Responsibilities:
+- Build the snapshot index for a command file in one pass
+- Memory-map an index and locate the snapshot for a line
+- Answer point and range queries by replaying from the nearest snapshot
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from toy_robot.controller import RobotController
+from toy_robot.navigation import Navigation
+from toy_robot.opcodes import BYTES_OPCODES, DIRECTIONS, OP_NOP, encode
+from toy_robot.reader import iter_lines_from
+from toy_robot.robot import Robot
+from toy_robot.transitions import STATE_UNPLACED, TransitionTable, decode_state
+
+INDEX_VERSION = 2
+DEFAULT_INTERVAL = 10_000
+_MAGIC = b"TRSI"
+_HEADER = struct.Struct("<4sBIIQQ32s")
+_DIGEST_BLOCK = 1024 * 1024
+_ENTRY = struct.Struct("<QI")
+
+State = Tuple[Optional[int], Optional[int], Optional[str]]
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_states(
+    lines: Iterator[Tuple[bytes, int]], state: int, tables: TransitionTable, parser: RobotController
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (state, next_offset) after each line, starting from the given state.
+    """
+    for line, offset in lines:
+        command = line.strip()
+        op = BYTES_OPCODES.get(command)
+        if op is not None:
+            state = tables.tables[op][state]
+        elif command:
+            op, x, y, direction = encode(parser.parse_command(command.decode("utf-8", errors="replace")))
+            if op != OP_NOP:
+                state = tables.apply(state, op, x, y, direction)
+        yield state, offset
+
+
+def _file_digest(filename: str) -> bytes:
+    """
+    Return the SHA-256 of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(_DIGEST_BLOCK), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def _decode(state: int, grid_size: int) -> State:
+    if state == STATE_UNPLACED:
+        return None, None, None
+    x, y, direction = decode_state(state, grid_size)
+    return x, y, DIRECTIONS[direction]
+
+
+def build_index(filename: str, index_path: str, interval: int = DEFAULT_INTERVAL, grid_size: int = 5) -> int:
+    """
+    Replay a command file once and write its snapshot index.
+
+    Parameters:
+    - filename: the command file
+    - index_path: where to write the index; it is replaced atomically
+    - interval: number of lines between snapshots
+    - grid_size: dimension of the square grid (only the grid bounds are checked)
+
+    Returns:
+    - int: the number of lines in the file
+    """
+    if interval < 1:
+        raise ValueError("Snapshot interval must be at least 1.")
+    tables = TransitionTable(grid_size)
+    parser = RobotController(robot=Robot(), navigation=Navigation(grid_size))
+    source_size = os.path.getsize(filename)
+    source_digest = _file_digest(filename)
+
+    temporary = f"{index_path}.{os.getpid()}.tmp"
+    lines = 0
+    with open(filename, "rb") as source, open(temporary, "wb") as index:
+        index.write(b"\0" * _HEADER.size)
+        index.write(_ENTRY.pack(0, STATE_UNPLACED))
+        remaining = interval
+        for lines, (state, offset) in enumerate(_iter_states(iter_lines_from(source), STATE_UNPLACED, tables, parser), start=1):
+            remaining -= 1
+            if remaining == 0:
+                index.write(_ENTRY.pack(offset, state))
+                remaining = interval
+        index.seek(0)
+        index.write(_HEADER.pack(_MAGIC, INDEX_VERSION, grid_size, interval, lines, source_size, source_digest))
+    os.replace(temporary, index_path)
+    logger.debug("Indexed %s lines of %s every %s lines", lines, filename, interval)
+    return lines
+
+
+class StateIndex:
+    """
+    A memory-mapped snapshot index, opened together with the command file it was
+    built from. Use it as a context manager, or call close() when done.
+    """
+
+    def __init__(self, index_path: str, filename: str) -> None:
+        """
+        Open an index and its command file.
+
+        Raises:
+        - ValueError if the index is malformed, or was built from a file with different contents
+        """
+        with open(index_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"State index {index_path} is truncated.")
+            magic, version, grid_size, interval, lines, source_size, source_digest = _HEADER.unpack_from(self._map)
+            if magic != _MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"{index_path} is not a version {INDEX_VERSION} state index.")
+            if len(self._map) != _HEADER.size + (lines // interval + 1) * _ENTRY.size:
+                raise ValueError(f"State index {index_path} is truncated.")
+            if os.path.getsize(filename) != source_size or _file_digest(filename) != source_digest:
+                raise ValueError(f"State index {index_path} was not built from {filename}.")
+        except Exception:
+            self._map.close()
+            raise
+
+        self.grid_size: int = grid_size
+        self.interval: int = interval
+        self.lines: int = lines
+        self._source: BinaryIO = open(filename, "rb")
+        self._tables = TransitionTable(grid_size)
+        self._parser = RobotController(robot=Robot(), navigation=Navigation(grid_size))
+
+    def __enter__(self) -> "StateIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+        self._source.close()
+
+    def snapshot(self, line: int) -> Tuple[int, int, int]:
+        """
+        Return the nearest snapshot at or before a line.
+
+        Returns:
+        - tuple: (snapshot_line, offset, packed_state)
+        """
+        self._check(line)
+        number = line // self.interval
+        offset, state = _ENTRY.unpack_from(self._map, _HEADER.size + number * _ENTRY.size)
+        return number * self.interval, offset, state
+
+    def state_at(self, line: int) -> State:
+        """
+        Return the robot's (x, y, direction) after the given line, or
+        (None, None, None) if it is not placed yet.
+        """
+        return next(self.states(line, line))[1]
+
+    def states(self, first: int, last: int) -> Iterator[Tuple[int, State]]:
+        """
+        Yield (line, state) for every line from `first` to `last` inclusive, replaying
+        from the nearest snapshot at or before `first`.
+        """
+        self._check(last)
+        if first > last:
+            raise ValueError(f"Invalid line range {first}..{last}.")
+        line, offset, state = self.snapshot(first)
+        if line == first:
+            yield line, _decode(state, self.grid_size)
+            if line == last:
+                return
+        replay = _iter_states(iter_lines_from(self._source, offset), state, self._tables, self._parser)
+        for line, (state, _) in enumerate(replay, start=line + 1):
+            if line >= first:
+                yield line, _decode(state, self.grid_size)
+            if line == last:
+                break
+
+    def _check(self, line: int) -> None:
+        if not 0 <= line <= self.lines:
+            raise ValueError(f"Line {line} is outside the indexed range 0..{self.lines}.")
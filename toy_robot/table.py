@@ -0,0 +1,137 @@
+"""
+table.py
+
+This file defines the SharedTable class, which simulates several robots on one
+tabletop. Commands are addressed to a robot by ID, e.g. "R1 PLACE 0,0,NORTH", and each
+robot is driven by its own RobotController. A robot cannot be placed on, or move into,
+a cell occupied by another robot.
+
+Occupancy is kept in a dictionary from cell to robot ID (a spatial hash), so checking
+whether a cell is taken is O(1) however many robots share the table.
+
+Responsibilities:
+- Route each command to the addressed robot, creating robots on first use
+- Track which cell each placed robot occupies
+- Reject PLACE and MOVE commands that target an occupied cell
+"""
+
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from toy_robot.controller import RobotController
+from toy_robot.interfaces import NavigationInterface, OutputSinkInterface
+from toy_robot.log_events import EVENT_OCCUPIED, log_event
+from toy_robot.navigation import Navigation
+from toy_robot.robot import Robot
+
+
+class RobotIdSink(OutputSinkInterface):
+    """
+    Prints REPORT results labelled with the reporting robot's ID, e.g. "Output: R1 0,1,NORTH".
+    """
+
+    def __init__(self, robot_id: str) -> None:
+        self.robot_id = robot_id
+
+    def write(self, x: int, y: int, direction: str) -> None:
+        print(f"Output: {self.robot_id} {x},{y},{direction}")
+
+    def flush(self) -> None:
+        pass
+
+
+class _OccupancyNavigation(NavigationInterface):
+    """
+    Wraps the table's Navigation for one robot, additionally rejecting cells that
+    are occupied by any other robot.
+    """
+
+    def __init__(self, table: "SharedTable", robot_id: str) -> None:
+        self.table = table
+        self.robot_id = robot_id
+
+    def is_valid_position(self, x: int, y: int) -> bool:
+        if not self.table.navigation.is_valid_position(x, y):
+            return False
+        occupant = self.table.occupancy.get((x, y))
+        if occupant is not None and occupant != self.robot_id:
+            log_event(self.table.logger, logging.WARNING, "Invalid position check: (%s,%s) is occupied by robot %s.", x, y, occupant, extra=EVENT_OCCUPIED)
+            return False
+        return True
+
+
+class SharedTable:
+    """
+    The SharedTable routes ID-addressed commands to one RobotController per robot and
+    keeps the cell-to-robot occupancy index up to date.
+    """
+
+    def __init__(
+        self,
+        navigation: Optional[NavigationInterface] = None,
+        sink_factory: Callable[[str], OutputSinkInterface] = RobotIdSink,
+    ) -> None:
+        """
+        Initialise an empty table.
+
+        Parameters:
+        - navigation: validates table bounds for every robot (default: a 5×5 Navigation)
+        - sink_factory: creates the REPORT sink for a robot from its ID
+        """
+        self.navigation = navigation if navigation is not None else Navigation()
+        self.sink_factory = sink_factory
+        self.robots: Dict[str, RobotController] = {}
+        self.occupancy: Dict[Tuple[int, int], str] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def robot(self, robot_id: str) -> RobotController:
+        """
+        Return the controller for a robot, creating an unplaced robot on first use.
+        """
+        controller = self.robots.get(robot_id)
+        if controller is None:
+            controller = RobotController(
+                robot=Robot(),
+                navigation=_OccupancyNavigation(self, robot_id),
+                sink=self.sink_factory(robot_id),
+            )
+            self.robots[robot_id] = controller
+        return controller
+
+    def process_command(self, line: str) -> None:
+        """
+        Process one addressed command of the form "<ROBOT_ID> <COMMAND>".
+
+        The command part is handled exactly like RobotController.process_command().
+        Lines without a command part are ignored and logged.
+        """
+        parts = line.split(None, 1)
+        if len(parts) != 2:
+            self.logger.warning("Ignoring '%s': expected '<ROBOT_ID> <COMMAND>'.", line)
+            return
+        robot_id, command = parts
+
+        controller = self.robot(robot_id)
+        robot = controller.robot
+        before = (robot.current_x, robot.current_y) if robot.is_placed else None
+        controller.process_command(command)
+        after = (robot.current_x, robot.current_y) if robot.is_placed else None
+
+        if after != before:
+            if before is not None:
+                del self.occupancy[before]
+            self.occupancy[after] = robot_id
+
+    def remove(self, robot_id: str) -> None:
+        """
+        Take a robot off the table, freeing its cell.
+        """
+        controller = self.robots.pop(robot_id, None)
+        if controller is not None and controller.robot.is_placed:
+            del self.occupancy[(controller.robot.current_x, controller.robot.current_y)]
+
+    def occupant(self, x: int, y: int) -> Optional[str]:
+        """
+        Return the ID of the robot on the given cell, or None if it is free.
+        """
+        return self.occupancy.get((x, y))
@@ -0,0 +1,163 @@
+"""
+tokenizer.py
+
+This file defines the validating tokenizer behind RobotController.parse_command().
+Commands are checked with string methods and one compiled regular expression for the
+PLACE argument, so rejecting a malformed line never raises and catches an exception.
+On inputs where most lines are invalid, exception handling would otherwise dominate
+the cost of parsing.
+
+The acceptance rules are exactly those of the original exception-based parser:
+- Keywords are case-sensitive and must be the first whitespace-separated word
+- PLACE takes exactly one argument of the form X,Y,F
+- X and Y are anything int() accepts without surrounding whitespace: an optional sign
+  and decimal digits (any Unicode decimal digits), optionally grouped with single
+  underscores
+- F is one of NORTH, EAST, SOUTH or WEST
+- Every other command takes no arguments
+
+With goto=True, GOTO X,Y is accepted too, with X and Y following the same rules as
+for PLACE (see toy_robot.pathfinding).
+
+Rejected PLACE commands carry the same error text the original parser logged, e.g.
+"invalid literal for int() with base 10: 'A'" or "Invalid direction.".
+
+Responsibilities:
+- Split a command into its keyword and argument
+- Validate and convert PLACE and GOTO arguments without exceptions
+- Describe each rejection as the log record it should produce
+"""
+
+import logging
+import re
+import sys
+from typing import Any, Dict, Optional, Tuple, Union
+
+from toy_robot.interfaces import RobotInterface
+from toy_robot.log_events import EVENT_BAD_GOTO, EVENT_BAD_PLACE, EVENT_UNRECOGNISED
+from toy_robot.opcodes import OPCODES
+
+Parsed = Optional[Union[Tuple[str], Tuple[str, int, int], Tuple[str, int, int, str]]]
+Rejection = Optional[Tuple[Any, ...]]
+
+_INTEGER = r"[+-]?\d+(?:_\d+)*"
+_INTEGER_RE = re.compile(_INTEGER)
+_PLACE_RE = re.compile(
+    rf"({_INTEGER}),({_INTEGER}),({'|'.join(RobotInterface.GET_CARDINAL_DIRECTIONS)})"
+)
+_GOTO_RE = re.compile(rf"({_INTEGER}),({_INTEGER})")
+
+# int() rejects literals with more digits than this; such lines take the int() path
+_MAX_LITERAL_LENGTH = getattr(sys, "get_int_max_str_digits", lambda: 0)() or sys.maxsize
+
+# Pre-built results for the operand-free commands
+_SIMPLE_COMMANDS: Dict[str, Tuple[str]] = {name: (name,) for name in OPCODES if name != "PLACE"}
+
+_unpack_messages: Dict[int, str] = {}
+
+
+def _unpack_message(count: int) -> str:
+    """
+    The error text of unpacking `count` fields into x, y and direction. It differs
+    between Python versions, so it is taken from the interpreter once per count.
+    """
+    message = _unpack_messages.get(count)
+    if message is None:
+        try:
+            _, _, _ = [None] * count
+        except ValueError as error:
+            message = _unpack_messages[count] = str(error)
+    return message
+
+
+def _literal_message(literal: str) -> str:
+    # int() truncates the repr of the literal to 200 characters
+    return f"invalid literal for int() with base 10: {repr(literal)[:200]}"
+
+
+def _place_rejection(command: str, argument: str) -> Rejection:
+    """
+    Explain why a PLACE argument did not match, with the error the original parser
+    would have reported for it.
+    """
+    fields = argument.split(",")
+    if len(fields) != 3:
+        reason = _unpack_message(len(fields))
+    elif not _INTEGER_RE.fullmatch(fields[0]):
+        reason = _literal_message(fields[0])
+    elif not _INTEGER_RE.fullmatch(fields[1]):
+        reason = _literal_message(fields[1])
+    else:
+        reason = "Invalid direction."
+    return logging.ERROR, "Invalid PLACE command format: %s - %s", command, reason, EVENT_BAD_PLACE
+
+
+def _parse_place(command: str, argument: str) -> Tuple[Parsed, Rejection]:
+    match = _PLACE_RE.fullmatch(argument)
+    if match is None:
+        return None, _place_rejection(command, argument)
+    x_str, y_str, direction = match.groups()
+    if len(x_str) > _MAX_LITERAL_LENGTH or len(y_str) > _MAX_LITERAL_LENGTH:
+        # Beyond int()'s digit limit; let int() decide and report the error
+        try:
+            x, y = int(x_str), int(y_str)
+        except ValueError as error:
+            return None, (logging.ERROR, "Invalid PLACE command format: %s - %s", command, str(error), EVENT_BAD_PLACE)
+        return ("PLACE", x, y, direction), None
+    return ("PLACE", int(x_str), int(y_str), direction), None
+
+
+def _parse_goto(command: str, argument: str) -> Tuple[Parsed, Rejection]:
+    match = _GOTO_RE.fullmatch(argument)
+    if match is not None:
+        x_str, y_str = match.groups()
+        if len(x_str) <= _MAX_LITERAL_LENGTH and len(y_str) <= _MAX_LITERAL_LENGTH:
+            return ("GOTO", int(x_str), int(y_str)), None
+        reason = "coordinates too long"
+    else:
+        fields = argument.split(",")
+        if len(fields) != 2:
+            reason = f"expected X,Y, got {len(fields)} values"
+        elif not _INTEGER_RE.fullmatch(fields[0]):
+            reason = _literal_message(fields[0])
+        else:
+            reason = _literal_message(fields[1])
+    return None, (logging.ERROR, "Invalid GOTO command format: %s - %s", command, reason, EVENT_BAD_GOTO)
+
+
+def tokenize(command: str, goto: bool = False) -> Tuple[Parsed, Rejection]:
+    """
+    Parse and validate a single command without logging.
+
+    Parameters:
+    - command: the raw command
+    - goto: whether GOTO X,Y is accepted; it parses to ("GOTO", x, y)
+
+    Returns:
+    - tuple: (parsed, rejection), where parsed is as for
+      RobotController.parse_command() and rejection is None or the
+      (level, message, *args, extra) of the log record the command should produce
+    """
+    parts = command.split()
+
+    if not parts: # Empty command
+        return None, None
+
+    cmd = parts[0]
+    simple = _SIMPLE_COMMANDS.get(cmd)
+    if simple is not None:
+        # All other commands must be exactly one word
+        return (simple if len(parts) == 1 else None), None
+
+    if cmd == "PLACE":
+        # PLACE must have exactly one argument: "X,Y,DIRECTION"
+        if len(parts) != 2:
+            return None, None
+        return _parse_place(command, parts[1])
+
+    if cmd == "GOTO" and goto:
+        if len(parts) != 2:
+            return None, None
+        return _parse_goto(command, parts[1])
+
+    return None, (logging.WARNING, "Unrecognised command: '%s'", command, EVENT_UNRECOGNISED)
@@ -0,0 +1,217 @@
+"""
+trace.py
+
+This file records and replays execution traces: one row per executed command with its
+opcode, its outcome and the robot's state afterwards. Rows are stored by column, each
+column in its own file of fixed-width values:
+
+- opcode.col: uint8 opcode (see opcodes.py; GOTO is recorded as TRACE_OP_GOTO). A
+  malformed command keeps the opcode of the command it names, and an unrecognised
+  one is recorded as OP_NOP
+- outcome.col: uint8 index into OUTCOMES
+- x.col, y.col: int32 position, 0 while the robot is unplaced
+- direction.col: int8 direction index, -1 while the robot is unplaced
+
+Values are written in the machine's byte order, which trace.json records together with
+the column types. The column files can be memory-mapped and read without copying, and
+a trace can be streamed back without re-executing any commands.
+
+Responsibilities:
+- Buffer trace rows in typed arrays and append them to the column files
+- Memory-map column files for zero-copy reading
+- Stream recorded rows back in order
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from toy_robot.controller import (
+    OUTCOME_EXECUTED,
+    OUTCOME_INVALID_PLACE,
+    OUTCOME_MALFORMED,
+    OUTCOME_UNPLACED,
+    OUTCOME_UNREACHABLE,
+    OUTCOME_UNRECOGNISED,
+    OUTCOME_UNSAFE_MOVE,
+)
+from toy_robot.opcodes import DIRECTION_INDEX, DIRECTIONS, OP_GOTO, OP_NOP, OPCODE_NAMES, OPCODES
+
+TRACE_VERSION = 1
+MANIFEST = "trace.json"
+
+TRACE_OP_GOTO = OP_GOTO
+_TRACE_OPCODES = {**OPCODES, "GOTO": OP_GOTO}
+TRACE_OPCODE_NAMES = OPCODE_NAMES
+
+OUTCOMES: Tuple[str, ...] = (
+    OUTCOME_EXECUTED,
+    OUTCOME_UNPLACED,
+    OUTCOME_UNSAFE_MOVE,
+    OUTCOME_INVALID_PLACE,
+    OUTCOME_MALFORMED,
+    OUTCOME_UNRECOGNISED,
+    OUTCOME_UNREACHABLE,
+)
+_OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+
+# Column name -> array typecode
+COLUMNS: Dict[str, str] = {"opcode": "B", "outcome": "B", "x": "i", "y": "i", "direction": "b"}
+
+
+class TraceRow(NamedTuple):
+    opcode: int
+    outcome: int
+    x: int
+    y: int
+    direction: int
+
+    def decode(self) -> Tuple[str, str, Optional[int], Optional[int], Optional[str]]:
+        """
+        Return (command, outcome, x, y, direction) with names instead of codes, and
+        None for the position and direction of an unplaced robot.
+        """
+        if self.direction < 0:
+            return TRACE_OPCODE_NAMES[self.opcode], OUTCOMES[self.outcome], None, None, None
+        return TRACE_OPCODE_NAMES[self.opcode], OUTCOMES[self.outcome], self.x, self.y, DIRECTIONS[self.direction]
+
+
+class TraceRecorder:
+    """
+    Appends trace rows to column files in a directory. Pass it to
+    RobotController(trace=...) to record every command the controller executes, and
+    close it (or use it as a context manager) when the run is finished.
+    """
+
+    def __init__(self, directory: str, flush_every: int = 64 * 1024) -> None:
+        """
+        Start a new trace, replacing any trace already in the directory.
+
+        Parameters:
+        - directory: where the column files and trace.json are written
+        - flush_every: number of rows buffered in memory before they are written
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_every = flush_every
+        self.rows = 0
+        self._buffers = {name: array(code) for name, code in COLUMNS.items()}
+        self._files = {name: open(os.path.join(directory, f"{name}.col"), "wb") for name in COLUMNS}
+        with open(os.path.join(directory, MANIFEST), "w") as file:
+            json.dump({"version": TRACE_VERSION, "byteorder": sys.byteorder, "columns": COLUMNS}, file)
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(self, command: str, outcome: str, x: Optional[int], y: Optional[int], direction: Optional[str]) -> None:
+        """
+        Append one row.
+
+        Parameters:
+        - command: the command name, e.g. "MOVE"; names without an opcode, such as the
+          "UNKNOWN" of CommandMetrics, are recorded as OP_NOP
+        - outcome: one of the OUTCOME_* constants
+        - x, y, direction: the robot's state afterwards, as returned by robot.state()
+        """
+        buffers = self._buffers
+        buffers["opcode"].append(_TRACE_OPCODES.get(command, OP_NOP))
+        buffers["outcome"].append(_OUTCOME_CODES[outcome])
+        if direction is None:
+            buffers["x"].append(0)
+            buffers["y"].append(0)
+            buffers["direction"].append(-1)
+        else:
+            buffers["x"].append(x)
+            buffers["y"].append(y)
+            buffers["direction"].append(DIRECTION_INDEX[direction])
+        self.rows += 1
+        if len(buffers["opcode"]) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to the column files.
+        """
+        for name, buffer in self._buffers.items():
+            if buffer:
+                buffer.tofile(self._files[name])
+                del buffer[:]
+            self._files[name].flush()
+
+    def close(self) -> None:
+        if not self._files:
+            return
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        self._files = {}
+
+
+class TraceReader:
+    """
+    Memory-maps the column files of a trace. Columns are exposed as typed memoryviews
+    over the mapped files, so reading does not copy them. Release any column views
+    you hold before calling close().
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Raises:
+        - ValueError if the trace has an unknown version or a different byte order
+        """
+        with open(os.path.join(directory, MANIFEST), "r") as file:
+            manifest = json.load(file)
+        if manifest.get("version") != TRACE_VERSION:
+            raise ValueError(f"{directory} is not a version {TRACE_VERSION} trace.")
+        if manifest.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Trace {directory} was recorded with {manifest.get('byteorder')}-endian columns.")
+
+        self._maps: Dict[str, mmap.mmap] = {}
+        self.columns: Dict[str, memoryview] = {}
+        for name, code in manifest["columns"].items():
+            with open(os.path.join(directory, f"{name}.col"), "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size:
+                    self._maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    view = memoryview(self._maps[name])
+                else:
+                    view = memoryview(b"")
+            itemsize = array(code).itemsize
+            # A run that crashed mid-flush may leave a partial value at the end
+            self.columns[name] = view[:len(view) - len(view) % itemsize].cast(code)
+        # Columns are flushed together, so a crash can leave some a few rows longer
+        self.rows: int = min(len(column) for column in self.columns.values())
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, index: int) -> TraceRow:
+        if not -self.rows <= index < self.rows:
+            raise IndexError("trace row out of range")
+        columns = self.columns
+        return TraceRow(*(columns[name][index] for name in COLUMNS))
+
+    def __iter__(self) -> Iterator[TraceRow]:
+        columns = self.columns
+        rows = self.rows
+        return map(TraceRow, *(columns[name][:rows] for name in COLUMNS))
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
@@ -0,0 +1,156 @@
+"""
+transitions.py
+
+This file models the robot as a finite state machine. On a fixed grid the robot is
+either unplaced or at one of grid_size × grid_size × 4 (x, y, direction) states, so
+every state can be packed into a single small integer and every operand-free command
+becomes a lookup table from state to state.
+
+State encoding:
+- 0 is the unplaced state
+- 1 + ((y * grid_size + x) * 4 + direction_index) for a placed robot
+
+Responsibilities:
+- Pack and unpack robot states
+- Check that a navigation covers the square grid the states are packed for
+- Precompute the state transition table for each opcode
+- Resolve PLACE commands to their target state
+"""
+
+from typing import List, Optional, Tuple
+
+from toy_robot.interfaces import NavigationInterface
+
+from toy_robot.opcodes import (
+    DIRECTION_DX,
+    DIRECTION_DY,
+    DIRECTIONS,
+    OP_LEFT,
+    OP_MOVE,
+    OP_NOP,
+    OP_PLACE,
+    OP_REPORT,
+    OP_RIGHT,
+)
+
+STATE_UNPLACED = 0
+
+
+def square_grid_size(navigation: NavigationInterface, grid_size: Optional[int] = None) -> int:
+    """
+    Return the size of the square grid a navigation covers, for the engines whose
+    states are packed for a square grid.
+
+    Parameters:
+    - navigation: the navigation the states are validated by
+    - grid_size: the grid size the caller expects; required if the navigation's
+      bounds() are unknown
+
+    Raises:
+    - ValueError if the navigation's bounds are not square, differ from grid_size,
+      or are unknown and no grid_size was given
+    """
+    bounds = navigation.bounds()
+    if bounds is None:
+        if grid_size is None:
+            raise ValueError(f"{type(navigation).__name__} has no bounds(); pass the grid size explicitly.")
+        return grid_size
+    width, height = bounds
+    if width != height:
+        raise ValueError(f"{type(navigation).__name__} covers a {width}x{height} grid; a square grid is required.")
+    if grid_size is not None and grid_size != width:
+        raise ValueError(f"{type(navigation).__name__} covers a {width}x{height} grid, not {grid_size}x{grid_size}.")
+    return width
+
+
+def encode_state(x: int, y: int, direction: int, grid_size: int) -> int:
+    """
+    Pack an on-grid position and direction index into a state.
+    """
+    return 1 + ((y * grid_size + x) << 2 | direction)
+
+
+def decode_state(state: int, grid_size: int) -> Tuple[int, int, int]:
+    """
+    Unpack a placed state into (x, y, direction_index).
+    """
+    cell, direction = divmod(state - 1, 4)
+    y, x = divmod(cell, grid_size)
+    return x, y, direction
+
+
+class TransitionTable:
+    """
+    The TransitionTable holds one state-to-state table per operand-free opcode for a
+    square grid. `tables[op][state]` is the state after executing `op` in `state`.
+    Unplaced robots stay unplaced, and unsafe MOVEs leave the state unchanged, exactly
+    as RobotController does.
+    """
+
+    def __init__(self, grid_size: int = 5, navigation: Optional[NavigationInterface] = None) -> None:
+        """
+        Precompute the transition tables for the given grid.
+
+        Parameters:
+        - grid_size (int): The dimension of the square grid (default: 5)
+        - navigation: if given, on-grid cells are also checked with
+          navigation.is_valid_position() once each, so MOVE and PLACE honour any extra
+          restrictions it applies. Without it only the grid bounds are checked.
+        """
+        self.grid_size: int = grid_size
+        self.num_states: int = 1 + grid_size * grid_size * 4
+        self.walkable: List[bool] = [
+            navigation is None or navigation.is_valid_position(x, y)
+            for y in range(grid_size)
+            for x in range(grid_size)
+        ]
+
+        identity = list(range(self.num_states))
+        move, left, right = identity[:], identity[:], identity[:]
+        for state in range(1, self.num_states):
+            x, y, direction = self.decode(state)
+            left[state] = self.encode(x, y, (direction - 1) % 4)
+            right[state] = self.encode(x, y, (direction + 1) % 4)
+            new_x, new_y = x + DIRECTION_DX[direction], y + DIRECTION_DY[direction]
+            if self.is_valid_position(new_x, new_y):
+                move[state] = self.encode(new_x, new_y, direction)
+
+        self.tables: List[List[int]] = [identity] * (OP_REPORT + 1)
+        self.tables[OP_MOVE] = move
+        self.tables[OP_LEFT] = left
+        self.tables[OP_RIGHT] = right
+
+    def is_valid_position(self, x: int, y: int) -> bool:
+        return 0 <= x < self.grid_size and 0 <= y < self.grid_size and self.walkable[y * self.grid_size + x]
+
+    def encode(self, x: int, y: int, direction: int) -> int:
+        return encode_state(x, y, direction, self.grid_size)
+
+    def decode(self, state: int) -> Tuple[int, int, int]:
+        return decode_state(state, self.grid_size)
+
+    def place(self, x: int, y: int, direction: int) -> Optional[int]:
+        """
+        Return the target state of a PLACE, or None if the position is out of bounds.
+        """
+        if self.is_valid_position(x, y):
+            return self.encode(x, y, direction)
+        return None
+
+    def apply(self, state: int, op: int, x: int = 0, y: int = 0, direction: int = 0) -> int:
+        """
+        Return the state after executing one opcode (with PLACE operands if needed).
+        """
+        if op == OP_PLACE:
+            target = self.place(x, y, direction)
+            return state if target is None else target
+        if op == OP_NOP:
+            return state
+        return self.tables[op][state]
+
+    def format_report(self, state: int) -> str:
+        """
+        Format a placed state the same way Robot.report() prints it.
+        """
+        x, y, direction = self.decode(state)
+        return f"Output: {x},{y},{DIRECTIONS[direction]}"